@@ -1,17 +1,19 @@
-from fastapi import APIRouter, HTTPException, Response
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-import cv2
-from typing import Dict
-from ...services.camera_manager import CameraManager
+import asyncio
+import time
+from typing import Dict, List, Optional
+from ...config import settings
+from ...models.schemas import RoiRegion
+from ...services.camera_manager import CameraManager, WEBCAM_CAMERA_ID
+from ...services.encoder_cache import StreamVariant
+from ...services.roi import RegionOfInterest, RoiSet
 from loguru import logger
 
 router = APIRouter()
 camera_manager = CameraManager()
 
-# 카메라 상태 저장을 위한 변수
-webcam_active = False
-webcam_cap = None
-
 @router.post("/cameras/{camera_id}")
 async def add_camera(camera_id: int, url: str):
     try:
@@ -23,7 +25,8 @@ async def add_camera(camera_id: int, url: str):
 @router.delete("/cameras/{camera_id}")
 async def remove_camera(camera_id: int):
     try:
-        camera_manager.remove_camera(camera_id)
+        # 프로듀서/캡처 스레드 join으로 수 초 걸릴 수 있으므로 스레드풀에서 실행
+        await run_in_threadpool(camera_manager.remove_camera, camera_id)
         return {"message": f"Camera {camera_id} removed successfully"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -32,84 +35,169 @@ async def remove_camera(camera_id: int):
 async def list_cameras():
     return {"cameras": list(camera_manager.cameras.keys())}
 
-@router.get("/cameras/{camera_id}/stream")
-async def stream_camera(camera_id: int):
-    """카메라 스트리밍 엔드포인트"""
-    # 카메라 1은 웹캠으로 처리
-    if camera_id == 1:
-        def generate_webcam():
-            cap = cv2.VideoCapture(0)
-            try:
-                while True:
-                    ret, frame = cap.read()
-                    if not ret:
-                        break
-                    
-                    # AI 모델로 프레임 처리
-                    if camera_manager.detection_service:
-                        try:
-                            frame, num_persons, num_helmets = camera_manager.detection_service.process_frame(frame)
-                        except Exception as e:
-                            logger.error(f"Error processing frame: {str(e)}")
-                    
-                    # JPEG으로 인코딩
-                    _, buffer = cv2.imencode('.jpg', frame)
-                    frame_bytes = buffer.tobytes()
-                    
-                    # multipart/x-mixed-replace 형식으로 스트리밍
-                    yield (b'--frame\r\n'
-                          b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            finally:
-                cap.release()
-        
-        return StreamingResponse(
-            generate_webcam(),
-            media_type='multipart/x-mixed-replace; boundary=frame'
-        )
-    
-    # 다른 카메라들은 기존 로직으로 처리
-    camera = camera_manager.get_camera(camera_id)
-    if not camera:
-        raise HTTPException(status_code=404, detail="Camera not found")
-    
-    def generate_frames():
-        while True:
+def _parse_camera_ids(cameras: Optional[str]):
+    """쉼표로 구분한 카메라 ID 문자열을 튜플로 변환 (없으면 None = 모든 카메라)"""
+    if not cameras:
+        return None
+    try:
+        camera_ids = tuple(dict.fromkeys(int(camera_id) for camera_id in cameras.split(",") if camera_id.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="cameras must be a comma separated list of camera ids")
+    if not camera_ids:
+        # "," 같은 값으로 타일 없는 모자이크를 만들면 프레임이 나오지 않아 연결이 멈춤
+        raise HTTPException(status_code=400, detail="cameras must list at least one camera id")
+    return camera_ids
+
+async def _ensure_webcam():
+    """웹캠 등록 (장치를 여는 동안 블로킹되므로 이벤트 루프 대신 스레드풀에서 실행)"""
+    try:
+        await run_in_threadpool(camera_manager.ensure_webcam)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _mjpeg_frames(source, request: Request, variant: StreamVariant, max_fps: Optional[float]):
+    """공유 프레임 소스(브로드캐스터/모자이크)를 multipart MJPEG로 전달
+
+    감지/합성/인코딩은 소스가 한 번만 수행하고 시청자는 결과 바이트만 전달한다.
+    비동기 제너레이터라 시청자마다 스레드풀 스레드를 점유하지 않는다.
+    """
+    min_interval = 1.0 / max_fps if max_fps else 0.0
+    loop = asyncio.get_running_loop()
+    source.subscribe()
+    try:
+        last_seq = 0
+        next_send = 0.0
+        while not source.closed:
+            # max_fps 제한: 다음 전송 시각까지 대기 후 그 시점의 최신 프레임 전송
+            delay = next_send - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            packet = await source.wait_for_frame_async(last_seq, timeout=1.0)
+            if packet is None:
+                # 새 프레임이 없는 동안 연결 끊김 확인
+                if await request.is_disconnected():
+                    break
+                continue
+            last_seq = packet.seq
             try:
-                frame = camera.get_frame()
-                if frame is None:
-                    continue
-                    
-                # AI 모델로 프레임 처리
-                if camera.detection_service:
-                    try:
-                        frame, num_persons, num_helmets = camera.detection_service.process_frame(frame)
-                    except Exception as e:
-                        logger.error(f"Error processing frame: {str(e)}")
-                        continue
-                    
-                # JPEG으로 인코딩
-                _, buffer = cv2.imencode('.jpg', frame)
-                frame_bytes = buffer.tobytes()
-                
-                # multipart/x-mixed-replace 형식으로 스트리밍
-                yield (b'--frame\r\n'
-                      b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+                frame_bytes = await source.encode(packet, variant)
             except Exception as e:
-                logger.error(f"Error in stream generation: {str(e)}")
+                logger.error(f"Error encoding frame: {str(e)}")
                 continue
+            next_send = loop.time() + min_interval
+
+            # multipart/x-mixed-replace 형식으로 스트리밍
+            yield (b'--frame\r\n'
+                  b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+    finally:
+        source.unsubscribe()
+
+@router.get("/cameras/mosaic/stream")
+async def stream_mosaic(
+    request: Request,
+    cameras: Optional[str] = Query(None, description="포함할 카메라 ID (예: 1,2,3, 생략 시 전체)"),
+    cols: Optional[int] = Query(None, ge=1, le=16),
+    tile_width: int = Query(settings.MOSAIC_TILE_WIDTH, ge=64, le=1920),
+    fps: float = Query(settings.MOSAIC_FPS, gt=0, le=30),
+    quality: int = Query(settings.MOSAIC_JPEG_QUALITY, ge=1, le=100)
+):
+    """여러 카메라를 한 프레임으로 합성한 모자이크 스트림
+
+    그리드 전체를 연결 1개, 합성 프레임당 인코딩 1회로 전송한다.
+    /cameras/{camera_id}/stream보다 먼저 선언해야 "mosaic"이 카메라 ID로 해석되지 않는다.
+    """
+    camera_ids = _parse_camera_ids(cameras)
+    if camera_ids and WEBCAM_CAMERA_ID in camera_ids:
+        await _ensure_webcam()
+
+    mosaic = camera_manager.get_mosaic(camera_ids, cols, tile_width, fps)
+    return StreamingResponse(
+        _mjpeg_frames(mosaic, request, StreamVariant(None, quality), fps),
+        media_type='multipart/x-mixed-replace; boundary=frame'
+    )
+
+@router.get("/cameras/{camera_id}/stream")
+async def stream_camera(
+    camera_id: int,
+    request: Request,
+    width: Optional[int] = Query(None, ge=16, le=7680),
+    quality: int = Query(settings.STREAM_JPEG_QUALITY, ge=1, le=100),
+    max_fps: Optional[float] = Query(None, gt=0)
+):
+    """카메라 스트리밍 엔드포인트
+
+    width/quality/max_fps로 클라이언트별 스트림 형식을 지정한다 (그리드 썸네일 등).
+    같은 형식을 보는 시청자끼리는 인코딩 결과를 공유한다.
+    """
+    # 카메라 1은 웹캠으로 처리 (요청마다 장치를 여는 대신 공유 캡처 사용)
+    if camera_id == WEBCAM_CAMERA_ID:
+        await _ensure_webcam()
+
+    broadcaster = camera_manager.get_broadcaster(camera_id)
+    if not broadcaster:
+        raise HTTPException(status_code=404, detail="Camera not found")
     
     return StreamingResponse(
-        generate_frames(),
+        _mjpeg_frames(broadcaster, request, StreamVariant(width, quality), max_fps),
         media_type='multipart/x-mixed-replace; boundary=frame'
     )
 
+@router.get("/cameras/{camera_id}/snapshot.jpg")
+async def camera_snapshot(
+    camera_id: int,
+    request: Request,
+    wait_newer_than: Optional[int] = Query(None, ge=0),
+    timeout: float = Query(10.0, gt=0, le=60),
+    width: Optional[int] = Query(None, ge=16, le=7680),
+    quality: int = Query(settings.STREAM_JPEG_QUALITY, ge=1, le=100)
+):
+    """최신 프레임 1장 (JPEG)
+
+    ETag는 프레임 시퀀스 번호로 만들어 If-None-Match가 같으면 304를 반환한다.
+    wait_newer_than=<seq>를 주면 그보다 새 프레임이 나올 때까지 최대 timeout초 대기한다 (long-poll).
+    """
+    if camera_id == WEBCAM_CAMERA_ID:
+        await _ensure_webcam()
+
+    broadcaster = camera_manager.get_broadcaster(camera_id)
+    if not broadcaster:
+        raise HTTPException(status_code=404, detail="Camera not found")
+
+    was_running = broadcaster.keep_alive(settings.SNAPSHOT_KEEP_ALIVE_SECONDS)
+    after_seq = wait_newer_than or 0
+    latest = broadcaster.output.get_latest()
+    if latest is not None and (not was_running
+                               or time.time() - latest.timestamp > settings.SNAPSHOT_MAX_FRAME_AGE):
+        # 프로듀서가 멈춰 있다 재시작했으면 남아 있는 프레임은 오래된 것이므로 그 다음 프레임을 기다림
+        after_seq = max(after_seq, latest.seq)
+    packet = await broadcaster.wait_for_frame_async(after_seq, timeout)
+    if packet is None:
+        packet = broadcaster.output.get_latest()
+        if packet is None:
+            raise HTTPException(status_code=503, detail="No frame available yet")
+
+    variant = StreamVariant(width, quality)
+    etag = f'"{camera_id}-{broadcaster.epoch}-{packet.seq}-{width or 0}-{quality}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": "no-cache",
+        "X-Frame-Seq": str(packet.seq),
+        "X-Frame-Timestamp": f"{packet.timestamp:.3f}"
+    }
+    # 새 프레임이 없어 long-poll이 끝났거나 클라이언트가 이미 가진 프레임이면 304
+    if packet.seq <= (wait_newer_than or 0) or etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+
+    frame_bytes = await broadcaster.encode(packet, variant)
+    return Response(content=frame_bytes, media_type="image/jpeg", headers=headers)
+
 # 노트북 웹캠용 간단한 초기화
 @router.post("/init-webcam")
 async def init_webcam():
     """노트북 웹캠 초기화"""
     try:
-        # 웹캠 ID 0으로 초기화 (대부분의 노트북에서 기본 웹캠은 0)
-        camera_manager.add_camera(0, 0)  # URL 대신 0을 사용
+        # 웹캠 장치 0을 카메라 1로 등록 (대부분의 노트북에서 기본 웹캠은 0)
+        await run_in_threadpool(camera_manager.ensure_webcam)
         return {"message": "Webcam initialized successfully"}
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -123,20 +211,94 @@ async def update_threshold(threshold: float):
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+@router.post("/cameras/{camera_id}/cadence")
+async def update_cadence(camera_id: int, every_n_frames: Optional[int] = None, max_hz: Optional[float] = None):
+    """카메라별 추론 주기 설정 (N 프레임마다 / 초당 최대 X회)"""
+    broadcaster = camera_manager.get_broadcaster(camera_id)
+    if not broadcaster:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    broadcaster.cadence.update(every_n_frames, max_hz)
+    return {"camera_id": camera_id, **broadcaster.cadence.to_dict()}
+
+@router.post("/cameras/{camera_id}/motion")
+async def update_motion_gate(camera_id: int, enabled: Optional[bool] = None, sensitivity: Optional[float] = None,
+                             heartbeat_seconds: Optional[float] = None):
+    """카메라별 움직임 게이트 설정"""
+    broadcaster = camera_manager.get_broadcaster(camera_id)
+    if not broadcaster:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    broadcaster.motion_gate.update(sensitivity, heartbeat_seconds, enabled)
+    return broadcaster.motion_gate.get_stats()
+
+@router.get("/cameras/{camera_id}/stats")
+async def get_camera_stats(camera_id: int):
+    """카메라 파이프라인 통계 (게이트된 프레임 수 / 추론한 프레임 수 등)"""
+    broadcaster = camera_manager.get_broadcaster(camera_id)
+    if not broadcaster:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    return broadcaster.get_stats()
+
+@router.put("/cameras/{camera_id}/roi")
+async def set_camera_roi(camera_id: int, regions: List[RoiRegion]):
+    """카메라 관심 영역 설정 (추론은 영역 안에서만 수행)"""
+    camera = camera_manager.get_camera(camera_id)
+    if not camera:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    try:
+        rois = []
+        for region in regions:
+            if region.rect is not None:
+                if len(region.rect) != 4:
+                    raise ValueError("rect must be [x1, y1, x2, y2]")
+                rois.append(RegionOfInterest.from_rect(*region.rect))
+            elif region.polygon is not None:
+                rois.append(RegionOfInterest(region.polygon))
+            else:
+                raise ValueError("Each region needs rect or polygon")
+        camera.rois = RoiSet(rois)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"camera_id": camera_id, "rois": camera.rois.to_list()}
+
+@router.delete("/cameras/{camera_id}/roi")
+async def clear_camera_roi(camera_id: int):
+    """카메라 관심 영역 해제 (전체 프레임 추론)"""
+    camera = camera_manager.get_camera(camera_id)
+    if not camera:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    camera.rois = None
+    return {"camera_id": camera_id, "rois": []}
+
+@router.post("/cameras/{camera_id}/resolution")
+async def update_inference_resolution(camera_id: int, size: int):
+    """카메라별 추론 해상도 설정 (예: 640, 416, 320 / 0이면 전체 해상도)"""
+    camera = camera_manager.get_camera(camera_id)
+    if not camera:
+        raise HTTPException(status_code=404, detail="Camera not found")
+    if size < 0 or size % 32:
+        raise HTTPException(status_code=400, detail="size must be 0 or a multiple of 32")
+    camera.inference_size = size
+    return {"camera_id": camera_id, "inference_size": size}
+
+@router.get("/inference/stats")
+async def get_inference_stats():
+    """배치 추론 통계 (배치 크기, 지연 시간) / 워커 풀 통계"""
+    if camera_manager.pool:
+        return {"batching": False, "pool": camera_manager.pool.get_stats()}
+    batcher = camera_manager.batcher
+    if not batcher:
+        return {"batching": False}
+    return {"batching": True, **batcher.get_stats()}
+
 @router.post("/cameras/{camera_id}/toggle")
 async def toggle_camera(camera_id: int):
     """카메라 ON/OFF 토글"""
-    global webcam_active, webcam_cap
-    
-    if camera_id == 1:  # 웹캠
-        if webcam_active:
-            if webcam_cap:
-                webcam_cap.release()
-                webcam_cap = None
-            webcam_active = False
+    if camera_id == WEBCAM_CAMERA_ID:  # 웹캠
+        if camera_manager.get_camera(camera_id):
+            await run_in_threadpool(camera_manager.remove_camera, camera_id)
             return {"status": "off"}
         else:
-            webcam_active = True
+            await _ensure_webcam()
             return {"status": "on"}
     else:
         camera = camera_manager.get_camera(camera_id)
@@ -150,7 +312,7 @@ async def toggle_camera(camera_id: int):
 async def toggle_ai(camera_id: int, enabled: bool):
     """카메라의 AI 감지 기능을 켜거나 끕니다."""
     try:
-        if camera_id == 1:  # 웹캠
+        if camera_id == WEBCAM_CAMERA_ID:  # 웹캠
             if enabled:
                 camera_manager.detection_service.enable_detection()
             else:
@@ -1,19 +1,142 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from typing import List
-from ...models import schemas, models, database
+from typing import Any, List, Optional
+from datetime import datetime
+import json
+from ...config import settings
+from ...models import schemas, database, crud, rollups
+from .cameras import camera_manager
+from .system import push_hub
 
 router = APIRouter()
 
 @router.get("/events/", response_model=List[schemas.Event])
-def read_events(skip: int = 0, limit: int = 100, db: Session = Depends(database.get_db)):
-    events = db.query(models.Event).offset(skip).limit(limit).all()
+def read_events(
+    response: Response,
+    skip: int = 0,
+    limit: int = Query(100, ge=1, le=1000),
+    camera_id: Optional[int] = None,
+    event_type: Optional[str] = None,
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    after: Optional[str] = Query(None, description="이전 응답의 X-Next-Cursor (<timestamp>,<id>)"),
+    db: Session = Depends(database.get_read_db)
+):
+    """이벤트 목록 (최신순)
+
+    다음 페이지가 있을 수 있으면 X-Next-Cursor 헤더를 돌려주고, 그 값을 after로 넘기면 이어서 조회한다.
+    """
+    cursor = None
+    if after is not None:
+        try:
+            cursor = crud.decode_event_cursor(after)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="after must be '<timestamp>,<id>'")
+    # 저장 기준(naive UTC)에 맞춰 시간대가 있는 from/to를 변환
+    start = rollups.to_naive(start) if start else None
+    end = rollups.to_naive(end) if end else None
+    events = crud.query_events(db, camera_id, event_type, start, end, cursor, skip, limit)
+    if len(events) == limit:
+        response.headers["X-Next-Cursor"] = crud.encode_event_cursor(events[-1])
     return events
 
+@router.get("/events/stats", response_model=schemas.EventStats)
+def read_event_stats(
+    resolution: str = Query("hour", description="minute | hour | day"),
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    camera_id: Optional[int] = None,
+    event_type: Optional[str] = None,
+    group_by: Optional[str] = Query(None, description="camera | event_type"),
+    db: Session = Depends(database.get_read_db)
+):
+    """시간 버킷별 이벤트 수 (롤업 테이블에서 조회)
+
+    from은 버킷 시작으로 내림, to는 버킷 끝으로 올림한다. to를 생략하면 현재 시각,
+    from을 생략하면 해상도별 기본 범위 (minute 1시간, hour 1일, day 30일).
+    group_by가 없으면 빈 버킷도 count 0으로 채우고, 있으면 이벤트가 있는 (버킷, 그룹)만 돌려준다.
+    """
+    if resolution not in rollups.RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"resolution must be one of {list(rollups.RESOLUTIONS)}")
+    if group_by not in (None, "camera", "event_type"):
+        raise HTTPException(status_code=400, detail="group_by must be 'camera' or 'event_type'")
+    end = end or datetime.utcnow()
+    start = start or rollups.to_naive(end) - rollups.DEFAULT_SPANS[resolution]
+    start, end = rollups.bucket_range(resolution, start, end)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="from must be earlier than to")
+    if (end - start) / rollups.RESOLUTIONS[resolution] > settings.EVENT_STATS_MAX_BUCKETS:
+        raise HTTPException(status_code=400,
+                            detail=f"Range exceeds {settings.EVENT_STATS_MAX_BUCKETS} {resolution} buckets")
+
+    rows = crud.query_event_stats(db, resolution, start, end, camera_id, event_type, group_by)
+    if group_by is None:
+        counts = dict(rows)
+        buckets = [{"bucket": bucket, "count": counts.get(bucket, 0)}
+                   for bucket in rollups.iter_buckets(resolution, start, end)]
+    else:
+        key = "camera_id" if group_by == "camera" else "event_type"
+        buckets = [{"bucket": bucket, key: group, "count": count} for bucket, group, count in rows]
+    return {
+        "resolution": resolution,
+        "start": start,
+        "end": end,
+        "total": sum(bucket["count"] for bucket in buckets),
+        "buckets": buckets
+    }
+
 @router.post("/events/", response_model=schemas.Event)
-def create_event(event: schemas.EventCreate, db: Session = Depends(database.get_db)):
-    db_event = models.Event(**event.dict())
-    db.add(db_event)
-    db.commit()
-    db.refresh(db_event)
-    return db_event 
\ No newline at end of file
+def create_event(event: schemas.EventCreate, db: Session = Depends(database.get_write_db)):
+    db_event = crud.create_event(db, event)
+    push_hub.publish_events([crud.event_payload(db_event.id, db_event.camera_id, db_event.event_type,
+                                                db_event.description, db_event.timestamp)])
+    return db_event
+
+def parse_event_batch(body: bytes, content_type: str) -> List[Any]:
+    """요청 본문을 이벤트 객체 목록으로 파싱 (JSON 배열 또는 NDJSON)"""
+    try:
+        if "ndjson" in content_type or "jsonl" in content_type:
+            return [json.loads(line) for line in body.splitlines() if line.strip()]
+        items = json.loads(body)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
+    if not isinstance(items, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array of events")
+    return items
+
+@router.post("/events/batch", response_model=schemas.EventBatchResult)
+async def create_events_batch(request: Request, db: Session = Depends(database.get_write_db)):
+    """이벤트 일괄 저장
+
+    본문은 JSON 배열 또는 NDJSON (Content-Type: application/x-ndjson).
+    전체를 한 번에 검증한 뒤 INSERT 한 문장과 커밋 1회로 저장하고 부여된 ID를 입력 순서대로 반환한다.
+    하나라도 검증에 실패하면 아무것도 저장하지 않는다.
+    """
+    items = parse_event_batch(await request.body(), request.headers.get("content-type", ""))
+    if len(items) > settings.EVENT_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=413,
+                            detail=f"Batch of {len(items)} events exceeds {settings.EVENT_BATCH_MAX_SIZE}")
+
+    events, errors = [], []
+    for index, item in enumerate(items):
+        try:
+            events.append(schemas.EventIngest.parse_obj(item))
+        except ValidationError as e:
+            errors.append({"index": index, "errors": e.errors()})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    # DB 쓰기는 블로킹이므로 스레드풀에서 실행
+    rows = crud.event_rows(events)
+    ids = await run_in_threadpool(crud.save_event_rows, db, rows)
+    push_hub.publish_events(crud.event_payload(event_id, **row) for event_id, row in zip(ids, rows))
+    return {"count": len(ids), "ids": ids}
+
+@router.get("/events/writer/stats")
+def get_event_writer_stats():
+    """파이프라인 이벤트 write-behind 큐 통계 (대기/저장/버린 이벤트 수)"""
+    if not camera_manager.event_writer:
+        return {"running": False}
+    return camera_manager.event_writer.get_stats()
@@ -1,9 +1,15 @@
-from fastapi import APIRouter
-import psutil
-import GPUtil
-from datetime import datetime
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query, WebSocket
+import time
+import asyncio
+from typing import List, Dict, Any, Optional
 import logging
+from loguru import logger as loguru_logger
+from .cameras import camera_manager
+from ...config import settings
+from ...services.metrics_history import MetricsHistory, RateMeter
+from ...services.log_buffer import LogRingBuffer
+from ...services.push_hub import PushHub
+from ...services.system_metrics import SystemMetricsSampler
 
 router = APIRouter()
 
@@ -11,84 +17,78 @@ router = APIRouter()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 애플리케이션 loguru 출력을 모으는 로그 링 버퍼 (대시보드/로그 API용)
+log_buffer = LogRingBuffer(settings.LOG_BUFFER_SIZE)
+loguru_logger.add(log_buffer.write, level=settings.LOG_BUFFER_LEVEL, format="{message}")
+
 class SystemMonitor:
     @staticmethod
-    def get_cpu_info() -> Dict[str, Any]:
-        cpu_percent = psutil.cpu_percent(interval=1)
-        cpu_count = psutil.cpu_count()
-        process_count = len(psutil.pids())
-        
-        return {
-            "usage": cpu_percent,
-            "cores": cpu_count,
-            "processes": process_count
-        }
-    
-    @staticmethod
-    def get_memory_info() -> Dict[str, Any]:
-        memory = psutil.virtual_memory()
-        return {
-            "total": memory.total,
-            "used": memory.used,
-            "free": memory.available
-        }
-    
-    @staticmethod
-    def get_disk_info() -> Dict[str, Any]:
-        disk = psutil.disk_usage('/')
-        return {
-            "total": disk.total,
-            "used": disk.used,
-            "free": disk.free
-        }
-    
-    @staticmethod
-    def get_gpu_info() -> Dict[str, Any]:
-        try:
-            gpus = GPUtil.getGPUs()
-            if gpus:
-                gpu = gpus[0]  # 첫 번째 GPU 정보
-                return {
-                    "usage": gpu.load * 100,
-                    "memory_total": gpu.memoryTotal,
-                    "memory_used": gpu.memoryUsed,
-                    "temperature": gpu.temperature
-                }
-        except Exception as e:
-            logger.warning(f"GPU 정보 조회 실패: {e}")
-        
-        # GPU 정보를 가져올 수 없는 경우 기본값 반환
-        return {
-            "usage": 0,
-            "memory_total": 0,
-            "memory_used": 0,
-            "temperature": 0
-        }
+    def get_system_logs(limit: int = 50) -> List[Dict[str, Any]]:
+        """최근 시스템 로그"""
+        logs, _, _ = log_buffer.since(limit=limit)
+        return logs
 
-    @staticmethod
-    def get_system_logs() -> List[Dict[str, Any]]:
-        # 시스템 로그를 가져오는 로직
-        # 예시로 최근 로그 몇 개를 반환
-        return [
-            {
-                "timestamp": datetime.now().isoformat(),
-                "level": "info",
-                "message": "시스템이 정상 작동 중입니다."
-            }
-        ]
+# 백그라운드 지표 샘플러 (서버 시작 시 시작, 요청은 마지막 스냅샷만 읽음)
+system_sampler = SystemMetricsSampler(
+    interval=settings.SYSTEM_METRICS_INTERVAL,
+    gpu_interval=settings.GPU_METRICS_INTERVAL
+)
+
+# 시스템/파이프라인 지표 이력 (샘플러 스냅샷마다 기록)
+metrics_history = MetricsHistory(max_series=settings.METRICS_HISTORY_MAX_SERIES)
+_frame_rates = RateMeter()
+
+def _percent(used, total) -> float:
+    return used / total * 100 if total else 0.0
+
+def record_metrics_history(snapshot: Dict[str, Any]):
+    """스냅샷과 카메라 파이프라인 지표를 이력에 기록 (샘플러 스레드에서 호출)"""
+    values = {
+        "cpu.usage": snapshot["cpu"]["usage"],
+        "memory.percent": _percent(snapshot["memory"]["used"], snapshot["memory"]["total"]),
+        "disk.percent": _percent(snapshot["disk"]["used"], snapshot["disk"]["total"]),
+        "gpu.usage": snapshot["gpu"]["usage"],
+        "process.cpu_percent": snapshot["process"]["cpu_percent"],
+        "process.memory_rss": snapshot["process"]["memory_rss"]
+    }
+    broadcasters = dict(camera_manager.broadcasters)
+    for camera_id, broadcaster in broadcasters.items():
+        values[f"camera.{camera_id}.fps"] = _frame_rates.rate(camera_id, broadcaster.output.seq)
+        values[f"camera.{camera_id}.detections"] = broadcaster.detection_count()
+    _frame_rates.retain(broadcasters)
+    if camera_manager.batcher:
+        values["inference.latency_ms"] = camera_manager.batcher.get_stats()["latency_ms"]["mean"]
+    metrics_history.record_many(values, snapshot["timestamp"])
+
+system_sampler.add_listener(record_metrics_history)
+
+PUSHED_METRICS = ("cpu", "memory", "disk", "gpu", "process")
+
+def collect_system_metrics() -> Dict[str, Any]:
+    """푸시 채널용 지표 (스레드 목록은 매번 바뀌므로 제외)"""
+    snapshot = system_sampler.get_snapshot() or {}
+    return {key: snapshot[key] for key in PUSHED_METRICS if key in snapshot}
+
+# 대시보드 푸시 채널 (모든 탭이 한 번 계산한 결과를 공유)
+push_hub = PushHub(camera_manager, collect_system_metrics, log_buffer,
+                   interval=settings.PUSH_INTERVAL_SECONDS, queue_size=settings.PUSH_CLIENT_QUEUE_SIZE)
+# 파이프라인이 저장한 이벤트는 writer가 커밋 직후 허브로 전달
+if camera_manager.event_writer:
+    camera_manager.event_writer.add_listener(push_hub.publish_events)
 
 @router.get("/status")
 async def get_system_status():
     """시스템 상태 정보를 반환합니다."""
     try:
         monitor = SystemMonitor()
+        snapshot = system_sampler.get_snapshot()
+        if snapshot is None:
+            return {"success": False, "error": "System metrics are not sampled yet"}
         
         status = {
             "success": True,
-            "cpu": monitor.get_cpu_info(),
-            "memory": monitor.get_memory_info(),
-            "disk": monitor.get_disk_info(),
-            "gpu": monitor.get_gpu_info(),
+            **snapshot,
+            "sample_ms": round(system_sampler.sample_ms, 2),
             "logs": monitor.get_system_logs()
         }
         
@@ -100,23 +100,52 @@ async def get_system_status():
             "error": str(e)
         }
 
-# 시스템 로그 저장을 위한 간단한 인메모리 큐
-system_logs = []
-MAX_LOGS = 1000
+@router.get("/history/metrics")
+async def list_history_metrics():
+    """이력이 기록된 지표 이름과 마지막 값"""
+    return {"metrics": metrics_history.metrics()}
+
+@router.get("/history")
+async def get_metric_history(
+    metric: str,
+    start: Optional[float] = Query(None, alias="from", description="시작 시각 (unix 초, 기본: to - 1시간)"),
+    end: Optional[float] = Query(None, alias="to", description="끝 시각 (unix 초, 기본: 현재)"),
+    step: Optional[float] = Query(None, gt=0, description="다운샘플링 간격 (초, 기본: 최대 300개 포인트)")
+):
+    """지표 이력 조회 (구간/간격에 맞는 해상도의 롤업에서 평균/최소/최대 반환)"""
+    end = time.time() if end is None else end
+    start = end - 3600 if start is None else start
+    if start > end:
+        raise HTTPException(status_code=400, detail="from must not be after to")
+    history = metrics_history.query(metric, start, end, step)
+    if history is None:
+        raise HTTPException(status_code=404, detail=f"Unknown metric '{metric}'")
+    return history
 
 def add_system_log(level: str, message: str):
     """시스템 로그를 추가합니다."""
-    log_entry = {
-        "timestamp": datetime.now().isoformat(),
-        "level": level,
-        "message": message
-    }
-    
-    system_logs.append(log_entry)
-    if len(system_logs) > MAX_LOGS:
-        system_logs.pop(0)  # 가장 오래된 로그 제거
-    
-    return log_entry
+    return log_buffer.append(level, message)
+
+@router.get("/logs")
+async def get_system_logs(
+    after: Optional[int] = Query(None, ge=0, description="이전 응답의 cursor (생략 시 최신 로그)"),
+    level: Optional[str] = Query(None, description="최소 레벨 (예: warning)"),
+    camera_id: Optional[int] = None,
+    limit: int = Query(200, ge=1, le=1000)
+):
+    """로그 조회 (after 커서 이후의 새 로그만 반환)"""
+    if level is not None:
+        try:
+            loguru_logger.level(level.upper())
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Unknown log level '{level}'")
+    logs, cursor, missed = log_buffer.since(after, level, camera_id, limit)
+    return {"logs": logs, "cursor": cursor, "missed": missed}
+
+@router.get("/logs/stats")
+async def get_log_stats():
+    """로그 버퍼 통계 (레벨별/카메라별 보관 항목 수)"""
+    return log_buffer.get_stats()
 
 @router.post("/log")
 async def add_log(level: str, message: str):
@@ -126,4 +155,39 @@ async def add_log(level: str, message: str):
         return {"success": True, "log": log_entry}
     except Exception as e:
         logger.error(f"로그 추가 실패: {e}")
-        return {"success": False, "error": str(e)} 
\ No newline at end of file
+        return {"success": False, "error": str(e)}
+
+@router.websocket("/ws")
+async def system_push(websocket: WebSocket):
+    """시스템 지표, 카메라별 감지 수/fps, 새 이벤트 푸시
+
+    연결 직후 {"type": "snapshot"}으로 전체 상태를, 이후 {"type": "delta"}로
+    바뀐 값만 보낸다 (null은 삭제된 항목). 새 이벤트는 "events", 새 로그는 "logs" 목록으로 전달된다.
+    """
+    await websocket.accept()
+    client = push_hub.connect()
+
+    async def forward():
+        while True:
+            await websocket.send_text(await client.queue.get())
+
+    async def receive():
+        # 클라이언트 메시지는 쓰지 않고 연결 종료 감지에만 사용
+        while True:
+            await websocket.receive_text()
+
+    # 송신 실패나 수신 측 연결 종료 중 먼저 끝나는 쪽에서 정리
+    tasks = [asyncio.ensure_future(forward()), asyncio.ensure_future(receive())]
+    try:
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in tasks:
+            task.cancel()
+        # 취소/종료된 태스크의 예외(WebSocketDisconnect, 송신 오류)를 회수해 미처리 예외 경고를 막음
+        await asyncio.gather(*tasks, return_exceptions=True)
+        push_hub.disconnect(client)
+
+@router.get("/push/stats")
+async def get_push_stats():
+    """푸시 채널 통계 (연결 수, 전송/폐기 메시지 수)"""
+    return push_hub.get_stats()
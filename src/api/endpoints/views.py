@@ -675,6 +675,13 @@ async def view_page():
             <script>
                 // 모니터링 관련 변수
                 let monitoringInterval = null;
+                let monitoringOpen = false;
+
+                // 푸시 채널 상태 (서버가 보낸 스냅샷에 delta를 병합해 유지)
+                let pushSocket = null;
+                let pushConnected = false;
+                let pushState = {};
+                const PUSH_RECONNECT_MS = 5000;
 
                 // 모니터링 모달 열기/닫기
                 function openMonitoring() {
@@ -687,13 +694,29 @@ async def view_page():
                     stopMonitoring();
                 }
 
-                // 모니터링 시작/중지
+                // 모니터링 시작/중지 (푸시 채널이 연결돼 있으면 폴링하지 않음)
                 function startMonitoring() {
+                    monitoringOpen = true;
+                    if (pushConnected && pushState.system) {
+                        renderSystemStatus(pushState.system);
+                    } else {
+                        startPolling();
+                    }
+                }
+
+                function stopMonitoring() {
+                    monitoringOpen = false;
+                    stopPolling();
+                }
+
+                // 푸시 채널을 쓸 수 없을 때의 폴링 대체 경로
+                function startPolling() {
+                    if (monitoringInterval) return;
                     updateSystemStatus();
                     monitoringInterval = setInterval(updateSystemStatus, 3000);  // 3초마다 업데이트
                 }
 
-                function stopMonitoring() {
+                function stopPolling() {
                     if (monitoringInterval) {
                         clearInterval(monitoringInterval);
                         monitoringInterval = null;
@@ -707,10 +730,7 @@ async def view_page():
                         const data = await response.json();
                         
                         if (data.success) {
-                            updateCpuStatus(data.cpu);
-                            updateMemoryStatus(data.memory);
-                            updateDiskStatus(data.disk);
-                            updateGpuStatus(data.gpu);
+                            renderSystemStatus(data);
                             updateSystemLogs(data.logs);
                         }
                     } catch (error) {
@@ -718,6 +738,91 @@ async def view_page():
                     }
                 }
 
+                function renderSystemStatus(system) {
+                    updateCpuStatus(system.cpu);
+                    updateMemoryStatus(system.memory);
+                    updateDiskStatus(system.disk);
+                    updateGpuStatus(system.gpu);
+                }
+
+                // 푸시 채널 연결 (시스템 지표, 카메라별 감지 수/fps, 새 이벤트)
+                function connectPush() {
+                    if (!('WebSocket' in window)) return;
+                    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+                    pushSocket = new WebSocket(`${protocol}://${window.location.host}/api/v1/system/ws`);
+
+                    pushSocket.onopen = () => {
+                        pushConnected = true;
+                        stopPolling();
+                    };
+                    pushSocket.onmessage = (message) => applyPush(JSON.parse(message.data));
+                    pushSocket.onclose = () => {
+                        pushConnected = false;
+                        pushSocket = null;
+                        if (monitoringOpen) startPolling();
+                        setTimeout(connectPush, PUSH_RECONNECT_MS);
+                    };
+                }
+
+                // delta 병합 (null은 삭제)
+                function mergeDelta(target, delta) {
+                    for (const [key, value] of Object.entries(delta)) {
+                        if (value === null) {
+                            delete target[key];
+                        } else if (typeof value === 'object' && !Array.isArray(value)
+                                   && typeof target[key] === 'object' && target[key] !== null) {
+                            mergeDelta(target[key], value);
+                        } else {
+                            target[key] = value;
+                        }
+                    }
+                    return target;
+                }
+
+                function applyPush(message) {
+                    if (message.type === 'snapshot') {
+                        pushState = message.data;
+                        updateSystemLogs(message.logs || []);
+                    } else {
+                        mergeDelta(pushState, message.data);
+                        if (message.logs && message.logs.length) {
+                            appendLogItems(message.logs);
+                        }
+                    }
+
+                    if (monitoringOpen && pushState.system) {
+                        renderSystemStatus(pushState.system);
+                    }
+                    updateCameraStatus(pushState.cameras || {});
+                    if (message.events && message.events.length) {
+                        appendLogItems(message.events.map(event => ({
+                            timestamp: event.timestamp,
+                            level: 'info',
+                            message: `카메라 ${event.camera_id}: ${event.event_type}${event.description ? ' - ' + event.description : ''}`
+                        })));
+                    }
+                }
+
+                // 카메라 셀 하단에 서버 측 스트림 fps와 현재 감지 수 표시
+                function updateCameraStatus(cameras) {
+                    for (const [cameraId, camera] of Object.entries(cameras)) {
+                        const fpsElement = document.getElementById(`fps-${cameraId}`);
+                        if (fpsElement) {
+                            fpsElement.textContent = `${Math.round(camera.fps)} FPS · 감지 ${camera.detections}`;
+                        }
+                    }
+                }
+
+                // 새 로그/이벤트를 시스템 로그 뷰어 끝에 추가 (최근 50개 유지)
+                function appendLogItems(items) {
+                    const logViewer = document.getElementById('system-log-viewer');
+                    logViewer.insertAdjacentHTML('beforeend', items.map(renderLogItem).join(''));
+                    while (logViewer.children.length > 50) {
+                        logViewer.removeChild(logViewer.firstElementChild);
+                    }
+                    logViewer.scrollTop = logViewer.scrollHeight;
+                }
+
                 // 각 컴포넌트 상태 업데이트 함수들
                 function updateCpuStatus(cpu) {
                     document.getElementById('cpu-usage').textContent = `${cpu.usage}%`;
@@ -778,17 +883,28 @@ async def view_page():
                     }
                 }
 
+                // 로그 메시지에는 외부에서 등록한 이벤트 설명이 들어가므로 HTML로 해석되지 않게 이스케이프
+                function escapeHtml(value) {
+                    return String(value ?? '').replace(/[&<>"']/g, ch => ({
+                        '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'
+                    })[ch]);
+                }
+
                 // 시스템 로그 업데이트
+                function renderLogItem(log) {
+                    return `
+                        <div class="log-item ${escapeHtml(String(log.level).toLowerCase())}">
+                            <span class="log-time">[${escapeHtml(formatDateTime(log.timestamp))}]</span>
+                            <span class="log-message">${escapeHtml(log.message)}</span>
+                        </div>
+                    `;
+                }
+
                 function updateSystemLogs(logs) {
                     const logViewer = document.getElementById('system-log-viewer');
                     const recentLogs = logs.slice(-50);  // 최근 50개만 표시
                     
-                    logViewer.innerHTML = recentLogs.map(log => `
-                        <div class="log-item ${log.level.toLowerCase()}">
-                            <span class="log-time">[${formatDateTime(log.timestamp)}]</span>
-                            <span class="log-message">${log.message}</span>
-                        </div>
-                    `).join('');
+                    logViewer.innerHTML = recentLogs.map(renderLogItem).join('');
                     
                     logViewer.scrollTop = logViewer.scrollHeight;  // 자동 스크롤
                 }
@@ -831,59 +947,27 @@ async def view_page():
                     }
                 }
 
-                // FPS 계산을 위한 변수들
-                const fpsCounters = new Map();  // 각 카메라별 FPS 카운터
-
-                // FPS 계산 함수
-                function initFPSCounter(cameraId) {
-                    fpsCounters.set(cameraId, {
-                        frameCount: 0,
-                        lastTime: performance.now(),
-                        fps: 0
-                    });
-                }
-
-                function updateFPS(cameraId) {
-                    const counter = fpsCounters.get(cameraId);
-                    if (!counter) return;
-
-                    counter.frameCount++;
-                    const now = performance.now();
-                    const elapsed = now - counter.lastTime;
-
-                    if (elapsed >= 1000) {  // 1초마다 FPS 업데이트
-                        counter.fps = Math.round((counter.frameCount * 1000) / elapsed);
-                        counter.frameCount = 0;
-                        counter.lastTime = now;
+                // 그리드 셀용 스트림 형식 (축소 + 낮은 JPEG 품질로 대역폭 절약)
+                const GRID_STREAM_PARAMS = 'width=640&quality=70';
 
-                        // FPS 표시 업데이트
-                        const fpsElement = document.getElementById(`fps-${cameraId}`);
-                        if (fpsElement) {
-                            fpsElement.textContent = `${counter.fps} FPS`;
-                        }
-                    }
-                }
-
-                // 웹캠 스트림 시작 함수 수정
+                // 웹캠 스트림 시작 함수 수정 (FPS 표시는 푸시 채널의 서버 측 값으로 갱신: updateCameraStatus)
                 function startWebcamStream(cameraId) {
                     const img = document.querySelector(`#camera-${cameraId} img`);
-                    initFPSCounter(cameraId);  // FPS 카운터 초기화
 
                     img.onload = () => {
-                        updateFPS(cameraId);  // 프레임이 로드될 때마다 FPS 업데이트
                         // 다음 프레임 요청
-                        img.src = `/api/v1/cameras/${cameraId}/stream?t=${Date.now()}`;
+                        img.src = `/api/v1/cameras/${cameraId}/stream?${GRID_STREAM_PARAMS}&t=${Date.now()}`;
                     };
 
                     img.onerror = () => {
                         // 오류 발생 시 잠시 후 다시 시도
                         setTimeout(() => {
-                            img.src = `/api/v1/cameras/${cameraId}/stream?t=${Date.now()}`;
+                            img.src = `/api/v1/cameras/${cameraId}/stream?${GRID_STREAM_PARAMS}&t=${Date.now()}`;
                         }, 1000);
                     };
 
                     // 첫 프레임 요청
-                    img.src = `/api/v1/cameras/${cameraId}/stream`;
+                    img.src = `/api/v1/cameras/${cameraId}/stream?${GRID_STREAM_PARAMS}`;
                 }
 
                 // 카메라 관련 변수
@@ -916,7 +1000,7 @@ async def view_page():
                         }).then(response => {
                             if (response.ok) {
                                 img.style.display = 'block';
-                                img.src = `/api/v1/cameras/${cameraId}/stream`;
+                                img.src = `/api/v1/cameras/${cameraId}/stream?${GRID_STREAM_PARAMS}`;
                                 noSignal.style.display = 'none';
                                 statusIcon.classList.add('connected');
                                 activeStreams.add(cameraId);
@@ -971,7 +1055,6 @@ async def view_page():
                             noSignal.style.display = 'none';
                             if (cameraId === 1) {
                                 startWebcamStream(cameraId);
-                                initFPSCounter(cameraId);  // FPS 카운터 초기화
                             }
                         } else {
                             // 카메라 꺼짐 상태
@@ -1062,6 +1145,9 @@ async def view_page():
                         initWebcam(i);
                     }
 
+                    // 대시보드 푸시 채널 연결 (실패 시 모니터링은 폴링으로 대체)
+                    connectPush();
+
                     // 모달 이벤트 리스너
                     document.getElementById('monitoring-modal').addEventListener('hidden', stopMonitoring);
                 });
@@ -0,0 +1,85 @@
+"""추론 백엔드 비교 벤치마크: 시작 시간, CPU fps, 출력 일치도
+
+사용법:
+    python -m src.benchmarks.bench_backends --images samples/ [--backends torch,onnxruntime,opencv]
+
+첫 번째 백엔드를 기준으로 나머지 백엔드의 박스가 IoU/신뢰도 허용 오차 안에서
+일치하는지 확인한다. 합성 프레임에는 사람이 없으므로 일치도 확인에는 실제
+영상(--video)이나 이미지 폴더(--images)를 사용한다.
+"""
+import argparse
+import time
+import cv2
+import numpy as np
+from ..config import settings
+from ..services.detection import PERSON_CLASS_ID, box_iou
+from ..services.inference_backends import BACKENDS, create_backend
+from .frames import load_frames
+
+def compare_outputs(reference, candidate, iou_tolerance: float, conf_tolerance: float):
+    """프레임별 박스 매칭 후 (일치 박스 수, 전체 박스 수, 최대 신뢰도 차이) 반환"""
+    matched, total, max_conf_diff = 0, 0, 0.0
+    for ref, cand in zip(reference, candidate):
+        total += max(len(ref), len(cand))
+        if not len(ref) or not len(cand):
+            continue
+        iou = box_iou(ref[:, :4], cand[:, :4])
+        best = iou.argmax(axis=1)
+        ok = iou[np.arange(len(ref)), best] >= iou_tolerance
+        conf_diff = np.abs(ref[ok, 4] - cand[best[ok], 4])
+        ok_conf = conf_diff <= conf_tolerance
+        matched += int(ok_conf.sum())
+        if conf_diff.size:
+            max_conf_diff = max(max_conf_diff, float(conf_diff.max()))
+    return matched, total, max_conf_diff
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--backends', default=','.join(BACKENDS))
+    parser.add_argument('--video')
+    parser.add_argument('--images')
+    parser.add_argument('--frames', type=int, default=50)
+    parser.add_argument('--model-path', default=settings.MODEL_PATH)
+    parser.add_argument('--model-name', default=settings.MODEL_NAME)
+    parser.add_argument('--input-size', type=int, default=settings.INFERENCE_INPUT_SIZE)
+    parser.add_argument('--iou-tolerance', type=float, default=0.9)
+    parser.add_argument('--conf-tolerance', type=float, default=0.05)
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.images, args.frames)
+    rgb_frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+
+    outputs = {}
+    print(f"{'backend':<12} {'startup(s)':>10} {'fps':>8} {'ms/frame':>9} {'boxes':>6}")
+    for name in args.backends.split(','):
+        started = time.perf_counter()
+        try:
+            backend = create_backend(name, args.model_path, args.model_name, args.input_size,
+                                     classes=(PERSON_CLASS_ID,))
+        except Exception as e:
+            print(f"{name:<12} unavailable: {e}")
+            continue
+        startup = time.perf_counter() - started
+
+        backend.infer(rgb_frames[:1])  # 워밍업
+        started = time.perf_counter()
+        results = [backend.infer([image])[0] for image in rgb_frames]
+        elapsed = time.perf_counter() - started
+
+        outputs[name] = results
+        boxes = sum(len(r) for r in results)
+        print(f"{name:<12} {startup:>10.2f} {len(frames) / elapsed:>8.1f} "
+              f"{elapsed / len(frames) * 1000:>9.1f} {boxes:>6}")
+
+    if len(outputs) < 2:
+        return
+    reference_name, *others = outputs
+    print(f"\nagreement vs {reference_name} (IoU >= {args.iou_tolerance}, |conf diff| <= {args.conf_tolerance})")
+    for name in others:
+        matched, total, max_conf_diff = compare_outputs(outputs[reference_name], outputs[name],
+                                                        args.iou_tolerance, args.conf_tolerance)
+        ratio = matched / total if total else 1.0
+        print(f"{name:<12} matched {matched}/{total} ({ratio:.1%}), max conf diff {max_conf_diff:.4f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""이벤트 저장 처리량 벤치마크: 요청당 1건 커밋 vs 일괄 INSERT
+
+사용법:
+    python -m src.benchmarks.bench_event_ingest [--events 5000] [--batch-size 500] [--url sqlite:///bench.db]
+
+--url을 생략하면 임시 디렉터리의 SQLite 파일을 사용한다 (운영 DB에 쓰지 않도록 주의).
+단건 경로는 create_event와 같이 add -> commit -> refresh를 이벤트마다 반복하고,
+일괄 경로는 crud.create_events로 batch-size개씩 INSERT 한 문장 + 커밋 1회로 저장한다.
+"""
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from ..models import crud, models, schemas
+from ..models.database import Base
+
+EVENT_TYPES = ("person_detected", "person_left", "camera_offline")
+
+def make_events(count: int):
+    start = datetime.utcnow() - timedelta(seconds=count)
+    return [
+        schemas.EventIngest(
+            camera_id=i % 16 + 1,
+            event_type=EVENT_TYPES[i % len(EVENT_TYPES)],
+            description=f"bench event {i}",
+            timestamp=start + timedelta(seconds=i)
+        )
+        for i in range(count)
+    ]
+
+def single(Session, events) -> float:
+    db = Session()
+    started = time.perf_counter()
+    try:
+        for event in events:
+            db_event = models.Event(**event.dict())
+            db.add(db_event)
+            db.commit()
+            db.refresh(db_event)
+    finally:
+        db.close()
+    return time.perf_counter() - started
+
+def batched(Session, events, batch_size: int) -> float:
+    db = Session()
+    started = time.perf_counter()
+    try:
+        for offset in range(0, len(events), batch_size):
+            crud.create_events(db, events[offset:offset + batch_size])
+    finally:
+        db.close()
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--events', type=int, default=5000)
+    parser.add_argument('--single-events', type=int, default=None,
+                        help='단건 경로에 쓸 이벤트 수 (느리므로 기본값은 --events의 1/5)')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--url', default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = args.url or f"sqlite:///{os.path.join(tmp, 'bench_events.db')}"
+        engine = create_engine(url)
+        Base.metadata.create_all(bind=engine)
+        Session = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+        single_events = make_events(args.single_events or max(1, args.events // 5))
+        batch_events = make_events(args.events)
+
+        single_seconds = single(Session, single_events)
+        batch_seconds = batched(Session, batch_events, args.batch_size)
+        engine.dispose()
+
+    single_rate = len(single_events) / single_seconds
+    batch_rate = len(batch_events) / batch_seconds
+    print(f"{'path':<22} {'events':>8} {'seconds':>9} {'events/s':>10}")
+    print(f"{'single (commit each)':<22} {len(single_events):>8} {single_seconds:>9.2f} {single_rate:>10.0f}")
+    print(f"{f'batch ({args.batch_size}/commit)':<22} {len(batch_events):>8} {batch_seconds:>9.2f} {batch_rate:>10.0f}")
+    print(f"speedup: {batch_rate / single_rate:.1f}x")
+
+if __name__ == "__main__":
+    main()
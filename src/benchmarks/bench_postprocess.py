@@ -0,0 +1,88 @@
+"""감지 후처리 마이크로 벤치마크: pandas 경로 vs 배열 경로
+
+사용법:
+    python -m src.benchmarks.bench_postprocess [--recording detections.npz] [--iterations 200]
+
+--recording에는 프레임별 모델 원시 출력 (N, 6) [x1, y1, x2, y2, conf, cls] 배열을
+담은 .npz 파일을 넘긴다. 없으면 비슷한 분포의 합성 감지 결과를 사용한다.
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from ..services.detection import Detections, draw_detections
+
+FRAME_SHAPE = (1080, 1920, 3)
+PANDAS_COLUMNS = ['xmin', 'ymin', 'xmax', 'ymax', 'confidence', 'class']
+
+def load_recording(path: str):
+    data = np.load(path)
+    return [data[key].astype(np.float32).reshape(-1, 6) for key in sorted(data.files)]
+
+def synthesize_recording(num_frames: int = 300, max_objects: int = 30, seed: int = 0):
+    """yolov5s 출력과 비슷한 합성 감지 결과 생성"""
+    rng = np.random.default_rng(seed)
+    height, width = FRAME_SHAPE[:2]
+    frames = []
+    for _ in range(num_frames):
+        n = int(rng.integers(0, max_objects + 1))
+        x1 = rng.uniform(0, width - 50, n)
+        y1 = rng.uniform(0, height - 100, n)
+        x2 = np.minimum(x1 + rng.uniform(20, 200, n), width - 1)
+        y2 = np.minimum(y1 + rng.uniform(50, 400, n), height - 1)
+        conf = rng.uniform(0.25, 1.0, n)
+        cls = rng.choice([0, 0, 0, 2, 24, 56], n)  # 대부분 person
+        frames.append(np.stack([x1, y1, x2, y2, conf, cls], axis=1).astype(np.float32))
+    return frames
+
+def pandas_path(xyxy: np.ndarray, frame: np.ndarray, threshold: float) -> int:
+    """기존 경로: results.pandas().xyxy[0] 생성 -> DataFrame 마스크 -> iterrows 그리기"""
+    import cv2
+    persons = pd.DataFrame(xyxy, columns=PANDAS_COLUMNS)
+    persons['class'] = persons['class'].astype(int)
+    persons['name'] = persons['class'].map(lambda c: 'person' if c == 0 else 'other')
+    persons = persons[persons['class'] == 0]
+    persons = persons[persons['confidence'] >= threshold]
+    for _, person in persons.iterrows():
+        cv2.rectangle(frame,
+                      (int(person['xmin']), int(person['ymin'])),
+                      (int(person['xmax']), int(person['ymax'])),
+                      (0, 255, 0), 2)
+    return len(persons)
+
+def array_path(xyxy: np.ndarray, frame: np.ndarray, threshold: float) -> int:
+    """새 경로: 원시 배열에서 필터링 후 정수 박스로 그리기"""
+    detections = Detections.from_xyxy(xyxy, threshold)
+    draw_detections(frame, detections)
+    return len(detections)
+
+def bench(fn, recording, iterations: int, threshold: float) -> float:
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(recording[i % len(recording)], frame, threshold)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--recording', help='프레임별 감지 결과 .npz 파일')
+    parser.add_argument('--iterations', type=int, default=2000)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    args = parser.parse_args()
+
+    recording = load_recording(args.recording) if args.recording else synthesize_recording()
+
+    # 두 경로의 감지 수가 같은지 먼저 확인
+    frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+    for xyxy in recording:
+        assert pandas_path(xyxy, frame, args.threshold) == array_path(xyxy, frame, args.threshold)
+
+    pandas_us = bench(pandas_path, recording, args.iterations, args.threshold)
+    array_us = bench(array_path, recording, args.iterations, args.threshold)
+    print(f"frames={len(recording)} iterations={args.iterations}")
+    print(f"pandas path: {pandas_us:9.1f} us/frame")
+    print(f"array path:  {array_us:9.1f} us/frame")
+    print(f"speedup:     {pandas_us / array_us:9.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""추론 해상도별 비용 벤치마크
+
+사용법:
+    python -m src.benchmarks.bench_resolution --video sample.mp4 [--sizes 640,416,320]
+
+해상도마다 캡처 스레드의 준비 비용 (레터박스 + RGB 변환)과 추론 비용을 측정하고,
+전체 해상도 프레임을 그대로 넘기던 기존 경로 (전체 프레임 RGB 변환 + 추론)와 비교한다.
+"""
+import argparse
+import time
+import cv2
+from ..config import settings
+from ..services.detection import PERSON_CLASS_ID
+from ..services.inference_backends import PreparedFrame, create_backend
+from .frames import load_frames
+
+def time_ms(fn, items):
+    started = time.perf_counter()
+    results = [fn(item) for item in items]
+    return (time.perf_counter() - started) / len(items) * 1000, results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--video')
+    parser.add_argument('--images')
+    parser.add_argument('--frames', type=int, default=50)
+    parser.add_argument('--sizes', default='640,416,320')
+    parser.add_argument('--backend', default=settings.INFERENCE_BACKEND)
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.images, args.frames)
+    backend = create_backend(args.backend, settings.MODEL_PATH, settings.MODEL_NAME,
+                             settings.INFERENCE_INPUT_SIZE, classes=(PERSON_CLASS_ID,))
+    backend.infer([cv2.cvtColor(frames[0], cv2.COLOR_BGR2RGB)])  # 워밍업
+
+    height, width = frames[0].shape[:2]
+    print(f"frames={len(frames)} source={width}x{height} backend={backend.name}")
+    print(f"{'path':<14} {'prepare(ms)':>11} {'infer(ms)':>10} {'total(ms)':>10} {'boxes':>6}")
+
+    # 기존 경로: 전체 해상도 RGB 변환 후 모델 내부에서 리사이즈
+    prep_ms, rgb_frames = time_ms(lambda f: cv2.cvtColor(f, cv2.COLOR_BGR2RGB), frames)
+    infer_ms, results = time_ms(lambda image: backend.infer([image])[0], rgb_frames)
+    boxes = sum(len(r) for r in results)
+    print(f"{'full-frame':<14} {prep_ms:>11.2f} {infer_ms:>10.2f} {prep_ms + infer_ms:>10.2f} {boxes:>6}")
+
+    for size in (int(s) for s in args.sizes.split(',')):
+        prep_ms, prepared = time_ms(lambda f: PreparedFrame.from_bgr(f, size), frames)
+        infer_ms, results = time_ms(lambda p: p.to_original(backend.infer([p.image], p.size)[0]), prepared)
+        boxes = sum(len(r) for r in results)
+        print(f"{f'prepared-{size}':<14} {prep_ms:>11.2f} {infer_ms:>10.2f} {prep_ms + infer_ms:>10.2f} {boxes:>6}")
+
+if __name__ == "__main__":
+    main()
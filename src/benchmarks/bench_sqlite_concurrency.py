@@ -0,0 +1,139 @@
+"""SQLite 동시 읽기/쓰기 벤치마크: 기본 엔진 vs 튜닝 프로필 (WAL + 쓰기/읽기 풀 분리)
+
+사용법:
+    python -m src.benchmarks.bench_sqlite_concurrency [--seconds 10] [--readers 4] [--batch-size 200] [--seed-events 50000]
+
+임시 디렉터리의 SQLite 파일에 프로필마다 새 DB를 만들고, 쓰기 스레드 1개가 batch-size개씩
+crud.save_event_rows로 계속 저장하는 동안 읽기 스레드들이 crud.query_events로 카메라별 최신 이벤트를 조회한다.
+쓰기 처리량과 배치 커밋 지연(p50/p99/최대)으로 읽기가 수집을 멈추게 하는지 확인하고,
+읽기 지연과 "database is locked" 오류 수를 함께 출력한다.
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from sqlalchemy.orm import sessionmaker
+from ..models import crud
+from ..models.database import Base, create_engines
+
+EVENT_TYPES = ("person_detected", "person_left", "camera_offline")
+CAMERAS = 16
+
+def make_rows(count: int, start: datetime):
+    return [
+        {
+            "camera_id": i % CAMERAS + 1,
+            "event_type": EVENT_TYPES[i % len(EVENT_TYPES)],
+            "description": f"bench event {i}",
+            "timestamp": start + timedelta(milliseconds=i)
+        }
+        for i in range(count)
+    ]
+
+def percentile(values, q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+def writer(Session, stop: threading.Event, batch_size: int, result: dict):
+    latencies, written, errors = [], 0, 0
+    start = datetime.utcnow()
+    db = Session()
+    try:
+        while not stop.is_set():
+            rows = make_rows(batch_size, start + timedelta(milliseconds=written))
+            started = time.perf_counter()
+            try:
+                crud.save_event_rows(db, rows)
+                written += len(rows)
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        db.close()
+    result.update(latencies=latencies, written=written, errors=errors)
+
+def reader(Session, stop: threading.Event, limit: int, result: dict):
+    latencies, errors = [], 0
+    rng = random.Random()
+    while not stop.is_set():
+        db = Session()
+        started = time.perf_counter()
+        try:
+            crud.query_events(db, camera_id=rng.randint(1, CAMERAS), limit=limit)
+        except Exception:
+            errors += 1
+        finally:
+            db.close()
+        latencies.append((time.perf_counter() - started) * 1000)
+    result.update(latencies=latencies, errors=errors)
+
+def run_profile(url: str, tuned: bool, args) -> dict:
+    write_engine, read_engine = create_engines(url, tuned=tuned)
+    Base.metadata.create_all(bind=write_engine)
+    WriteSession = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+    ReadSession = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+    seed = WriteSession()
+    try:
+        crud.save_event_rows(seed, make_rows(args.seed_events, datetime.utcnow() - timedelta(days=1)))
+    finally:
+        seed.close()
+
+    stop = threading.Event()
+    write_result, read_results = {}, [{} for _ in range(args.readers)]
+    threads = [threading.Thread(target=writer, args=(WriteSession, stop, args.batch_size, write_result))]
+    threads += [threading.Thread(target=reader, args=(ReadSession, stop, args.limit, result))
+                for result in read_results]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    write_engine.dispose()
+    read_engine.dispose()
+    read_latencies = [latency for result in read_results for latency in result["latencies"]]
+    return {
+        "writes_per_sec": write_result["written"] / args.seconds,
+        "write_p50": statistics.median(write_result["latencies"]) if write_result["latencies"] else 0.0,
+        "write_p99": percentile(write_result["latencies"], 0.99),
+        "write_max": max(write_result["latencies"], default=0.0),
+        "write_errors": write_result["errors"],
+        "reads_per_sec": len(read_latencies) / args.seconds,
+        "read_p50": statistics.median(read_latencies) if read_latencies else 0.0,
+        "read_p99": percentile(read_latencies, 0.99),
+        "read_errors": sum(result["errors"] for result in read_results)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--readers', type=int, default=4)
+    parser.add_argument('--batch-size', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=100, help='읽기 한 번에 조회할 이벤트 수')
+    parser.add_argument('--seed-events', type=int, default=50000)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, tuned in (("default", False), ("tuned", True)):
+            url = f"sqlite:///{os.path.join(tmp, f'bench_{name}.db')}"
+            results[name] = run_profile(url, tuned, args)
+
+    print(f"{'profile':<9} {'writes/s':>9} {'w p50':>7} {'w p99':>7} {'w max':>8} {'w err':>6} "
+          f"{'reads/s':>8} {'r p50':>7} {'r p99':>7} {'r err':>6}")
+    for name, r in results.items():
+        print(f"{name:<9} {r['writes_per_sec']:>9.0f} {r['write_p50']:>7.1f} {r['write_p99']:>7.1f} "
+              f"{r['write_max']:>8.1f} {r['write_errors']:>6} {r['reads_per_sec']:>8.0f} "
+              f"{r['read_p50']:>7.1f} {r['read_p99']:>7.1f} {r['read_errors']:>6}")
+    print("latencies in ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""추론 워커 수에 따른 처리량 벤치마크
+
+사용법:
+    python -m src.benchmarks.bench_workers --images samples/ [--workers 1,2,4,8] [--cameras 16]
+
+카메라 수만큼의 스레드가 각자 프레임을 연속으로 제출하고, 워커 수별 전체 처리량(fps)을 측정한다.
+"""
+import argparse
+import threading
+import time
+from ..config import settings
+from ..services.detection import backend_config
+from ..services.inference_backends import PreparedFrame
+from ..services.inference_pool import InferenceWorkerPool
+from .frames import load_frames
+
+def run(pool: InferenceWorkerPool, prepared, cameras: int, duration: float) -> int:
+    counts = [0] * cameras
+    stop_at = time.perf_counter() + duration
+
+    def camera_loop(camera_id):
+        i = camera_id
+        while time.perf_counter() < stop_at:
+            pool.infer(camera_id, prepared[i % len(prepared)])
+            counts[camera_id] += 1
+            i += 1
+
+    threads = [threading.Thread(target=camera_loop, args=(c,)) for c in range(cameras)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return sum(counts)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--video')
+    parser.add_argument('--images')
+    parser.add_argument('--frames', type=int, default=32)
+    parser.add_argument('--workers', default='1,2,4')
+    parser.add_argument('--cameras', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10.0)
+    args = parser.parse_args()
+
+    size = settings.CAMERA_INFERENCE_SIZE or settings.INFERENCE_INPUT_SIZE
+    prepared = [PreparedFrame.from_bgr(frame, size) for frame in load_frames(args.video, args.images, args.frames)]
+
+    baseline = None
+    print(f"{'workers':>7} {'fps':>8} {'scaling':>8}")
+    for workers in (int(w) for w in args.workers.split(',')):
+        pool = InferenceWorkerPool(workers, backend_config(), settings.INFERENCE_WORKER_SLOTS, size)
+        pool.start()
+        try:
+            run(pool, prepared, args.cameras, 1.0)  # 워밍업
+            fps = run(pool, prepared, args.cameras, args.duration) / args.duration
+        finally:
+            pool.stop()
+        baseline = baseline or fps
+        print(f"{workers:>7} {fps:>8.1f} {fps / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
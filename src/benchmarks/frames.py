@@ -0,0 +1,37 @@
+"""벤치마크용 프레임 로더"""
+from pathlib import Path
+from typing import List, Optional
+import cv2
+import numpy as np
+
+IMAGE_SUFFIXES = {'.jpg', '.jpeg', '.png', '.bmp'}
+
+def load_frames(video: Optional[str] = None, images: Optional[str] = None,
+                limit: int = 100, shape=(1080, 1920, 3)) -> List[np.ndarray]:
+    """동영상 파일이나 이미지 폴더에서 BGR 프레임을 읽음 (둘 다 없으면 합성 프레임)"""
+    frames = []
+    if video:
+        cap = cv2.VideoCapture(video)
+        try:
+            while len(frames) < limit:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                frames.append(frame)
+        finally:
+            cap.release()
+    elif images:
+        for path in sorted(Path(images).iterdir()):
+            if path.suffix.lower() in IMAGE_SUFFIXES:
+                frame = cv2.imread(str(path))
+                if frame is not None:
+                    frames.append(frame)
+            if len(frames) >= limit:
+                break
+    else:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 256, shape, dtype=np.uint8) for _ in range(limit)]
+
+    if not frames:
+        raise ValueError("No frames could be loaded")
+    return frames
@@ -0,0 +1,63 @@
+"""INT8 양자화 + FP32 대비 정확도/속도 리포트
+
+사용법:
+    python -m src.benchmarks.quantize_report --images samples/ [--method static] [--json report.json]
+
+MODEL_PATH/<MODEL_NAME>.onnx를 샘플 프레임으로 보정해 <MODEL_NAME>.int8.onnx를 만들고,
+별도의 평가 프레임에서 FP32 모델 대비 recall/precision/IoU와 프레임당 지연을 출력한다.
+결과를 확인한 뒤 INFERENCE_BACKEND=onnxruntime, INFERENCE_PRECISION=int8로 켠다.
+"""
+import argparse
+import json
+import cv2
+from pathlib import Path
+from ..config import settings
+from ..services.detection import PERSON_CLASS_ID
+from ..services.inference_backends import OnnxRuntimeBackend
+from ..services.quantization import quantize_model, agreement_report
+from .frames import load_frames
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--video')
+    parser.add_argument('--images')
+    parser.add_argument('--calibration-frames', type=int, default=100)
+    parser.add_argument('--eval-frames', type=int, default=100)
+    parser.add_argument('--method', choices=['static', 'dynamic'], default='static')
+    parser.add_argument('--model-path', default=settings.MODEL_PATH)
+    parser.add_argument('--model-name', default=settings.MODEL_NAME)
+    parser.add_argument('--input-size', type=int, default=settings.INFERENCE_INPUT_SIZE)
+    parser.add_argument('--threshold', type=float, default=settings.DETECTION_THRESHOLD)
+    parser.add_argument('--skip-quantize', action='store_true', help='기존 int8 모델로 리포트만 생성')
+    parser.add_argument('--json', help='리포트를 JSON 파일로 저장')
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.images, args.calibration_frames + args.eval_frames)
+    frames = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames]
+    # 보정과 평가에 서로 다른 프레임 사용
+    calibration, evaluation = frames[:args.calibration_frames], frames[args.calibration_frames:]
+    if not evaluation:
+        calibration, evaluation = frames, frames
+        print("warning: not enough frames, evaluating on calibration frames")
+
+    model_dir = Path(args.model_path)
+    if not args.skip_quantize:
+        quantize_model(str(model_dir / f"{args.model_name}.onnx"),
+                       str(model_dir / f"{args.model_name}.int8.onnx"),
+                       calibration, args.input_size, args.method)
+
+    def backend(precision):
+        return OnnxRuntimeBackend(args.model_path, args.model_name, args.input_size,
+                                  classes=(PERSON_CLASS_ID,), precision=precision).load()
+
+    report = agreement_report(backend("fp32"), backend("int8"), evaluation, score_threshold=args.threshold)
+    report["method"] = args.method
+    report["calibration_frames"] = len(calibration)
+
+    for key, value in report.items():
+        print(f"{key:<22} {value}")
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -7,10 +7,89 @@ class Settings(BaseSettings):
     
     # SQLite 사용을 위한 데이터베이스 설정
     DATABASE_URL: str = "sqlite:///./zikeobom.db"
+    # SQLite 저장 프로필: 쓰기 연결 1개 + 읽기 전용 연결 풀, 연결 시 PRAGMA 적용 (False면 기본 엔진 하나)
+    SQLITE_TUNED: bool = True
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE_KB: int = 65536
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_READ_POOL_SIZE: int = 8
+    # 쓰기 연결을 기다리는 최대 시간(초)
+    SQLITE_WRITE_TIMEOUT: float = 30.0
+    # /events/batch 한 요청의 최대 이벤트 수
+    EVENT_BATCH_MAX_SIZE: int = 10000
+    # /events/stats 한 요청의 최대 버킷 수
+    EVENT_STATS_MAX_BUCKETS: int = 5000
+    # 파이프라인 이벤트 write-behind 큐 (크기 초과 시 버림, batch 크기 또는 주기(초)마다 저장)
+    PIPELINE_EVENTS: bool = True
+    EVENT_QUEUE_SIZE: int = 10000
+    EVENT_FLUSH_BATCH_SIZE: int = 500
+    EVENT_FLUSH_INTERVAL: float = 1.0
     
     # AI 모델 설정
     MODEL_PATH: str = "models/"
     DETECTION_THRESHOLD: float = 0.5
+    # 추론 백엔드: torch | onnxruntime | opencv (onnxruntime/opencv는 MODEL_PATH의 .onnx를 오프라인 로드)
+    INFERENCE_BACKEND: str = "torch"
+    MODEL_NAME: str = "yolov5s"
+    INFERENCE_INPUT_SIZE: int = 640
+    # 카메라별 기본 추론 해상도 (캡처 스레드에서 리사이즈, 0이면 전체 해상도 전달)
+    CAMERA_INFERENCE_SIZE: int = 640
+    # 추론 정밀도: fp32 | int8 (int8은 onnxruntime 백엔드 + quantize_report로 만든 <MODEL_NAME>.int8.onnx 필요)
+    INFERENCE_PRECISION: str = "fp32"
+    
+    # 카메라별 추론 주기 기본값 (추론 사이 프레임은 직전 박스를 재사용)
+    DETECTION_EVERY_N_FRAMES: int = 1
+    DETECTION_MAX_HZ: float = 5.0
+    # 이 시간(초)보다 오래된 박스는 흐리게, DETECTION_MAX_AGE를 넘으면 그리지 않음
+    DETECTION_STALE_AFTER: float = 0.5
+    DETECTION_MAX_AGE: float = 2.0
+    
+    # 움직임 게이트: 정적인 장면에서는 추론 생략 (heartbeat 주기마다 한 번은 추론)
+    MOTION_GATING: bool = True
+    MOTION_SENSITIVITY: float = 0.5
+    MOTION_HEARTBEAT_SECONDS: float = 10.0
+    
+    # 카메라별 다중 객체 트래킹 (IoU + 칼만 필터)
+    TRACKING_ENABLED: bool = True
+    TRACK_IOU_THRESHOLD: float = 0.3
+    TRACK_MAX_AGE: float = 1.0
+    TRACK_MIN_HITS: int = 3
+    
+    # 추론 워커 프로세스 수 (0이면 API 프로세스 안에서 추론, 설정 시 배치 추론 대신 사용)
+    INFERENCE_WORKERS: int = 0
+    INFERENCE_WORKER_SLOTS: int = 4
+    
+    # 멀티 카메라 배치 추론 설정
+    INFERENCE_BATCHING: bool = True
+    INFERENCE_BATCH_SIZE: int = 8
+    INFERENCE_BATCH_MAX_WAIT_MS: float = 10.0
+    
+    # 스트리밍 설정
+    STREAM_JPEG_QUALITY: int = 95
+    STREAM_VARIANT_IDLE_SECONDS: float = 10.0
+    # 스냅샷 요청 후 프로듀서를 유지하는 시간 (폴링 간격보다 길게)
+    SNAPSHOT_KEEP_ALIVE_SECONDS: float = 30.0
+    # 스냅샷으로 바로 돌려줄 수 있는 최신 프레임의 최대 나이(초), 더 오래됐으면 새 프레임을 기다림
+    SNAPSHOT_MAX_FRAME_AGE: float = 1.0
+    # 대시보드 모자이크 스트림 기본값 (타일 너비 px, 합성 fps, JPEG 품질)
+    MOSAIC_TILE_WIDTH: int = 480
+    MOSAIC_FPS: float = 10.0
+    MOSAIC_JPEG_QUALITY: int = 70
+    
+    # 대시보드 푸시 채널 (WebSocket 갱신 주기, 클라이언트별 송신 큐 크기)
+    PUSH_INTERVAL_SECONDS: float = 2.0
+    PUSH_CLIENT_QUEUE_SIZE: int = 16
+    
+    # 시스템 지표 샘플링 주기 (GPU 조회는 nvidia-smi를 실행하므로 더 길게)
+    SYSTEM_METRICS_INTERVAL: float = 2.0
+    GPU_METRICS_INTERVAL: float = 10.0
+    # 지표 이력 최대 시계열 수 (시계열당 약 230KB 고정)
+    METRICS_HISTORY_MAX_SERIES: int = 64
+    # 시스템 로그 링 버퍼 크기와 수집 레벨
+    LOG_BUFFER_SIZE: int = 1000
+    LOG_BUFFER_LEVEL: str = "INFO"
     
     class Config:
         env_file = ".env"
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from loguru import logger
 from .api.endpoints import events, cameras, views, system
 from .models.database import engine, Base
+from .models.migrations import run_migrations
 from fastapi.middleware.cors import CORSMiddleware
 
 app = FastAPI(title="지켜봄 서비스")
@@ -13,10 +14,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # 이벤트 목록 커서 페이지네이션
 )
 
-# 데이터베이스 테이블 생성
+# 데이터베이스 테이블 생성 후 기존 DB에 스키마 변경 적용
 Base.metadata.create_all(bind=engine)
+run_migrations(engine)
 
 # 라우터 등록
 app.include_router(events.router, prefix="/api/v1")
@@ -24,6 +27,18 @@ app.include_router(cameras.router, prefix="/api/v1")
 app.include_router(views.router, prefix="/view", tags=["views"])
 app.include_router(system.router, prefix="/api/v1/system", tags=["system"])
 
+@app.on_event("startup")
+def startup():
+    # 추론 워커 프로세스는 서버 프로세스에서만 시작
+    cameras.camera_manager.startup()
+    system.system_sampler.start()
+
+@app.on_event("shutdown")
+def shutdown():
+    # 카메라 스레드와 추론 워커 프로세스 정리
+    cameras.camera_manager.shutdown()
+    system.system_sampler.stop()
+
 @app.get("/")
 async def root():
     return {"message": "지켜봄 서비스 API"}
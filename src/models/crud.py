@@ -0,0 +1,135 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import and_, func, insert, or_
+from sqlalchemy.orm import Session
+from . import models, rollups, schemas
+
+def event_rows(events: Sequence[schemas.EventIngest]) -> List[Dict[str, Any]]:
+    """검증된 이벤트를 INSERT 파라미터로 변환 (timestamp가 없으면 현재 시각)
+
+    시간대가 있는 timestamp는 naive UTC로 바꿔 저장한다 (events.timestamp와 롤업 버킷의 기준).
+    """
+    now = datetime.utcnow()
+    return [
+        {
+            "camera_id": event.camera_id,
+            "event_type": event.event_type,
+            "description": event.description,
+            "timestamp": rollups.to_naive(event.timestamp) if event.timestamp else now
+        }
+        for event in events
+    ]
+
+def insert_events(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """이벤트 행을 INSERT 한 문장(executemany)으로 넣고 부여된 ID를 입력 순서대로 반환 (커밋은 호출자)"""
+    if not rows:
+        return []
+    statement = insert(models.Event).returning(models.Event.id, sort_by_parameter_order=True)
+    return list(db.scalars(statement, rows))
+
+def save_event_rows(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """이벤트 행과 롤업 카운트를 한 트랜잭션으로 저장 (커밋 1회)"""
+    try:
+        ids = insert_events(db, rows)
+        rollups.apply_rollups(db, rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return ids
+
+def create_event(db: Session, event: schemas.EventCreate) -> models.Event:
+    """이벤트 1건과 롤업 카운트를 한 트랜잭션으로 저장"""
+    db_event = models.Event(**event.dict())
+    try:
+        db.add(db_event)
+        db.flush()  # timestamp 기본값 확정
+        rollups.apply_rollups(db, [db_event])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    db.refresh(db_event)
+    return db_event
+
+def create_events(db: Session, events: Sequence[schemas.EventIngest]) -> List[int]:
+    """검증된 이벤트 배열을 한 트랜잭션으로 저장"""
+    return save_event_rows(db, event_rows(events))
+
+def encode_event_cursor(event: models.Event) -> str:
+    """다음 페이지 커서 "<timestamp ISO>,<id>" """
+    return f"{event.timestamp.isoformat()},{event.id}"
+
+def decode_event_cursor(cursor: str) -> Tuple[datetime, int]:
+    """커서 문자열 파싱 (형식이 틀리면 ValueError)"""
+    timestamp, _, event_id = cursor.rpartition(",")
+    return datetime.fromisoformat(timestamp), int(event_id)
+
+def query_events(db: Session, camera_id: Optional[int] = None, event_type: Optional[str] = None,
+                 start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 after: Optional[Tuple[datetime, int]] = None, skip: int = 0,
+                 limit: int = 100) -> List[models.Event]:
+    """최신순 이벤트 조회
+
+    (camera_id, timestamp) / (event_type, timestamp) / (timestamp, id) 인덱스를 타도록
+    필터와 정렬을 구성한다. after=(timestamp, id)를 주면 그 이벤트 바로 다음(더 오래된 쪽)부터
+    읽는 키셋 페이지네이션으로, 페이지 깊이와 관계없이 인덱스 탐색 한 번으로 시작 위치를 찾는다.
+    skip(OFFSET)은 기존 클라이언트 호환용으로만 남겨 둔다.
+    """
+    query = db.query(models.Event)
+    if camera_id is not None:
+        query = query.filter(models.Event.camera_id == camera_id)
+    if event_type is not None:
+        query = query.filter(models.Event.event_type == event_type)
+    if start is not None:
+        query = query.filter(models.Event.timestamp >= start)
+    if end is not None:
+        query = query.filter(models.Event.timestamp < end)
+    if after is not None:
+        after_timestamp, after_id = after
+        # (timestamp, id) < (after_timestamp, after_id)를 인덱스 범위 조건이 드러나게 풀어 씀
+        query = query.filter(and_(
+            models.Event.timestamp <= after_timestamp,
+            or_(models.Event.timestamp < after_timestamp, models.Event.id < after_id)
+        ))
+    query = query.order_by(models.Event.timestamp.desc(), models.Event.id.desc())
+    if skip and after is None:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+def query_event_stats(db: Session, resolution: str, start: datetime, end: datetime,
+                      camera_id: Optional[int] = None, event_type: Optional[str] = None,
+                      group_by: Optional[str] = None) -> List[Tuple]:
+    """롤업 테이블에서 [start, end) 버킷별 이벤트 수 조회 (start/end는 버킷 경계)
+
+    group_by가 "camera" / "event_type"이면 (bucket, camera_id|event_type, count),
+    없으면 (bucket, count) 행을 버킷 순서대로 반환한다. 원본 이벤트 수와 무관하게
+    버킷당 (카메라 x 종류) 롤업 행만 읽는다.
+    """
+    rollup = models.EventRollup
+    columns = [rollup.bucket]
+    if group_by == "camera":
+        columns.append(rollup.camera_id)
+    elif group_by == "event_type":
+        columns.append(rollup.event_type)
+    query = db.query(*columns, func.sum(rollup.count)).filter(
+        rollup.resolution == resolution,
+        rollup.bucket >= start,
+        rollup.bucket < end
+    )
+    if camera_id is not None:
+        query = query.filter(rollup.camera_id == camera_id)
+    if event_type is not None:
+        query = query.filter(rollup.event_type == event_type)
+    return query.group_by(*columns).order_by(*columns).all()
+
+def event_payload(event_id: int, camera_id: int, event_type: str, description: Optional[str],
+                  timestamp: datetime) -> Dict[str, Any]:
+    """저장된 이벤트의 JSON 표현 (푸시 채널용)"""
+    return {
+        "id": event_id,
+        "camera_id": camera_id,
+        "event_type": event_type,
+        "description": description,
+        "timestamp": timestamp.isoformat() if timestamp else None
+    }
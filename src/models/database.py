@@ -1,15 +1,87 @@
-from sqlalchemy import create_engine
+from typing import Tuple
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from ..config import settings
 
-engine = create_engine(settings.DATABASE_URL)
+def _sqlite_pragmas(read_only: bool):
+    """SQLite 연결마다 적용할 PRAGMA 목록 (설정 기반 저장 프로필)"""
+    pragmas = [
+        f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}",
+        f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}",
+        f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}",
+        f"PRAGMA cache_size={-settings.SQLITE_CACHE_SIZE_KB}",  # 음수 = KiB 단위
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    elif settings.SQLITE_WAL:
+        # WAL은 DB 파일에 유지되므로 쓰기 연결에서만 설정 (읽기가 쓰기를 막지 않음)
+        pragmas.insert(0, "PRAGMA journal_mode=WAL")
+    return pragmas
+
+def _apply_on_connect(engine: Engine, pragmas):
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+
+def create_engines(url: str, tuned: bool = True) -> Tuple[Engine, Engine]:
+    """(쓰기 엔진, 읽기 엔진) 생성
+
+    SQLite 파일 DB는 연결 1개짜리 풀로 쓰기를 직렬화하고, 읽기는 query_only 연결 풀을 따로 둔다.
+    WAL 모드에서는 읽기 연결이 쓰기 트랜잭션을 기다리지 않는다.
+    tuned=False이면 기본 설정 엔진 하나를 읽기/쓰기에 같이 쓴다 (벤치마크 비교용).
+    다른 DB는 엔진 하나를 공유한다.
+    """
+    if not url.startswith("sqlite"):
+        engine = create_engine(url)
+        return engine, engine
+
+    connect_args = {"check_same_thread": False}  # FastAPI 스레드풀에서 연결을 주고받음
+    if url in ("sqlite://", "sqlite:///:memory:"):
+        # 메모리 DB는 연결마다 별개의 DB이므로 연결 하나를 공유
+        engine = create_engine(url, connect_args=connect_args, poolclass=StaticPool)
+        return engine, engine
+    if not tuned:
+        engine = create_engine(url, connect_args=connect_args)
+        return engine, engine
+
+    connect_args["timeout"] = settings.SQLITE_BUSY_TIMEOUT_MS / 1000
+    write_engine = create_engine(url, connect_args=connect_args, pool_size=1, max_overflow=0,
+                                 pool_timeout=settings.SQLITE_WRITE_TIMEOUT)
+    read_engine = create_engine(url, connect_args=connect_args, pool_size=settings.SQLITE_READ_POOL_SIZE,
+                                max_overflow=0)
+    _apply_on_connect(write_engine, _sqlite_pragmas(read_only=False))
+    _apply_on_connect(read_engine, _sqlite_pragmas(read_only=True))
+    return write_engine, read_engine
+
+engine, read_engine = create_engines(settings.DATABASE_URL, tuned=settings.SQLITE_TUNED)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 Base = declarative_base()
 
-def get_db():
+def get_write_db():
+    """쓰기 세션 (SQLite에서는 단일 쓰기 연결을 차례로 사용)"""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    """읽기 전용 세션 (쓰기와 독립된 연결 풀)"""
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+# 기존 의존성 이름 유지 (쓰기 세션)
+get_db = get_write_db
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Callable, List, Tuple
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select
+from sqlalchemy.engine import Connection, Engine
+from loguru import logger
+from . import models, rollups
+
+# 적용한 마이그레이션 버전 기록 (create_all은 기존 테이블에 인덱스/컬럼을 추가하지 않으므로 별도 관리)
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, nullable=False)
+)
+
+def _create_indexes(connection: Connection, table: Table, names: Tuple[str, ...]):
+    for index in table.indexes:
+        if index.name in names:
+            index.create(connection, checkfirst=True)
+
+def add_event_query_indexes(connection: Connection):
+    """이벤트 카메라/종류별 시간 범위 조회 + 커서 페이지네이션 인덱스"""
+    _create_indexes(connection, models.Event.__table__, (
+        "ix_events_camera_id_timestamp",
+        "ix_events_event_type_timestamp",
+        "ix_events_timestamp_id",
+    ))
+
+def create_event_rollups(connection: Connection):
+    """이벤트 수 롤업 테이블 생성 후 기존 이벤트로 백필"""
+    models.EventRollup.__table__.create(connection, checkfirst=True)
+    total = rollups.rebuild_rollups(connection)
+    logger.info(f"Backfilled event rollups from {total} events")
+
+# (버전, 이름, 적용 함수) - 새 마이그레이션은 항상 끝에 추가
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "add event query indexes", add_event_query_indexes),
+    (2, "create event rollups", create_event_rollups),
+]
+
+def run_migrations(engine: Engine):
+    """아직 적용되지 않은 마이그레이션을 버전 순서대로 각각 한 트랜잭션으로 적용"""
+    _metadata.create_all(bind=engine)
+    with engine.connect() as connection:
+        applied = set(connection.scalars(select(schema_migrations.c.version)))
+
+    for version, name, migrate in MIGRATIONS:
+        if version in applied:
+            continue
+        logger.info(f"Applying migration {version}: {name}")
+        with engine.begin() as connection:
+            migrate(connection)
+            connection.execute(schema_migrations.insert().values(
+                version=version, name=name, applied_at=datetime.utcnow()
+            ))
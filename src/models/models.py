@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
 from datetime import datetime
 from .database import Base
 
@@ -9,4 +9,26 @@ class Event(Base):
     camera_id = Column(Integer)
     event_type = Column(String)
     description = Column(String, nullable=True)
-    timestamp = Column(DateTime, default=datetime.utcnow) 
\ No newline at end of file
+    timestamp = Column(DateTime, default=datetime.utcnow)
+
+    # 카메라/종류별 시간 범위 조회와 (timestamp, id) 커서 페이지네이션용
+    __table_args__ = (
+        Index("ix_events_camera_id_timestamp", "camera_id", "timestamp"),
+        Index("ix_events_event_type_timestamp", "event_type", "timestamp"),
+        Index("ix_events_timestamp_id", "timestamp", "id"),
+    )
+
+class EventRollup(Base):
+    """해상도(minute/hour/day)별 시간 버킷 x 카메라 x 이벤트 종류의 이벤트 수 (rollups.py에서 갱신)"""
+    __tablename__ = "event_rollups"
+
+    resolution = Column(String, primary_key=True)
+    camera_id = Column(Integer, primary_key=True)
+    event_type = Column(String, primary_key=True)
+    bucket = Column(DateTime, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    # 기본 키는 카메라+종류 지정 조회용, 이 인덱스는 전체 카메라 시간 범위 조회용
+    __table_args__ = (
+        Index("ix_event_rollups_resolution_bucket", "resolution", "bucket"),
+    )
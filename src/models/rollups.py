@@ -0,0 +1,153 @@
+"""이벤트 수 롤업 (분/시/일 버킷 x 카메라 x 이벤트 종류)
+
+이벤트를 저장하는 트랜잭션 안에서 apply_rollups()로 해당 버킷 카운트를 함께 증가시키므로
+통계 조회는 events 전체를 GROUP BY 하지 않고 버킷당 롤업 행 몇 개만 읽는다.
+
+원본 이벤트로 다시 계산 (기존 DB 백필, 불일치 복구):
+    python -m src.models.rollups [--since 2024-01-01T00:00:00]
+"""
+import argparse
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import delete, select
+from loguru import logger
+from . import models
+
+# 해상도별 버킷 크기
+RESOLUTIONS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+# from을 생략했을 때 조회 범위
+DEFAULT_SPANS = {
+    "minute": timedelta(hours=1),
+    "hour": timedelta(days=1),
+    "day": timedelta(days=30),
+}
+# 재계산 시 이 개수만큼 버킷 카운트가 쌓이면 중간 저장 (메모리 상한)
+_REBUILD_FLUSH_KEYS = 100000
+
+def to_naive(value: datetime) -> datetime:
+    """시간대 정보 제거 (이벤트 timestamp 컬럼과 같은 naive UTC 기준)"""
+    if value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+def truncate(resolution: str, value: datetime) -> datetime:
+    """value가 속한 버킷의 시작 시각"""
+    value = value.replace(tzinfo=None, second=0, microsecond=0)
+    if resolution in ("hour", "day"):
+        value = value.replace(minute=0)
+    if resolution == "day":
+        value = value.replace(hour=0)
+    return value
+
+def bucket_range(resolution: str, start: datetime, end: datetime) -> Tuple[datetime, datetime]:
+    """[start, end)를 덮는 버킷 경계 (start는 내림, end는 올림)"""
+    start, end = truncate(resolution, to_naive(start)), to_naive(end)
+    end_bucket = truncate(resolution, end)
+    if end_bucket != end:
+        end_bucket += RESOLUTIONS[resolution]
+    return start, end_bucket
+
+def iter_buckets(resolution: str, start: datetime, end: datetime) -> Iterator[datetime]:
+    step = RESOLUTIONS[resolution]
+    bucket = start
+    while bucket < end:
+        yield bucket
+        bucket += step
+
+def count_rollups(rows: Iterable[Any], counts: Optional[Counter] = None) -> Counter:
+    """(resolution, camera_id, event_type, bucket)별 이벤트 수 집계
+
+    rows는 camera_id/event_type/timestamp를 가진 dict 또는 행 객체.
+    """
+    counts = Counter() if counts is None else counts
+    for row in rows:
+        if isinstance(row, dict):
+            camera_id, event_type, timestamp = row["camera_id"], row["event_type"], row["timestamp"]
+        else:
+            camera_id, event_type, timestamp = row.camera_id, row.event_type, row.timestamp
+        if timestamp is None:
+            continue
+        for resolution in RESOLUTIONS:
+            counts[(resolution, camera_id, event_type, truncate(resolution, timestamp))] += 1
+    return counts
+
+def _upsert_statement(dialect_name: str):
+    """롤업 행 INSERT, 이미 있으면 count를 더하는 UPSERT (SQLite 3.24+ / PostgreSQL)"""
+    if dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise NotImplementedError(f"Event rollups are not supported on {dialect_name}")
+    table = models.EventRollup.__table__
+    statement = insert(table)
+    return statement.on_conflict_do_update(
+        index_elements=[c.name for c in table.primary_key.columns],
+        set_={"count": table.c.count + statement.excluded.count}
+    )
+
+def _dialect_name(executor) -> str:
+    # Connection은 dialect를, Session은 get_bind()로 엔진을 가짐
+    dialect = getattr(executor, "dialect", None) or executor.get_bind().dialect
+    return dialect.name
+
+def _write_counts(executor, counts: Counter):
+    if not counts:
+        return
+    params: List[Dict[str, Any]] = [
+        {"resolution": resolution, "camera_id": camera_id, "event_type": event_type,
+         "bucket": bucket, "count": count}
+        for (resolution, camera_id, event_type, bucket), count in counts.items()
+    ]
+    executor.execute(_upsert_statement(_dialect_name(executor)), params)
+
+def apply_rollups(executor, rows: Iterable[Any]):
+    """저장하는 이벤트 행만큼 롤업 카운트 증가 (이벤트 INSERT와 같은 트랜잭션에서 호출, 커밋은 호출자)"""
+    _write_counts(executor, count_rollups(rows))
+
+def rebuild_rollups(connection, since: Optional[datetime] = None) -> int:
+    """원본 이벤트로 롤업 재계산 (since 이후 일 버킷부터, 없으면 전체), 다시 센 이벤트 수 반환
+
+    호출자의 트랜잭션 안에서 먼저 기존 롤업을 지우므로 SQLite에서는 그 시점부터 쓰기 잠금을 잡고,
+    재계산 도중 들어오는 이벤트는 커밋 후에 저장되어 이중 집계되지 않는다.
+    """
+    rollup, event = models.EventRollup, models.Event
+    cleanup = delete(rollup)
+    query = select(event.camera_id, event.event_type, event.timestamp)
+    if since is not None:
+        # 모든 해상도의 버킷이 같은 경계에서 잘리도록 일 단위로 내림
+        since = truncate("day", to_naive(since))
+        cleanup = cleanup.where(rollup.bucket >= since)
+        query = query.where(event.timestamp >= since)
+    connection.execute(cleanup)
+
+    total, counts = 0, Counter()
+    result = connection.execute(query.execution_options(yield_per=10000))
+    for partition in result.partitions():
+        count_rollups(partition, counts)
+        total += len(partition)
+        if len(counts) >= _REBUILD_FLUSH_KEYS:
+            _write_counts(connection, counts)
+            counts.clear()
+    _write_counts(connection, counts)
+    return total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--since', type=datetime.fromisoformat, default=None,
+                        help='이 시각이 속한 날부터 재계산 (생략하면 전체)')
+    args = parser.parse_args()
+
+    from .database import Base, engine
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        total = rebuild_rollups(connection, args.since)
+    logger.info(f"Rebuilt event rollups from {total} events")
+
+if __name__ == "__main__":
+    main()
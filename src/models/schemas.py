@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class EventBase(BaseModel):
     camera_id: int
@@ -10,9 +10,35 @@ class EventBase(BaseModel):
 class EventCreate(EventBase):
     pass
 
+class EventIngest(EventBase):
+    """일괄 수집용 이벤트 (엣지 장비가 기록한 발생 시각을 그대로 저장, 없으면 수신 시각)"""
+    timestamp: Optional[datetime] = None
+
+class EventBatchResult(BaseModel):
+    count: int
+    ids: List[int]
+
+class EventStatsBucket(BaseModel):
+    bucket: datetime
+    count: int
+    camera_id: Optional[int] = None
+    event_type: Optional[str] = None
+
+class EventStats(BaseModel):
+    resolution: str
+    start: datetime
+    end: datetime
+    total: int
+    buckets: List[EventStatsBucket]
+
 class Event(EventBase):
     id: int
     timestamp: datetime
     
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        orm_mode = True
+
+class RoiRegion(BaseModel):
+    """카메라 관심 영역: rect [x1, y1, x2, y2] 또는 polygon [[x, y], ...] (픽셀 좌표)"""
+    rect: Optional[List[int]] = None
+    polygon: Optional[List[List[int]]] = None
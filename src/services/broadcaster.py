@@ -0,0 +1,298 @@
+import time
+import asyncio
+import threading
+from typing import Optional
+from loguru import logger
+from ..config import settings
+from .camera import CameraService
+from .cadence import DetectionCadence
+from .detection import Detections, draw_detections
+from .encoder_cache import EncodedFrameCache, StreamVariant
+from .event_writer import EventWriter, PERSON_DETECTED, PERSON_LEFT
+from .frame_buffer import LatestFrameBuffer, FramePacket
+from .inference_backends import PreparedFrame
+from .motion import MotionGate
+from .tracker import SortTracker, Tracks, draw_tracks
+
+STALE_BOX_COLOR = (0, 200, 255)
+# _detect 결과: 새로 추론함 / 움직임이 없어 직전 결과를 유지함
+DETECTED = "detected"
+HELD = "held"
+
+class FrameBroadcaster:
+    """카메라 1대당 하나의 프로듀서가 감지를 한 번만 수행하고
+    결과 프레임을 모든 시청자에게 공유
+
+    JPEG 인코딩은 시청자가 요청한 variant(크기/품질)별로 프레임당 한 번만 수행된다.
+    이벤트를 기록하는 경우 (event_writer + detection_service) 시청자가 없어도 프로듀서가 계속 돈다.
+    """
+
+    def __init__(self, camera: CameraService, detection_service=None, event_writer: Optional[EventWriter] = None):
+        self.camera = camera
+        self.detection_service = detection_service
+        self.event_writer = event_writer
+        self.records_events = event_writer is not None and detection_service is not None
+        self.is_running = False
+        self.output = LatestFrameBuffer()  # 박스가 그려진 BGR 프레임
+        self.encoder = EncodedFrameCache(settings.STREAM_VARIANT_IDLE_SECONDS)
+        self.cadence = DetectionCadence(settings.DETECTION_EVERY_N_FRAMES, settings.DETECTION_MAX_HZ)
+        self.motion_gate = MotionGate(settings.MOTION_SENSITIVITY, settings.MOTION_HEARTBEAT_SECONDS,
+                                      enabled=settings.MOTION_GATING)
+        self.last_detections: Optional[Detections] = None
+        self.tracker: Optional[SortTracker] = None
+        self.last_tracks: Optional[Tracks] = None
+        if settings.TRACKING_ENABLED:
+            self.tracker = SortTracker(settings.TRACK_IOU_THRESHOLD, settings.TRACK_MAX_AGE,
+                                       settings.TRACK_MIN_HITS)
+        # 이벤트로 보고한 확정 트랙 ID (트래킹을 끄면 직전 감지 수로 출현/이탈 판단)
+        self._reported_tracks = set()
+        self._reported_count = 0
+        self._lock = threading.Lock()
+        self._subscribers = 0
+        self._keep_alive_until = 0.0
+        self._thread: Optional[threading.Thread] = None
+        # 카메라가 다시 추가되면 시퀀스가 0부터 시작하므로 ETag 구분용 세대 값
+        self.epoch = int(time.time() * 1000)
+
+    @property
+    def closed(self) -> bool:
+        return self.output.closed
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._subscribers
+
+    def _ensure_running(self):
+        # self._lock을 잡은 상태에서 호출
+        if self.closed:
+            return
+        self.is_running = True
+        # 종료 중인 프로듀서가 아직 루프를 빠져나가지 않았다면 그대로 재사용
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._produce, daemon=True)
+            self._thread.start()
+            logger.info(f"Broadcaster for camera {self.camera.camera_id} started")
+
+    def start(self):
+        """시청자와 무관하게 프로듀서 시작 (이벤트 기록용, 카메라 추가 시 호출)"""
+        with self._lock:
+            self._ensure_running()
+
+    def subscribe(self):
+        """시청자 등록 (첫 시청자가 들어오면 프로듀서 시작)"""
+        with self._lock:
+            self._subscribers += 1
+            self._ensure_running()
+
+    def unsubscribe(self):
+        """시청자 해제 (시청자도 keep-alive도 없으면 프로듀서가 스스로 중지)"""
+        with self._lock:
+            self._subscribers = max(0, self._subscribers - 1)
+
+    def keep_alive(self, seconds: float) -> bool:
+        """스트림을 열지 않는 클라이언트(스냅샷 폴링)를 위해 일정 시간 프로듀서 유지
+
+        반환: 호출 전에 프로듀서가 이미 돌고 있었는지 (False면 output의 마지막 프레임은 멈추기 전 것)
+        """
+        with self._lock:
+            was_running = self.is_running and self._thread is not None
+            self._keep_alive_until = max(self._keep_alive_until, time.monotonic() + seconds)
+            self._ensure_running()
+            return was_running
+
+    def _should_stop(self) -> bool:
+        # self._lock을 잡은 상태에서 호출
+        if self.closed:
+            return True
+        if self.records_events:
+            # 시청자가 없어도 감지/이벤트 기록은 계속
+            return False
+        return self._subscribers == 0 and time.monotonic() >= self._keep_alive_until
+
+    def close(self):
+        """카메라 제거 시 프로듀서와 모든 시청자 종료"""
+        with self._lock:
+            self.is_running = False
+            thread = self._thread
+        self.output.close()
+        if thread is not None:
+            thread.join(timeout=1.0)
+        logger.info(f"Broadcaster for camera {self.camera.camera_id} closed")
+
+    def wait_for_frame(self, after_seq: int, timeout: float = 1.0) -> Optional[FramePacket]:
+        """after_seq보다 새로운 처리 프레임이 나올 때까지 대기"""
+        return self.output.wait_for_frame(after_seq, timeout)
+
+    async def wait_for_frame_async(self, after_seq: int, timeout: float = 1.0) -> Optional[FramePacket]:
+        """wait_for_frame의 asyncio 버전 (스트리밍 엔드포인트용)"""
+        return await self.output.wait_for_frame_async(after_seq, timeout)
+
+    async def encode(self, packet: FramePacket, variant: StreamVariant) -> bytes:
+        """variant별 캐시를 거쳐 JPEG 바이트 반환 (같은 프레임/variant는 한 번만 인코딩)"""
+        # 공유 Future이므로 이 시청자가 끊겨도 다른 시청자의 인코딩이 취소되지 않게 shield
+        return await asyncio.shield(asyncio.wrap_future(self.encoder.get_future(packet, variant)))
+
+    def _detect(self, packet: FramePacket, frame) -> Optional[str]:
+        """주기에 해당하는 프레임만 추론하고 나머지는 직전 결과 재사용
+
+        반환: 새로 추론했으면 DETECTED, 움직임이 없어 직전 결과의 시각만 갱신했으면 HELD, 그 외 None
+        """
+        if not self.cadence.should_detect(packet.seq):
+            return None
+        if not self.motion_gate.should_infer(frame):
+            # 움직임이 없으면 직전 결과가 여전히 장면을 설명하므로 시각만 갱신
+            self.cadence.mark_detected(packet.seq)
+            if self.last_detections is None:
+                return None
+            self.last_detections.frame_seq = packet.seq
+            self.last_detections.timestamp = packet.timestamp
+            return HELD
+        try:
+            detections = self.detection_service.detect_frame(frame, self.camera.camera_id, self.camera.rois,
+                                                             self._prepare(packet))
+        except Exception as e:
+            logger.error(f"Error processing frame: {str(e)}")
+            return None
+        detections.frame_seq = packet.seq
+        detections.timestamp = packet.timestamp
+        self.cadence.mark_detected(packet.seq)
+        self.last_detections = detections
+        return DETECTED
+
+    def _prepare(self, packet: FramePacket) -> Optional[PreparedFrame]:
+        """추론할 프레임만 저해상도 RGB 입력으로 변환 (주기/움직임 게이트로 건너뛴 프레임은 변환하지 않음)
+
+        ROI가 있으면 detect_frame이 원본에서 영역을 잘라 쓰므로 만들지 않는다.
+        """
+        if packet.inference is not None:
+            return packet.inference
+        size = self.camera.inference_size
+        if not size or self.camera.rois is not None:
+            return None
+        return PreparedFrame.from_bgr(packet.frame, size)
+
+    def _annotate(self, packet: FramePacket, frame):
+        """감지/트래킹 결과를 프레임에 그리기"""
+        result = self._detect(packet, frame)
+        if self.tracker is None:
+            self._draw(packet, frame, self.last_detections)
+            return
+        # 추론 프레임에서는 트랙 갱신, 움직임 게이트로 생략한 프레임에서는 트랙 유지 (hits 증가 없음),
+        # 주기상 건너뛴 프레임에서는 위치 예측
+        if result == DETECTED:
+            self.last_tracks = self.tracker.update(self.last_detections)
+        elif result == HELD:
+            self.last_tracks = self.tracker.hold(packet.timestamp)
+        else:
+            self.last_tracks = self.tracker.predict(packet.timestamp)
+        draw_tracks(frame, self.last_tracks, settings.DETECTION_STALE_AFTER)
+
+    def _publish_events(self, packet: FramePacket):
+        """사람 출현/이탈 이벤트를 write-behind 큐에 발행 (DB 쓰기를 기다리지 않음)
+
+        트래킹 중에는 트랙이 확정될 때 출현, 확정 트랙이 사라질 때 이탈로 보고하고,
+        트래킹을 끄면 유효 감지 수가 0에서 늘거나 0으로 줄 때 보고한다.
+        """
+        camera_id = self.camera.camera_id
+        if self.tracker is not None:
+            tracks = self.last_tracks
+            current = set(tracks.ids[tracks.confirmed].tolist()) if tracks is not None else set()
+            for track_id in sorted(current - self._reported_tracks):
+                self.event_writer.publish(camera_id, PERSON_DETECTED, f"track #{track_id}", packet.timestamp)
+            for track_id in sorted(self._reported_tracks - current):
+                self.event_writer.publish(camera_id, PERSON_LEFT, f"track #{track_id}", packet.timestamp)
+            self._reported_tracks = current
+            return
+
+        count = self.detection_count(packet.timestamp)
+        if count and not self._reported_count:
+            self.event_writer.publish(camera_id, PERSON_DETECTED, f"{count} person(s)", packet.timestamp)
+        elif not count and self._reported_count:
+            self.event_writer.publish(camera_id, PERSON_LEFT, None, packet.timestamp)
+        self._reported_count = count
+
+    def _report_departures(self, timestamp: float):
+        """프로듀서가 멈출 때 보고한 출현을 그 시점의 이탈로 마감하고 상태 초기화
+
+        다시 시작하면 트랙이 모두 새로 생기므로, 남겨 두면 재시작 시각에 늦은 이탈 이벤트가 기록된다.
+        """
+        camera_id = self.camera.camera_id
+        if self.event_writer is not None:
+            for track_id in sorted(self._reported_tracks):
+                self.event_writer.publish(camera_id, PERSON_LEFT, f"track #{track_id}", timestamp)
+            if self._reported_count:
+                self.event_writer.publish(camera_id, PERSON_LEFT, None, timestamp)
+        self._reported_tracks = set()
+        self._reported_count = 0
+
+    def detection_count(self, timestamp: Optional[float] = None) -> int:
+        """현재 유효한 감지 수 (DETECTION_MAX_AGE보다 오래된 결과는 0)"""
+        detections = self.last_detections
+        if detections is None:
+            return 0
+        if detections.age(time.time() if timestamp is None else timestamp) > settings.DETECTION_MAX_AGE:
+            return 0
+        return len(detections)
+
+    def confirmed_track_count(self) -> int:
+        tracks = self.last_tracks
+        return int(tracks.confirmed.sum()) if tracks is not None else 0
+
+    def get_stats(self):
+        """카메라 파이프라인 통계 (추론 주기, 움직임 게이트 카운터)"""
+        detections = self.last_detections
+        return {
+            "camera_id": self.camera.camera_id,
+            "subscribers": self._subscribers,
+            "running": self.is_running,
+            "cadence": self.cadence.to_dict(),
+            "rois": self.camera.rois.to_list() if self.camera.rois is not None else [],
+            "inference_size": self.camera.inference_size,
+            "motion": self.motion_gate.get_stats(),
+            "encoder": self.encoder.get_stats(),
+            "last_detection_count": len(detections) if detections is not None else 0,
+            "track_count": self.tracker.track_count if self.tracker is not None else 0
+        }
+
+    def _draw(self, packet: FramePacket, frame, detections: Optional[Detections]):
+        """감지 결과의 나이에 따라 박스 스타일 결정 (너무 오래된 박스는 생략)"""
+        if detections is None:
+            return
+        age = detections.age(packet.timestamp)
+        if age > settings.DETECTION_MAX_AGE:
+            return
+        if age > settings.DETECTION_STALE_AFTER:
+            draw_detections(frame, detections, STALE_BOX_COLOR, 1)
+        else:
+            draw_detections(frame, detections)
+
+    def _produce(self):
+        """프레임 처리 스레드"""
+        camera_id = self.camera.camera_id
+        last_seq = 0
+        while True:
+            with self._lock:
+                if self._should_stop():
+                    self._report_departures(time.time())
+                    self.is_running = False
+                    self._thread = None
+                    break
+            try:
+                # 새 프레임이 캡처될 때까지 잠들어 있음 (busy-wait 없음)
+                packet = self.camera.wait_for_frame(last_seq, timeout=0.5)
+                if packet is None:
+                    continue
+                last_seq = packet.seq
+                frame = packet.frame.copy()
+
+                # AI 모델로 프레임 처리
+                if self.detection_service:
+                    self._annotate(packet, frame)
+                    if self.event_writer is not None:
+                        self._publish_events(packet)
+
+                # 인코딩은 시청자가 요청한 variant별로 지연 수행
+                self.output.put(frame, packet.timestamp)
+            except Exception as e:
+                logger.error(f"Error in broadcaster for camera {camera_id}: {str(e)}")
+        logger.info(f"Broadcaster for camera {camera_id} stopped")
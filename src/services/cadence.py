@@ -0,0 +1,39 @@
+import time
+from typing import Optional
+
+class DetectionCadence:
+    """카메라별 추론 주기 제어
+
+    every_n_frames: N 프레임마다 한 번 추론 (1이면 매 프레임)
+    max_hz: 초당 최대 추론 횟수 (0 이하면 제한 없음)
+    두 조건을 모두 만족할 때만 추론하고, 나머지 프레임은 직전 결과를 재사용한다.
+    """
+
+    def __init__(self, every_n_frames: int = 1, max_hz: float = 0.0):
+        self.every_n_frames = max(1, int(every_n_frames))
+        self.max_hz = max(0.0, float(max_hz))
+        self._last_seq: Optional[int] = None
+        self._last_time = 0.0
+
+    def update(self, every_n_frames: Optional[int] = None, max_hz: Optional[float] = None):
+        if every_n_frames is not None:
+            self.every_n_frames = max(1, int(every_n_frames))
+        if max_hz is not None:
+            self.max_hz = max(0.0, float(max_hz))
+
+    def should_detect(self, frame_seq: int, now: Optional[float] = None) -> bool:
+        if self._last_seq is None:
+            return True
+        now = time.monotonic() if now is None else now
+        if frame_seq - self._last_seq < self.every_n_frames:
+            return False
+        if self.max_hz > 0 and now - self._last_time < 1.0 / self.max_hz:
+            return False
+        return True
+
+    def mark_detected(self, frame_seq: int, now: Optional[float] = None):
+        self._last_seq = frame_seq
+        self._last_time = time.monotonic() if now is None else now
+
+    def to_dict(self):
+        return {"every_n_frames": self.every_n_frames, "max_hz": self.max_hz}
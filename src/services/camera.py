@@ -1,16 +1,21 @@
 import cv2
+import time
 import threading
-from queue import Queue
+from typing import Optional
 from loguru import logger
 from ..config import settings
+from .frame_buffer import LatestFrameBuffer, FramePacket
 
 class CameraService:
     def __init__(self, camera_id: int, url: str):
         self.camera_id = camera_id
         self.url = url
         self.is_running = False
-        self.frame_queue = Queue(maxsize=10)
+        self.frame_buffer = LatestFrameBuffer()
         self.detection_service = None  # DetectionService 인스턴스 저장용
+        self.rois = None  # 관심 영역 (RoiSet, None이면 전체 프레임)
+        # 추론 해상도 (실제로 추론하는 프레임만 브로드캐스터에서 레터박스 + RGB 변환, 0이면 전체 해상도로 추론)
+        self.inference_size = settings.CAMERA_INFERENCE_SIZE
         
     def start(self):
         """카메라 스트리밍 시작"""
@@ -48,14 +53,8 @@ class CameraService:
                     logger.error(f"Failed to read frame from camera {self.camera_id}")
                     break
                     
-                # 이전 프레임이 처리되지 않았다면 스킵
-                if self.frame_queue.full():
-                    try:
-                        self.frame_queue.get_nowait()
-                    except:
-                        pass
-                    
-                self.frame_queue.put(frame)
+                # 최신 프레임으로 교체 (처리되지 않은 이전 프레임은 버림)
+                self.frame_buffer.put(frame, time.time())
                 
         except Exception as e:
             logger.error(f"Error in capture thread for camera {self.camera_id}: {str(e)}")
@@ -64,9 +63,9 @@ class CameraService:
         
     def get_frame(self):
         """최신 프레임 반환"""
-        try:
-            if self.frame_queue.empty():
-                return None
-            return self.frame_queue.get_nowait()
-        except:
-            return None 
\ No newline at end of file
+        packet = self.frame_buffer.get_latest()
+        return packet.frame if packet else None
+
+    def wait_for_frame(self, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[FramePacket]:
+        """after_seq 이후의 새 프레임이 캡처될 때까지 대기"""
+        return self.frame_buffer.wait_for_frame(after_seq, timeout) 
\ No newline at end of file
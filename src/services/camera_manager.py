@@ -1,12 +1,56 @@
-from typing import Dict
+import threading
+from typing import Dict, Optional, Tuple
 from .camera import CameraService
-from .detection import DetectionService
+from .detection import DetectionService, backend_config
+from .broadcaster import FrameBroadcaster
+from .event_writer import EventWriter
+from .inference_batcher import InferenceBatcher
+from .inference_pool import InferenceWorkerPool
+from .mosaic import MosaicComposer
+from ..config import settings
+from ..models.database import SessionLocal
 from loguru import logger
 
+# 대시보드에서 카메라 1은 노트북 웹캠(장치 0)으로 사용
+WEBCAM_CAMERA_ID = 1
+WEBCAM_DEVICE = 0
+
 class CameraManager:
     def __init__(self):
         self.cameras: Dict[int, CameraService] = {}
-        self.detection_service = DetectionService()
+        self.broadcasters: Dict[int, FrameBroadcaster] = {}
+        self.mosaics: Dict[tuple, MosaicComposer] = {}
+        # 여러 요청이 스레드풀에서 동시에 웹캠을 등록하지 않도록
+        self._webcam_lock = threading.Lock()
+        # 파이프라인 이벤트 write-behind 큐 (서버 시작 시 writer 스레드 시작)
+        self.event_writer = None
+        if settings.PIPELINE_EVENTS:
+            self.event_writer = EventWriter(
+                SessionLocal,
+                max_queue=settings.EVENT_QUEUE_SIZE,
+                batch_size=settings.EVENT_FLUSH_BATCH_SIZE,
+                flush_interval=settings.EVENT_FLUSH_INTERVAL
+            )
+        use_pool = settings.INFERENCE_WORKERS > 0
+        self.detection_service = DetectionService(load_backend=not use_pool)
+        self.batcher = None
+        self.pool = None
+        if use_pool:
+            self.pool = InferenceWorkerPool(
+                settings.INFERENCE_WORKERS,
+                backend_config(),
+                slots_per_worker=settings.INFERENCE_WORKER_SLOTS,
+                max_size=max(settings.INFERENCE_INPUT_SIZE, settings.CAMERA_INFERENCE_SIZE)
+            )
+            self.detection_service.pool = self.pool
+        elif settings.INFERENCE_BATCHING:
+            self.batcher = InferenceBatcher(
+                self.detection_service,
+                max_batch_size=settings.INFERENCE_BATCH_SIZE,
+                max_wait_ms=settings.INFERENCE_BATCH_MAX_WAIT_MS
+            )
+            self.batcher.start()
+            self.detection_service.batcher = self.batcher
         
     def add_camera(self, camera_id: int, url: str):
         """카메라 추가"""
@@ -16,17 +60,78 @@ class CameraManager:
             
         camera = CameraService(camera_id, url)
         camera.detection_service = self.detection_service
-        self.cameras[camera_id] = camera
         camera.start()
+        self.cameras[camera_id] = camera
+        broadcaster = FrameBroadcaster(camera, self.detection_service, self.event_writer)
+        self.broadcasters[camera_id] = broadcaster
+        if broadcaster.records_events:
+            # 이벤트는 시청자 유무와 관계없이 기록
+            broadcaster.start()
         logger.info(f"Added camera {camera_id}")
         
     def remove_camera(self, camera_id: int):
         """카메라 제거"""
         if camera_id in self.cameras:
+            broadcaster = self.broadcasters.pop(camera_id, None)
+            if broadcaster:
+                broadcaster.close()
             self.cameras[camera_id].stop()
             del self.cameras[camera_id]
+            if self.pool:
+                self.pool.release_camera(camera_id)
+            if self.batcher:
+                self.batcher.release_camera(camera_id)
             logger.info(f"Removed camera {camera_id}")
+
+    def startup(self):
+        """추론 워커 프로세스와 이벤트 writer 시작
+
+        spawn된 워커는 메인 모듈을 다시 import하므로 import 시점이 아닌
+        서버 시작 이벤트에서 호출해야 한다.
+        """
+        if self.pool and not self.pool.is_running:
+            self.pool.start()
+        if self.event_writer:
+            self.event_writer.start()
+
+    def shutdown(self):
+        """모든 카메라와 추론 워커 종료 (카메라를 먼저 멈춘 뒤 남은 이벤트를 모두 저장)"""
+        for camera_id in list(self.cameras):
+            self.remove_camera(camera_id)
+        if self.event_writer:
+            self.event_writer.stop()
+        for mosaic in self.mosaics.values():
+            mosaic.close()
+        if self.batcher:
+            self.batcher.stop()
+        if self.pool and self.pool.is_running:
+            self.pool.stop()
+
+    def ensure_webcam(self):
+        """웹캠 카메라가 없으면 등록 (모든 시청자가 같은 캡처를 공유)"""
+        with self._webcam_lock:
+            if WEBCAM_CAMERA_ID not in self.cameras:
+                self.add_camera(WEBCAM_CAMERA_ID, WEBCAM_DEVICE)
+            return self.cameras[WEBCAM_CAMERA_ID]
             
     def get_camera(self, camera_id: int) -> CameraService:
         """카메라 인스턴스 반환"""
-        return self.cameras.get(camera_id) 
\ No newline at end of file
+        return self.cameras.get(camera_id)
+
+    def get_broadcaster(self, camera_id: int) -> FrameBroadcaster:
+        """카메라의 공유 스트림 브로드캐스터 반환"""
+        return self.broadcasters.get(camera_id)
+
+    def get_mosaic(self, camera_ids: Optional[Tuple[int, ...]] = None, cols: Optional[int] = None,
+                   tile_width: int = 480, fps: float = 10.0) -> MosaicComposer:
+        """레이아웃별 공유 모자이크 반환 (같은 구성을 보는 시청자는 합성/인코딩을 공유)"""
+        # 시청자가 없어 멈춘 모자이크는 정리
+        for key in [k for k, m in self.mosaics.items() if not m.is_running and not m.subscriber_count]:
+            del self.mosaics[key]
+        key = (camera_ids, cols, tile_width, fps)
+        mosaic = self.mosaics.get(key)
+        if mosaic is None:
+            mosaic = MosaicComposer(lambda: dict(self.broadcasters), camera_ids, cols, tile_width, fps,
+                                    idle_seconds=settings.STREAM_VARIANT_IDLE_SECONDS)
+            self.mosaics[key] = mosaic
+        return mosaic
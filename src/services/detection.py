@@ -1,45 +1,168 @@
 import cv2
-import torch
 import numpy as np
-from pathlib import Path
 from ..config import settings
+from .inference_backends import PreparedFrame, create_backend
 from loguru import logger
 
+PERSON_CLASS_ID = 0
+BOX_COLOR = (0, 255, 0)
+
+class Detections:
+    """배열 기반 감지 결과
+
+    boxes: (N, 4) int32 [xmin, ymin, xmax, ymax]
+    scores: (N,) float32 신뢰도
+    classes: (N,) int32 클래스 ID
+    frame_seq/timestamp: 감지한 원본 프레임의 시퀀스 번호와 캡처 시각
+    """
+    __slots__ = ('boxes', 'scores', 'classes', 'frame_seq', 'timestamp')
+
+    def __init__(self, boxes: np.ndarray, scores: np.ndarray, classes: np.ndarray,
+                 frame_seq: int = 0, timestamp: float = 0.0):
+        self.boxes = boxes
+        self.scores = scores
+        self.classes = classes
+        self.frame_seq = frame_seq
+        self.timestamp = timestamp
+
+    @classmethod
+    def empty(cls) -> "Detections":
+        return cls(np.empty((0, 4), dtype=np.int32),
+                   np.empty(0, dtype=np.float32),
+                   np.empty(0, dtype=np.int32))
+
+    @classmethod
+    def from_xyxy(cls, xyxy, threshold: float, class_id: int = PERSON_CLASS_ID) -> "Detections":
+        """모델 원시 출력 (N, 6) [x1, y1, x2, y2, conf, cls]에서 클래스/신뢰도 필터링"""
+        if hasattr(xyxy, 'cpu'):  # torch.Tensor
+            xyxy = xyxy.cpu().numpy()
+        xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 6)
+        keep = (xyxy[:, 5] == class_id) & (xyxy[:, 4] >= threshold)
+        kept = xyxy[keep]
+        return cls(kept[:, :4].astype(np.int32),
+                   kept[:, 4].copy(),
+                   kept[:, 5].astype(np.int32))
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def age(self, now: float) -> float:
+        """감지 이후 경과 시간 (초)"""
+        return max(0.0, now - self.timestamp)
+
+    def frames_behind(self, frame_seq: int) -> int:
+        """감지 이후 지나간 프레임 수"""
+        return max(0, frame_seq - self.frame_seq)
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """(N, 4)와 (M, 4) xyxy 박스 간 IoU 행렬 (N, M)"""
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+    area_a = np.prod(boxes_a[:, 2:] - boxes_a[:, :2], axis=1)
+    area_b = np.prod(boxes_b[:, 2:] - boxes_b[:, :2], axis=1)
+    return inter / np.maximum(area_a[:, None] + area_b[None, :] - inter, 1e-9)
+
+def draw_detections(frame, detections: Detections, color=BOX_COLOR, thickness: int = 2):
+    """감지 박스를 프레임에 그리기"""
+    for xmin, ymin, xmax, ymax in detections.boxes.tolist():
+        cv2.rectangle(frame, (xmin, ymin), (xmax, ymax), color, thickness)
+    return frame
+
+def backend_config():
+    """설정에서 추론 백엔드 생성 인자 구성 (워커 프로세스에도 그대로 전달)"""
+    return {
+        "name": settings.INFERENCE_BACKEND,
+        "model_path": settings.MODEL_PATH,
+        "model_name": settings.MODEL_NAME,
+        "input_size": settings.INFERENCE_INPUT_SIZE,
+        "classes": (PERSON_CLASS_ID,),
+        "precision": settings.INFERENCE_PRECISION
+    }
+
 class DetectionService:
-    def __init__(self):
+    def __init__(self, load_backend: bool = True):
         self.threshold = settings.DETECTION_THRESHOLD
-        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.batcher = None  # 여러 카메라 프레임을 묶어 추론하는 InferenceBatcher
+        self.pool = None  # 프로세스 워커에서 추론하는 InferenceWorkerPool
+        self.backend = None
+        self.device = 'cpu'
+        if not load_backend:
+            # 워커 풀을 쓰면 모델은 워커 프로세스에만 로드
+            return
         
-        # 사람 감지 모델만 로드
+        # 사람 감지 모델만 로드 (백엔드는 INFERENCE_BACKEND로 선택)
         try:
-            self.person_model = torch.hub.load('ultralytics/yolov5', 'yolov5s', pretrained=True)
-            self.person_model.to(self.device)
-            logger.info(f"Person detection model loaded successfully on {self.device}")
+            self.backend = create_backend(**backend_config())
+            self.device = self.backend.device
+            logger.info(f"Person detection model loaded successfully with {self.backend.name} "
+                        f"({self.backend.precision}) on {self.device}")
         except Exception as e:
             logger.error(f"Error loading person detection model: {e}")
             raise
         
-    def detect_person(self, image):
+    def _infer_raw(self, images):
+        """RGB 이미지 또는 PreparedFrame 목록 추론 (원본 좌표의 원시 결과 반환)"""
+        arrays = [image.image if isinstance(image, PreparedFrame) else image for image in images]
+        prepared_sizes = [image.size for image in images if isinstance(image, PreparedFrame)]
+        # 모두 미리 리사이즈된 입력이면 그 해상도로 추론
+        size = max(prepared_sizes) if len(prepared_sizes) == len(images) else None
+        raw = self.backend.infer(arrays, size)
+        return [image.to_original(xyxy) if isinstance(image, PreparedFrame) else xyxy
+                for image, xyxy in zip(images, raw)]
+
+    def detect_person(self, image) -> Detections:
         """사람 감지 함수"""
-        results = self.person_model(image)
-        persons = results.pandas().xyxy[0]
-        # person 클래스(0)에 대한 결과만 필터링
-        persons = persons[persons['class'] == 0]
-        return persons[persons['confidence'] >= self.threshold]
+        # DataFrame 변환 없이 원시 배열에서 person 클래스(0)만 필터링
+        return Detections.from_xyxy(self._infer_raw([image])[0], self.threshold)
+
+    def detect_batch(self, images):
+        """여러 이미지를 한 번의 forward pass로 감지"""
+        return [Detections.from_xyxy(xyxy, self.threshold) for xyxy in self._infer_raw(list(images))]
         
-    def process_frame(self, frame):
-        """프레임 처리 및 결과 반환"""
-        # BGR to RGB
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    def _detect_images(self, images, camera_id=None):
+        # 워커 풀이 있으면 카메라 담당 워커 프로세스에서 추론
+        if self.pool is not None:
+            keys = [camera_id] if len(images) == 1 else [(camera_id, i) for i in range(len(images))]
+            requests = [self.pool.submit(key, image) for key, image in zip(keys, images)]
+            return [Detections.from_xyxy(request.wait(5.0), self.threshold) for request in requests]
+        # 사람 감지 수행 (배처가 있으면 다른 카메라 프레임과 함께 추론)
+        if self.batcher is not None and camera_id is not None:
+            if len(images) == 1:
+                return [self.batcher.infer(camera_id, images[0])]
+            # 영역별 요청이 서로 대체되지 않도록 (카메라, 영역) 단위로 제출
+            requests = [self.batcher.submit((camera_id, i), image) for i, image in enumerate(images)]
+            return [request.wait(5.0) for request in requests]
+        if len(images) == 1:
+            return [self.detect_person(images[0])]
+        return self.detect_batch(images)
+
+    def detect_frame(self, frame, camera_id=None, rois=None, prepared: PreparedFrame = None) -> Detections:
+        """BGR 프레임에서 사람 감지 (그리기 없음)
+
+        rois(RoiSet)가 주어지면 관심 영역만 잘라 추론하고 박스를 전체 프레임 좌표로 되돌린다.
+        prepared가 주어지면 추론 직전에 만든 저해상도 RGB 버퍼로 추론한다.
+        """
+        if rois is None and prepared is not None:
+            return self._detect_images([prepared], camera_id)[0]
+        if rois is None:
+            # BGR to RGB
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            return self._detect_images([rgb_frame], camera_id)[0]
+
+        crops = rois.crops(frame)
+        images = [cv2.cvtColor(crop, cv2.COLOR_BGR2RGB) for crop, _ in crops if crop is not None]
+        results = iter(self._detect_images(images, camera_id) if images else [])
+        per_region = [next(results) if crop is not None else None for crop, _ in crops]
+        return rois.merge(per_region, [offset for _, offset in crops])
         
-        # 사람 감지 수행
-        persons = self.detect_person(rgb_frame)
+    def process_frame(self, frame, camera_id=None):
+        """프레임 처리 및 결과 반환"""
+        persons = self.detect_frame(frame, camera_id)
         
         # 결과 이미지에 바운딩 박스 그리기
-        for _, person in persons.iterrows():
-            cv2.rectangle(frame, 
-                        (int(person['xmin']), int(person['ymin'])),
-                        (int(person['xmax']), int(person['ymax'])),
-                        (0, 255, 0), 2)
+        draw_detections(frame, persons)
             
         return frame, len(persons), 0  # 마지막 0은 helmet 감지 수
\ No newline at end of file
@@ -0,0 +1,94 @@
+import os
+import time
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, NamedTuple, Optional
+import cv2
+from .frame_buffer import FramePacket
+
+# JPEG 인코딩 전용 스레드풀 (Starlette 기본 스레드풀과 분리)
+_encode_executor = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1),
+                                      thread_name_prefix="jpeg-encode")
+
+class StreamVariant(NamedTuple):
+    """클라이언트가 요청한 스트림 형식 (width가 None이면 원본 크기)"""
+    width: Optional[int]
+    quality: int
+
+def encode_frame(frame, variant: StreamVariant) -> bytes:
+    """variant 크기/품질로 JPEG 인코딩"""
+    height, width = frame.shape[:2]
+    if variant.width and variant.width < width:
+        new_height = max(1, round(height * variant.width / width))
+        frame = cv2.resize(frame, (variant.width, new_height), interpolation=cv2.INTER_AREA)
+    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, variant.quality])
+    if not ok:
+        raise RuntimeError("JPEG encoding failed")
+    return buffer.tobytes()
+
+def _reusable(future: Optional[Future]) -> bool:
+    """취소되거나 실패한 인코딩 결과는 캐시에서 다시 쓰지 않음"""
+    if future is None or future.cancelled():
+        return False
+    return not future.done() or future.exception() is None
+
+class _Entry:
+    __slots__ = ('seq', 'future', 'last_used')
+
+    def __init__(self):
+        self.seq = 0
+        self.future: Optional[Future] = None
+        self.last_used = 0.0
+
+class EncodedFrameCache:
+    """카메라 1대의 (프레임 시퀀스, variant)별 인코딩 결과 캐시
+
+    같은 variant를 보는 시청자가 몇 명이든 프레임당 인코딩은 한 번만 수행되고,
+    나머지 시청자는 진행 중이거나 끝난 같은 Future를 공유한다 (대기 측은 asyncio.shield로 감싸
+    한 시청자의 취소가 공유 Future를 취소하지 않게 한다). 취소/실패한 Future는 다음 요청에서 새로 인코딩한다.
+    idle_seconds 동안 아무도 요청하지 않은 variant는 제거된다.
+    """
+
+    def __init__(self, idle_seconds: float = 10.0):
+        self.idle_seconds = idle_seconds
+        self._entries: Dict[StreamVariant, _Entry] = {}
+        self._lock = threading.Lock()
+        self._last_eviction = 0.0
+        self.encodes = 0
+        self.hits = 0
+        self.evictions = 0
+
+    def get_future(self, packet: FramePacket, variant: StreamVariant) -> Future:
+        """packet을 variant로 인코딩한 결과 Future (이미 있으면 재사용)"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(variant)
+            if entry is None:
+                entry = self._entries[variant] = _Entry()
+            entry.last_used = now
+            # 같은 프레임이나 더 새 프레임을 이미 인코딩했다면 그 결과 공유
+            if _reusable(entry.future) and entry.seq >= packet.seq:
+                self.hits += 1
+                return entry.future
+            entry.seq = packet.seq
+            entry.future = _encode_executor.submit(encode_frame, packet.frame, variant)
+            self.encodes += 1
+            if now - self._last_eviction >= self.idle_seconds:
+                self._evict_idle(now)
+            return entry.future
+
+    def _evict_idle(self, now: float):
+        self._last_eviction = now
+        idle = [variant for variant, entry in self._entries.items() if now - entry.last_used > self.idle_seconds]
+        for variant in idle:
+            del self._entries[variant]
+        self.evictions += len(idle)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "variants": [{"width": v.width, "quality": v.quality} for v in self._entries],
+                "encodes": self.encodes,
+                "hits": self.hits,
+                "evictions": self.evictions
+            }
@@ -0,0 +1,155 @@
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+from loguru import logger
+from ..models import crud
+
+# 카메라 파이프라인이 발행하는 이벤트 종류
+PERSON_DETECTED = "person_detected"
+PERSON_LEFT = "person_left"
+
+class EventWriter:
+    """이벤트 write-behind 큐
+
+    카메라 파이프라인은 publish()로 이벤트 행을 넣기만 하고 (절대 대기하지 않음),
+    백그라운드 스레드가 batch_size개가 모이거나 flush_interval이 지나면 INSERT 한 문장 + 커밋 1회로 저장한다.
+    큐가 가득 차면 새 이벤트를 버리고 dropped로 센다. DB 오류 시 배치를 큐 앞에 되돌리고 재시도하며,
+    stop()은 남은 이벤트를 모두 저장한 뒤 종료한다.
+    """
+
+    def __init__(self, session_factory, max_queue: int = 10000, batch_size: int = 500,
+                 flush_interval: float = 1.0):
+        self.session_factory = session_factory
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.is_running = False
+        self._queue: Deque[Dict[str, Any]] = deque()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._listeners: List[Callable[[List[Dict[str, Any]]], None]] = []
+        self.published = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed_flushes = 0
+        self.flushes = 0
+        self.last_flush_ms = 0.0
+
+    def add_listener(self, callback: Callable[[List[Dict[str, Any]]], None]):
+        """저장된 이벤트 목록 (ID 포함)을 받을 콜백 등록 (푸시 허브 등)"""
+        self._listeners.append(callback)
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info("Event writer started")
+
+    def stop(self, timeout: float = 10.0):
+        """남은 이벤트를 모두 저장한 뒤 종료"""
+        with self._cond:
+            self.is_running = False
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+            self._thread = None
+        logger.info(f"Event writer stopped ({len(self._queue)} events left unwritten)")
+
+    def publish(self, camera_id: int, event_type: str, description: Optional[str] = None,
+                timestamp: Optional[float] = None) -> bool:
+        """이벤트를 큐에 넣음 (대기 없음, 큐가 가득 찼거나 종료 중이면 버리고 False)"""
+        row = {
+            "camera_id": camera_id,
+            "event_type": event_type,
+            "description": description,
+            "timestamp": datetime.utcfromtimestamp(timestamp) if timestamp is not None else datetime.utcnow()
+        }
+        with self._cond:
+            if not self.is_running or len(self._queue) >= self.max_queue:
+                self.dropped += 1
+                return False
+            self._queue.append(row)
+            self.published += 1
+            if len(self._queue) >= self.batch_size:
+                self._cond.notify()
+        return True
+
+    @property
+    def backlog(self) -> int:
+        return len(self._queue)
+
+    def _run(self):
+        retry_delay = 0.0
+        while True:
+            with self._cond:
+                # batch_size개가 모이거나 flush_interval이 지날 때까지 대기 (종료 시에는 즉시 배출)
+                deadline = time.monotonic() + self.flush_interval
+                while self.is_running and len(self._queue) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                if not self._queue:
+                    if not self.is_running:
+                        break
+                    continue
+                batch = [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+
+            if self._flush(batch):
+                retry_delay = 0.0
+                continue
+
+            with self._cond:
+                # 실패한 배치는 순서를 유지해 큐 앞으로 되돌림 (넘치는 만큼은 버림)
+                room = self.max_queue - len(self._queue)
+                self._queue.extendleft(reversed(batch[:room]))
+                self.dropped += max(0, len(batch) - room)
+                if not self.is_running:
+                    # 종료 중에는 무한 재시도하지 않고 남은 이벤트를 버림
+                    self.dropped += len(self._queue)
+                    self._queue.clear()
+                    break
+                # DB가 회복될 때까지 지수 백오프 (그동안 publish는 큐가 찰 때까지 계속 받음)
+                retry_delay = min(max(retry_delay * 2, 0.5), 10.0)
+                self._cond.wait_for(lambda: not self.is_running, timeout=retry_delay)
+
+    def _flush(self, rows: List[Dict[str, Any]]) -> bool:
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            ids = crud.save_event_rows(db, rows)
+        except Exception as e:
+            self.failed_flushes += 1
+            logger.error(f"Error writing {len(rows)} events: {str(e)}")
+            return False
+        finally:
+            db.close()
+
+        self.flushes += 1
+        self.written += len(rows)
+        self.last_flush_ms = (time.perf_counter() - started) * 1000
+        if self._listeners:
+            events = [crud.event_payload(event_id, **row) for event_id, row in zip(ids, rows)]
+            for callback in self._listeners:
+                try:
+                    callback(events)
+                except Exception as e:
+                    logger.error(f"Error in event writer listener: {str(e)}")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "backlog": len(self._queue),
+            "max_queue": self.max_queue,
+            "published": self.published,
+            "written": self.written,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes,
+            "last_flush_ms": round(self.last_flush_ms, 2)
+        }
@@ -0,0 +1,99 @@
+import time
+import asyncio
+import threading
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+@dataclass(frozen=True)
+class FramePacket:
+    """버퍼에 저장되는 프레임과 메타데이터"""
+    seq: int
+    timestamp: float
+    frame: Any
+    inference: Any = None  # 미리 준비한 추론 입력 (PreparedFrame, 없으면 추론 시 생성)
+
+class LatestFrameBuffer:
+    """최신 프레임 1장만 보관하는 단일 슬롯 버퍼
+
+    새 프레임이 들어오면 이전 프레임을 덮어쓰고 시퀀스 번호를 1 증가시킨다.
+    소비자는 마지막으로 받은 시퀀스를 넘겨 더 새로운 프레임이 나올 때까지 잠든다.
+    스레드 소비자는 wait_for_frame(), asyncio 소비자는 wait_for_frame_async()를 쓴다.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._packet: Optional[FramePacket] = None
+        self._seq = 0
+        self._async_waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self.closed = False
+
+    def _wake_async_waiters(self):
+        # 프로듀서 스레드에서 호출되므로 각 이벤트 루프에 스레드 안전하게 전달
+        waiters, self._async_waiters = self._async_waiters, []
+        for loop, future in waiters:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    @property
+    def seq(self) -> int:
+        """마지막으로 저장된 프레임의 시퀀스 번호 (없으면 0)"""
+        return self._seq
+
+    def put(self, frame: Any, timestamp: Optional[float] = None, inference: Any = None) -> FramePacket:
+        """최신 프레임 교체 후 대기 중인 소비자를 깨움"""
+        with self._cond:
+            self._seq += 1
+            packet = FramePacket(
+                seq=self._seq,
+                timestamp=time.time() if timestamp is None else timestamp,
+                frame=frame,
+                inference=inference
+            )
+            self._packet = packet
+            self._cond.notify_all()
+            self._wake_async_waiters()
+        return packet
+
+    def get_latest(self) -> Optional[FramePacket]:
+        """대기 없이 최신 프레임 반환"""
+        return self._packet
+
+    def wait_for_frame(self, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[FramePacket]:
+        """after_seq보다 새로운 프레임이 나올 때까지 대기 (시간 초과/종료 시 None)"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq > after_seq or self.closed, timeout=timeout)
+            if self._seq <= after_seq:
+                return None
+            return self._packet
+
+    async def wait_for_frame_async(self, after_seq: int = 0, timeout: Optional[float] = None) -> Optional[FramePacket]:
+        """wait_for_frame의 asyncio 버전 (스레드를 점유하지 않고 대기)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._cond:
+            if self._seq > after_seq:
+                return self._packet
+            if self.closed:
+                return None
+            waiter = (loop, future)
+            self._async_waiters.append(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._cond:
+                if waiter in self._async_waiters:
+                    self._async_waiters.remove(waiter)
+        packet = self._packet
+        return packet if packet is not None and packet.seq > after_seq else None
+
+    def close(self):
+        """대기 중인 모든 소비자를 깨우고 버퍼 종료"""
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+            self._wake_async_waiters()
+
+def _resolve(future: asyncio.Future):
+    if not future.done():
+        future.set_result(None)
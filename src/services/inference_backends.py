@@ -0,0 +1,240 @@
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+from loguru import logger
+
+# yolov5 AutoShape 기본값과 동일하게 맞춤 (백엔드 간 결과 일치용)
+CONF_THRESHOLD = 0.25
+IOU_THRESHOLD = 0.45
+MAX_DETECTIONS = 1000
+
+def letterbox(image: np.ndarray, size: int = 640, color=(114, 114, 114)) -> Tuple[np.ndarray, float, Tuple[float, float]]:
+    """종횡비를 유지하며 size x size로 리사이즈 후 패딩
+
+    반환: (패딩된 이미지, 배율, (좌우 패딩, 상하 패딩))
+    """
+    height, width = image.shape[:2]
+    ratio = min(size / height, size / width)
+    new_w, new_h = int(round(width * ratio)), int(round(height * ratio))
+    dw, dh = (size - new_w) / 2, (size - new_h) / 2
+
+    if (width, height) != (new_w, new_h):
+        image = cv2.resize(image, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
+    left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=color)
+    return image, ratio, (dw, dh)
+
+def yolo_postprocess(pred: np.ndarray, ratio: float, pad: Tuple[float, float], orig_shape,
+                     conf_threshold: float = CONF_THRESHOLD, iou_threshold: float = IOU_THRESHOLD,
+                     classes: Optional[Sequence[int]] = None) -> np.ndarray:
+    """yolov5 원시 출력 (N, 5 + num_classes)을 원본 좌표의 (M, 6) [x1, y1, x2, y2, conf, cls]로 변환"""
+    pred = pred[pred[:, 4] > conf_threshold]
+    if not len(pred):
+        return np.empty((0, 6), dtype=np.float32)
+
+    class_scores = pred[:, 5:] * pred[:, 4:5]
+    cls = class_scores.argmax(axis=1)
+    conf = class_scores[np.arange(len(cls)), cls]
+    keep = conf > conf_threshold
+    if classes is not None:
+        keep &= np.isin(cls, classes)
+    pred, cls, conf = pred[keep], cls[keep], conf[keep]
+    if not len(pred):
+        return np.empty((0, 6), dtype=np.float32)
+
+    # xywh -> xyxy
+    boxes = np.empty((len(pred), 4), dtype=np.float32)
+    boxes[:, 0] = pred[:, 0] - pred[:, 2] / 2
+    boxes[:, 1] = pred[:, 1] - pred[:, 3] / 2
+    boxes[:, 2] = pred[:, 0] + pred[:, 2] / 2
+    boxes[:, 3] = pred[:, 1] + pred[:, 3] / 2
+
+    # 클래스별 NMS (클래스마다 좌표를 오프셋해 한 번에 처리)
+    offset = cls[:, None].astype(np.float32) * 4096
+    nms_boxes = boxes + offset
+    nms_xywh = np.concatenate([nms_boxes[:, :2], nms_boxes[:, 2:] - nms_boxes[:, :2]], axis=1)
+    indices = cv2.dnn.NMSBoxes(nms_xywh.tolist(), conf.tolist(), conf_threshold, iou_threshold)
+    indices = np.array(indices, dtype=np.int64).reshape(-1)[:MAX_DETECTIONS]
+    boxes, conf, cls = boxes[indices], conf[indices], cls[indices]
+
+    # 레터박스 좌표 -> 원본 좌표
+    boxes[:, [0, 2]] = (boxes[:, [0, 2]] - pad[0]) / ratio
+    boxes[:, [1, 3]] = (boxes[:, [1, 3]] - pad[1]) / ratio
+    boxes[:, [0, 2]] = boxes[:, [0, 2]].clip(0, orig_shape[1])
+    boxes[:, [1, 3]] = boxes[:, [1, 3]].clip(0, orig_shape[0])
+
+    return np.concatenate([boxes, conf[:, None], cls[:, None]], axis=1).astype(np.float32)
+
+class PreparedFrame:
+    """캡처 스레드에서 미리 레터박스 리사이즈 + RGB 변환한 추론 입력
+
+    원본 고해상도 프레임은 표시용으로만 두고, 추론에는 작은 정사각형 버퍼를 쓴다.
+    """
+    __slots__ = ('image', 'ratio', 'pad', 'orig_shape')
+
+    def __init__(self, image: np.ndarray, ratio: float, pad: Tuple[float, float], orig_shape):
+        self.image = image
+        self.ratio = ratio
+        self.pad = pad
+        self.orig_shape = orig_shape
+
+    @classmethod
+    def from_bgr(cls, frame: np.ndarray, size: int) -> "PreparedFrame":
+        # 리사이즈를 먼저 해서 색 변환은 작은 이미지에만 수행
+        padded, ratio, pad = letterbox(frame, size)
+        return cls(cv2.cvtColor(padded, cv2.COLOR_BGR2RGB), ratio, pad, frame.shape[:2])
+
+    @classmethod
+    def from_rgb(cls, image: np.ndarray, size: int) -> "PreparedFrame":
+        padded, ratio, pad = letterbox(image, size)
+        return cls(padded, ratio, pad, image.shape[:2])
+
+    @property
+    def size(self) -> int:
+        return max(self.image.shape[:2])
+
+    def to_original(self, xyxy: np.ndarray) -> np.ndarray:
+        """레터박스 좌표의 (N, 6) 결과를 원본 프레임 좌표로 변환"""
+        xyxy = xyxy.copy()
+        xyxy[:, [0, 2]] = ((xyxy[:, [0, 2]] - self.pad[0]) / self.ratio).clip(0, self.orig_shape[1])
+        xyxy[:, [1, 3]] = ((xyxy[:, [1, 3]] - self.pad[1]) / self.ratio).clip(0, self.orig_shape[0])
+        return xyxy
+
+class InferenceBackend:
+    """추론 백엔드 공통 인터페이스
+
+    infer()는 RGB 이미지 목록을 받아 이미지별 (N, 6) [x1, y1, x2, y2, conf, cls]
+    배열을 입력 이미지 좌표로 반환한다. size를 주면 그 해상도로 추론한다
+    (입력 크기가 고정된 모델은 무시).
+    """
+    name = "base"
+    device = "cpu"
+    precisions = ("fp32",)
+
+    def __init__(self, model_path: str, model_name: str = "yolov5s", input_size: int = 640,
+                 classes: Optional[Sequence[int]] = None, precision: str = "fp32"):
+        if precision not in self.precisions:
+            raise ValueError(f"Backend '{self.name}' does not support {precision} "
+                             f"(supported: {', '.join(self.precisions)})")
+        self.model_path = Path(model_path)
+        self.model_name = model_name
+        self.input_size = input_size
+        self.classes = classes
+        self.precision = precision
+
+    def load(self):
+        raise NotImplementedError
+
+    def infer(self, images: List[np.ndarray], size: Optional[int] = None) -> List[np.ndarray]:
+        raise NotImplementedError
+
+    def _weights(self, suffix: str) -> Path:
+        path = self.model_path / f"{self.model_name}{suffix}"
+        if not path.exists():
+            raise FileNotFoundError(f"Model weights not found: {path}")
+        return path
+
+    def _preprocess(self, images: List[np.ndarray], size: Optional[int] = None):
+        """레터박스 + NCHW float32 블롭 생성"""
+        metas, blobs = [], []
+        for image in images:
+            padded, ratio, pad = letterbox(image, size or self.input_size)
+            metas.append((ratio, pad, image.shape[:2]))
+            blobs.append(padded)
+        batch = np.stack(blobs).transpose(0, 3, 1, 2).astype(np.float32) / 255.0
+        return np.ascontiguousarray(batch), metas
+
+    def _postprocess(self, preds: np.ndarray, metas) -> List[np.ndarray]:
+        return [yolo_postprocess(pred, ratio, pad, shape, classes=self.classes)
+                for pred, (ratio, pad, shape) in zip(preds, metas)]
+
+class TorchBackend(InferenceBackend):
+    """PyTorch yolov5 백엔드 (MODEL_PATH에 가중치가 있으면 오프라인 로드)"""
+    name = "torch"
+
+    def load(self):
+        import torch
+
+        self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        weights = self.model_path / f"{self.model_name}.pt"
+        repo = self.model_path / "yolov5"
+        if weights.exists() and repo.exists():
+            # 로컬 yolov5 저장소 + 가중치 (네트워크 불필요)
+            self.model = torch.hub.load(str(repo), 'custom', path=str(weights), source='local')
+        else:
+            logger.warning(f"Local weights not found in {self.model_path}, loading {self.model_name} from torch hub")
+            self.model = torch.hub.load('ultralytics/yolov5', self.model_name, pretrained=True)
+        self.model.to(self.device)
+        if self.classes is not None:
+            self.model.classes = list(self.classes)
+        return self
+
+    def infer(self, images: List[np.ndarray], size: Optional[int] = None) -> List[np.ndarray]:
+        results = self.model(list(images), size=size or self.input_size)
+        return [xyxy.cpu().numpy() for xyxy in results.xyxy]
+
+class OnnxRuntimeBackend(InferenceBackend):
+    """ONNX Runtime CPU 백엔드 (MODEL_PATH/<model>.onnx, INT8은 <model>.int8.onnx)"""
+    name = "onnxruntime"
+    precisions = ("fp32", "int8")
+
+    def load(self):
+        import onnxruntime as ort
+
+        suffix = ".int8.onnx" if self.precision == "int8" else ".onnx"
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(self._weights(suffix)), options,
+                                            providers=['CPUExecutionProvider'])
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        # 배치 차원이 고정(1)으로 export된 모델은 이미지별로 실행
+        self.dynamic_batch = not isinstance(model_input.shape[0], int)
+        # 입력 해상도가 고정된 모델은 요청한 size 대신 모델 크기 사용
+        self.dynamic_size = not isinstance(model_input.shape[2], int)
+        if not self.dynamic_size:
+            self.input_size = model_input.shape[2]
+        return self
+
+    def infer(self, images: List[np.ndarray], size: Optional[int] = None) -> List[np.ndarray]:
+        batch, metas = self._preprocess(images, size if self.dynamic_size else None)
+        if self.dynamic_batch:
+            preds = self.session.run(None, {self.input_name: batch})[0]
+        else:
+            preds = np.concatenate([self.session.run(None, {self.input_name: blob[None]})[0]
+                                    for blob in batch])
+        return self._postprocess(preds, metas)
+
+class OpenCVDnnBackend(InferenceBackend):
+    """OpenCV DNN CPU 백엔드 (MODEL_PATH/<model>.onnx, 추가 의존성 없음)"""
+    name = "opencv"
+
+    def load(self):
+        self.net = cv2.dnn.readNetFromONNX(str(self._weights(".onnx")))
+        self.net.setPreferableBackend(cv2.dnn.DNN_BACKEND_OPENCV)
+        self.net.setPreferableTarget(cv2.dnn.DNN_TARGET_CPU)
+        return self
+
+    def infer(self, images: List[np.ndarray], size: Optional[int] = None) -> List[np.ndarray]:
+        # export된 ONNX의 입력 크기가 고정이므로 항상 input_size로 추론
+        batch, metas = self._preprocess(images)
+        preds = []
+        for blob in batch:
+            self.net.setInput(blob[None])
+            preds.append(self.net.forward()[0])
+        return self._postprocess(np.stack(preds), metas)
+
+BACKENDS = {
+    TorchBackend.name: TorchBackend,
+    OnnxRuntimeBackend.name: OnnxRuntimeBackend,
+    OpenCVDnnBackend.name: OpenCVDnnBackend,
+}
+
+def create_backend(name: str, model_path: str, model_name: str = "yolov5s", input_size: int = 640,
+                   classes: Optional[Sequence[int]] = None, precision: str = "fp32") -> InferenceBackend:
+    """이름으로 백엔드를 생성하고 모델 로드"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown inference backend '{name}' (choose from {', '.join(BACKENDS)})")
+    return BACKENDS[name](model_path, model_name, input_size, classes, precision).load()
@@ -0,0 +1,210 @@
+import time
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+import numpy as np
+from loguru import logger
+
+class InferenceRequest:
+    """배처에 제출된 카메라 프레임 1장"""
+
+    def __init__(self, camera_id: int, image):
+        self.camera_id = camera_id
+        self.image = image
+        self.submitted_at = time.perf_counter()
+        self.result = None
+        self.error: Optional[Exception] = None
+        self._done = threading.Event()
+
+    def set_result(self, result=None, error: Optional[Exception] = None):
+        self.result = result
+        self.error = error
+        self._done.set()
+
+    def wait(self, timeout: Optional[float] = None):
+        """추론 결과 대기 (실패/시간 초과 시 예외)"""
+        if not self._done.wait(timeout):
+            raise TimeoutError(f"Inference for camera {self.camera_id} timed out")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+class InferenceBatcher:
+    """여러 카메라의 최신 프레임을 짧은 시간 창 동안 모아 한 번에 추론
+
+    카메라별로 가장 최근 프레임 1장만 대기열에 남기고, 배치가 가득 차거나
+    최근 활동한 모든 카메라의 프레임이 모이거나 max_wait가 지나면 실행한다.
+    """
+
+    # 최근 이 시간 안에 프레임을 제출한 카메라를 활성 카메라로 간주
+    ACTIVE_WINDOW = 2.0
+
+    def __init__(self, detection_service, max_batch_size: int = 8, max_wait_ms: float = 10.0,
+                 stats_window: int = 500):
+        self.detection_service = detection_service
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.is_running = False
+        self._cond = threading.Condition()
+        self._pending: Dict[int, InferenceRequest] = {}
+        self._last_seen: Dict[int, float] = {}
+        self._thread: Optional[threading.Thread] = None
+
+        # 배치 통계 (최근 stats_window개 배치)
+        self._batch_sizes = deque(maxlen=stats_window)
+        self._latencies_ms = deque(maxlen=stats_window)
+        self._waits_ms = deque(maxlen=stats_window)
+        self.total_batches = 0
+        self.total_frames = 0
+        self.superseded_frames = 0
+
+    def start(self):
+        if self.is_running:
+            return
+        self.is_running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f"Inference batcher started (max_batch_size={self.max_batch_size}, "
+                    f"max_wait_ms={self.max_wait * 1000:.1f})")
+
+    def stop(self):
+        with self._cond:
+            self.is_running = False
+            pending = list(self._pending.values())
+            self._pending.clear()
+            self._cond.notify_all()
+        for request in pending:
+            request.set_result(error=RuntimeError("Inference batcher stopped"))
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+        logger.info("Inference batcher stopped")
+
+    def submit(self, camera_id: int, image) -> InferenceRequest:
+        """프레임 제출 (같은 카메라의 대기 중인 이전 프레임은 새 프레임으로 대체)"""
+        request = InferenceRequest(camera_id, image)
+        with self._cond:
+            if not self.is_running:
+                request.set_result(error=RuntimeError("Inference batcher is not running"))
+                return request
+            previous = self._pending.pop(camera_id, None)
+            self._pending[camera_id] = request
+            now = time.monotonic()
+            self._prune_last_seen(now)
+            self._last_seen[camera_id] = now
+            self._cond.notify_all()
+        if previous is not None:
+            self.superseded_frames += 1
+            previous.set_result(error=RuntimeError(f"Frame from camera {camera_id} superseded"))
+        return request
+
+    def release_camera(self, camera_id: int):
+        """카메라 제거 시 대기 중인 프레임과 활동 기록 정리 (ROI 영역별 (camera_id, i) 키까지 모두)"""
+        with self._cond:
+            keys = [key for key in set(self._last_seen) | set(self._pending)
+                    if key == camera_id or (isinstance(key, tuple) and key[0] == camera_id)]
+            released = [self._pending.pop(key) for key in keys if key in self._pending]
+            for key in keys:
+                self._last_seen.pop(key, None)
+            self._cond.notify_all()
+        for request in released:
+            request.set_result(error=RuntimeError(f"Camera {camera_id} removed"))
+
+    def infer(self, camera_id: int, image, timeout: Optional[float] = 5.0):
+        """프레임을 제출하고 해당 카메라의 감지 결과를 반환"""
+        return self.submit(camera_id, image).wait(timeout)
+
+    def _prune_last_seen(self, now: float):
+        # self._cond를 잡은 상태에서 호출: 활성 창을 벗어난 카메라(제거된 카메라, 사라진 ROI 키) 삭제
+        stale = [key for key, seen in self._last_seen.items() if now - seen > self.ACTIVE_WINDOW]
+        for key in stale:
+            del self._last_seen[key]
+
+    def _active_camera_count(self, now: float) -> int:
+        return sum(1 for seen in self._last_seen.values() if now - seen <= self.ACTIVE_WINDOW)
+
+    def _collect_batch(self) -> List[InferenceRequest]:
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or not self.is_running)
+            if not self.is_running:
+                return []
+
+            # 첫 프레임 도착 후 max_wait 동안 다른 카메라 프레임을 기다림
+            deadline = min(r.submitted_at for r in self._pending.values()) + self.max_wait
+            while self.is_running:
+                target = min(self.max_batch_size, self._active_camera_count(time.monotonic()))
+                remaining = deadline - time.perf_counter()
+                if len(self._pending) >= target or remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            # 오래 기다린 카메라부터 배치에 포함
+            requests = sorted(self._pending.values(), key=lambda r: r.submitted_at)
+            batch = requests[:self.max_batch_size]
+            for request in batch:
+                del self._pending[request.camera_id]
+            return batch
+
+    def _run(self):
+        """배치 추론 스레드"""
+        while self.is_running:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+
+            started = time.perf_counter()
+            try:
+                results = self.detection_service.detect_batch([r.image for r in batch])
+            except Exception as e:
+                logger.error(f"Batched inference failed: {str(e)}")
+                for request in batch:
+                    request.set_result(error=e)
+                continue
+            finished = time.perf_counter()
+
+            for request, result in zip(batch, results):
+                request.set_result(result)
+
+            self._record(len(batch), (finished - started) * 1000,
+                         (started - min(r.submitted_at for r in batch)) * 1000)
+
+    def _record(self, batch_size: int, latency_ms: float, wait_ms: float):
+        with self._cond:
+            self._batch_sizes.append(batch_size)
+            self._latencies_ms.append(latency_ms)
+            self._waits_ms.append(wait_ms)
+            self.total_batches += 1
+            self.total_frames += batch_size
+
+    def get_stats(self) -> Dict[str, Any]:
+        """배치 크기/지연 통계 반환 (시간 창 튜닝용)"""
+        with self._cond:
+            sizes = np.array(self._batch_sizes, dtype=np.float64)
+            latencies = np.array(self._latencies_ms, dtype=np.float64)
+            waits = np.array(self._waits_ms, dtype=np.float64)
+            pending = len(self._pending)
+            now = time.monotonic()
+            self._prune_last_seen(now)
+            active_cameras = self._active_camera_count(now)
+
+        def summary(values):
+            if values.size == 0:
+                return {"mean": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+            return {
+                "mean": round(float(values.mean()), 2),
+                "p50": round(float(np.percentile(values, 50)), 2),
+                "p95": round(float(np.percentile(values, 95)), 2),
+                "max": round(float(values.max()), 2)
+            }
+
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "active_cameras": active_cameras,
+            "pending": pending,
+            "total_batches": self.total_batches,
+            "total_frames": self.total_frames,
+            "superseded_frames": self.superseded_frames,
+            "batch_size": summary(sizes),
+            "latency_ms": summary(latencies),
+            "wait_ms": summary(waits)
+        }
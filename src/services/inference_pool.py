@@ -0,0 +1,362 @@
+import time
+import queue
+import threading
+import multiprocessing as mp
+from multiprocessing import shared_memory
+from collections import deque
+from typing import Any, Dict, List, Optional
+import numpy as np
+from loguru import logger
+from .inference_backends import PreparedFrame, create_backend
+from .inference_batcher import InferenceRequest
+
+# 실행 중 죽은 워커를 다시 띄우는 최대 횟수 (넘으면 배정에서 제외)
+MAX_WORKER_RESTARTS = 3
+# 결과 수집 스레드가 워커 프로세스 생존을 확인하는 주기 (초)
+HEALTH_CHECK_INTERVAL = 0.5
+
+class SharedFrameRing:
+    """shared_memory 위의 고정 크기 프레임 슬롯 링
+
+    부모 프로세스가 빈 슬롯에 프레임을 복사하고 워커에는 슬롯 번호와 shape만 보낸다.
+    프레임 배열 자체는 pickle되지 않는다.
+    """
+
+    def __init__(self, slots: int, max_size: int, name: Optional[str] = None):
+        self.slots = slots
+        self.slot_bytes = max_size * max_size * 3
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=slots * self.slot_bytes)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+
+    def view(self, slot: int, shape) -> np.ndarray:
+        return np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf, offset=slot * self.slot_bytes)
+
+    def write(self, slot: int, image: np.ndarray):
+        if image.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {image.nbytes} bytes does not fit a {self.slot_bytes} byte slot")
+        self.view(slot, image.shape)[...] = image
+
+    def close(self, unlink: bool = False):
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+def _worker_main(worker_index: int, generation: int, ring_name: str, slots: int, max_size: int,
+                 backend_config: Dict[str, Any], jobs, results):
+    """워커 프로세스: 자체 모델을 로드하고 공유 메모리 슬롯의 프레임을 추론
+
+    결과 큐의 메시지는 (kind, key, payload, extra) 형태다. 작업 결과("done"/"error")는 key가 job_id,
+    워커 상태("ready"/"worker_failed")는 key가 워커 번호이고 extra가 재시작 세대라서 서로 섞이지 않는다.
+    """
+    ring = SharedFrameRing(slots, max_size, name=ring_name)
+    try:
+        backend = create_backend(**backend_config)
+        results.put(("ready", worker_index, None, generation))
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+            job_id, slot, shape, size = job
+            started = time.perf_counter()
+            try:
+                # 슬롯 뷰를 그대로 추론에 사용 (복사는 전처리 단계에서만 발생)
+                xyxy = backend.infer([ring.view(slot, shape)], size)[0]
+                results.put(("done", job_id, xyxy, (time.perf_counter() - started) * 1000))
+            except Exception as e:
+                results.put(("error", job_id, str(e), None))
+    except Exception as e:
+        results.put(("worker_failed", worker_index, str(e), generation))
+    finally:
+        ring.close()
+
+class _Worker:
+    """부모 프로세스 쪽 워커 상태 (프로세스, 슬롯 링, 담당 카메라, 부하)"""
+
+    def __init__(self, index: int, slots: int, max_size: int, ctx):
+        self.index = index
+        self.ring = SharedFrameRing(slots, max_size)
+        self.jobs = ctx.Queue()
+        self.free_slots = deque(range(slots))
+        self.slot_available = threading.Condition()
+        self.cameras: Dict[Any, float] = {}  # 카메라 -> 초당 추론 시간 (ms/s, EWMA)
+        self.last_done: Dict[Any, float] = {}
+        self.process = None
+        self.generation = 0
+        self.ready = False
+        self.restarts = 0
+        self.excluded = False
+        self.jobs_done = 0
+        self.latencies_ms = deque(maxlen=200)
+
+    @property
+    def load(self) -> float:
+        return sum(self.cameras.values())
+
+    @property
+    def available(self) -> bool:
+        """새 카메라를 배정할 수 있는 상태 (모델 로드 완료, 프로세스 생존, 제외되지 않음)"""
+        return self.ready and not self.excluded and self.process is not None and self.process.is_alive()
+
+class InferenceWorkerPool:
+    """N개의 추론 워커 프로세스 풀
+
+    각 워커는 자체 모델 사본을 가지며, 프레임은 워커별 shared_memory 링으로 전달하고
+    결과 (작은 감지 배열)만 큐로 돌려받는다. 카메라는 측정된 부하가 가장 낮은 워커에 배정된다.
+    실행 중 워커 프로세스가 죽으면 진행 중인 작업을 실패 처리하고 담당 카메라를 다른 워커로 넘긴 뒤
+    MAX_WORKER_RESTARTS번까지 다시 띄우고, 그 이상은 배정에서 제외한다.
+    """
+
+    def __init__(self, num_workers: int, backend_config: Dict[str, Any], slots_per_worker: int = 4,
+                 max_size: int = 640):
+        self.num_workers = max(1, num_workers)
+        self.backend_config = backend_config
+        self.slots_per_worker = slots_per_worker
+        self.max_size = max_size
+        self.is_running = False
+        self._ctx = mp.get_context("spawn")  # 워커마다 깨끗한 모델/스레드풀 상태로 시작
+        self._results = self._ctx.Queue()
+        self._workers: List[_Worker] = []
+        self._assignments: Dict[Any, _Worker] = {}
+        self._jobs: Dict[int, tuple] = {}
+        self._next_job_id = 0
+        self._lock = threading.Lock()
+        self._collector: Optional[threading.Thread] = None
+
+    def _spawn(self, worker: _Worker):
+        """워커 프로세스 (재)시작 (새 작업 큐, 빈 슬롯 전부 반환, 세대 증가)"""
+        worker.generation += 1
+        worker.ready = False
+        worker.jobs = self._ctx.Queue()
+        with worker.slot_available:
+            worker.free_slots = deque(range(self.slots_per_worker))
+            worker.slot_available.notify_all()
+        worker.process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker.index, worker.generation, worker.ring.name, self.slots_per_worker, self.max_size,
+                  self.backend_config, worker.jobs, self._results),
+            daemon=True
+        )
+        worker.process.start()
+
+    def start(self, ready_timeout: float = 120.0):
+        for index in range(self.num_workers):
+            worker = _Worker(index, self.slots_per_worker, self.max_size, self._ctx)
+            self._workers.append(worker)
+            self._spawn(worker)
+
+        # 모든 워커가 모델 로드를 마칠 때까지 대기
+        deadline = time.monotonic() + ready_timeout
+        while not all(worker.ready for worker in self._workers):
+            try:
+                kind, index, error, _ = self._results.get(timeout=max(0.1, deadline - time.monotonic()))
+            except queue.Empty:
+                waiting = [worker.index for worker in self._workers if not worker.ready]
+                self.stop()
+                raise RuntimeError(f"Inference workers {waiting} did not report ready within {ready_timeout}s")
+            if kind == "worker_failed":
+                self.stop()
+                raise RuntimeError(f"Inference worker {index} failed to start: {error}")
+            if kind == "ready":
+                self._workers[index].ready = True
+
+        self.is_running = True
+        self._collector = threading.Thread(target=self._collect_results, daemon=True)
+        self._collector.start()
+        logger.info(f"Inference worker pool started with {self.num_workers} workers")
+
+    def stop(self):
+        self.is_running = False
+        for worker in self._workers:
+            worker.jobs.put(None)
+        for worker in self._workers:
+            if worker.process is not None:
+                worker.process.join(timeout=5.0)
+                if worker.process.is_alive():
+                    worker.process.terminate()
+            worker.ring.close(unlink=True)
+        self._results.put(("stop", None, None, None))
+        if self._collector is not None:
+            self._collector.join(timeout=1.0)
+        with self._lock:
+            pending = list(self._jobs.values())
+            self._jobs.clear()
+        for _, request, _, _ in pending:
+            request.set_result(error=RuntimeError("Inference worker pool stopped"))
+        logger.info("Inference worker pool stopped")
+
+    def _worker_for(self, camera_id) -> _Worker:
+        """카메라의 담당 워커 (처음 보는 카메라는 부하가 가장 낮은 워커에 배정)"""
+        with self._lock:
+            worker = self._assignments.get(camera_id)
+            if worker is None:
+                candidates = [w for w in self._workers if w.available]
+                if not candidates:
+                    raise RuntimeError("No inference worker available")
+                worker = min(candidates, key=lambda w: (w.load, len(w.cameras)))
+                worker.cameras[camera_id] = 0.0
+                self._assignments[camera_id] = worker
+                logger.info(f"Assigned camera {camera_id} to inference worker {worker.index}")
+            return worker
+
+    def release_camera(self, camera_id):
+        """카메라 제거 시 배정 해제 (ROI 영역별로 제출된 (camera_id, i) 키까지 모두)"""
+        with self._lock:
+            keys = [key for key in self._assignments
+                    if key == camera_id or (isinstance(key, tuple) and key[0] == camera_id)]
+            for key in keys:
+                worker = self._assignments.pop(key)
+                worker.cameras.pop(key, None)
+                worker.last_done.pop(key, None)
+
+    def submit(self, camera_id, image, timeout: float = 1.0) -> InferenceRequest:
+        """프레임을 담당 워커의 빈 슬롯에 복사하고 추론 요청"""
+        request = InferenceRequest(camera_id, image)
+        if not self.is_running:
+            request.set_result(error=RuntimeError("Inference worker pool is not running"))
+            return request
+
+        prepared = image if isinstance(image, PreparedFrame) else PreparedFrame.from_rgb(image, self.max_size)
+        if max(prepared.image.shape[:2]) > self.max_size:
+            prepared = PreparedFrame(*self._shrink(prepared))
+
+        try:
+            worker = self._worker_for(camera_id)
+        except RuntimeError as e:
+            request.set_result(error=e)
+            return request
+        with worker.slot_available:
+            if not worker.slot_available.wait_for(lambda: worker.free_slots, timeout=timeout):
+                request.set_result(error=TimeoutError(f"No free frame slot on worker {worker.index}"))
+                return request
+            slot = worker.free_slots.popleft()
+
+        worker.ring.write(slot, np.ascontiguousarray(prepared.image))
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._jobs[job_id] = (worker, request, prepared, slot)
+        worker.jobs.put((job_id, slot, prepared.image.shape, prepared.size))
+        return request
+
+    def _shrink(self, prepared: PreparedFrame):
+        # 슬롯보다 큰 준비 프레임은 풀의 최대 크기로 다시 레터박스
+        inner = PreparedFrame.from_rgb(prepared.image, self.max_size)
+        ratio = prepared.ratio * inner.ratio
+        pad = (prepared.pad[0] * inner.ratio + inner.pad[0], prepared.pad[1] * inner.ratio + inner.pad[1])
+        return inner.image, ratio, pad, prepared.orig_shape
+
+    def infer(self, camera_id, image, timeout: Optional[float] = 5.0) -> np.ndarray:
+        """원본 좌표의 원시 감지 결과 (N, 6) 반환"""
+        return self.submit(camera_id, image).wait(timeout)
+
+    def _collect_results(self):
+        """결과 수집 스레드: 슬롯 반환 후 요청에 결과 전달, 주기적으로 워커 생존 확인"""
+        last_check = time.monotonic()
+        while True:
+            try:
+                kind, key, payload, extra = self._results.get(timeout=HEALTH_CHECK_INTERVAL)
+            except queue.Empty:
+                kind = None
+            if kind == "stop":
+                break
+            if kind in ("ready", "worker_failed"):
+                self._worker_status(kind, key, payload, extra)
+            elif kind is not None:
+                self._complete(kind, key, payload, extra)
+
+            now = time.monotonic()
+            if now - last_check >= HEALTH_CHECK_INTERVAL and self.is_running:
+                last_check = now
+                for worker in self._workers:
+                    if worker.ready and not worker.excluded and not worker.process.is_alive():
+                        self._worker_died(worker, f"process exited with code {worker.process.exitcode}")
+
+    def _complete(self, kind: str, job_id: int, payload, latency_ms: Optional[float]):
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        if job is None:
+            return
+        worker, request, prepared, slot = job
+        with worker.slot_available:
+            worker.free_slots.append(slot)
+            worker.slot_available.notify()
+
+        if kind == "done":
+            self._record(worker, request.camera_id, latency_ms)
+            request.set_result(prepared.to_original(payload))
+        else:
+            request.set_result(error=RuntimeError(f"Inference failed on worker {worker.index}: {payload}"))
+
+    def _worker_status(self, kind: str, index: int, error: Optional[str], generation: int):
+        """재시작한 워커의 준비 완료/시작 실패 처리 (이전 세대 프로세스의 메시지는 무시)"""
+        worker = self._workers[index]
+        if generation != worker.generation or worker.excluded:
+            return
+        if kind == "ready":
+            worker.ready = True
+            logger.info(f"Inference worker {index} restarted")
+        else:
+            self._worker_died(worker, error)
+
+    def _worker_died(self, worker: _Worker, reason: str):
+        """죽은 워커의 진행 중 작업 실패 처리, 담당 카메라 해제 후 재시작 (한도를 넘으면 제외)"""
+        logger.error(f"Inference worker {worker.index} died: {reason}")
+        with self._lock:
+            worker.ready = False
+            failed = [job_id for job_id, job in self._jobs.items() if job[0] is worker]
+            requests = [self._jobs.pop(job_id)[1] for job_id in failed]
+            # 담당 카메라는 다음 요청에서 _worker_for가 살아 있는 워커에 다시 배정
+            for camera_id in list(worker.cameras):
+                self._assignments.pop(camera_id, None)
+            worker.cameras.clear()
+            worker.last_done.clear()
+        for request in requests:
+            request.set_result(error=RuntimeError(f"Inference worker {worker.index} died: {reason}"))
+
+        if worker.process is not None and worker.process.is_alive():
+            worker.process.terminate()
+            worker.process.join(timeout=1.0)
+        if worker.restarts >= MAX_WORKER_RESTARTS:
+            worker.excluded = True
+            logger.error(f"Inference worker {worker.index} excluded after {worker.restarts} restarts")
+            return
+        worker.restarts += 1
+        self._spawn(worker)
+
+    def _record(self, worker: _Worker, camera_id, latency_ms: float):
+        with self._lock:
+            worker.jobs_done += 1
+            worker.latencies_ms.append(latency_ms)
+            # 카메라 부하 = 추론 시간 x 추론 빈도 (초당 점유 ms)의 지수 이동 평균
+            if camera_id not in worker.cameras:
+                return
+            now = time.monotonic()
+            last = worker.last_done.get(camera_id)
+            worker.last_done[camera_id] = now
+            if last is not None and now > last:
+                cost = latency_ms / (now - last)
+                worker.cameras[camera_id] = 0.9 * worker.cameras[camera_id] + 0.1 * cost
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": [
+                    {
+                        "index": worker.index,
+                        "alive": worker.process is not None and worker.process.is_alive(),
+                        "ready": worker.ready,
+                        "restarts": worker.restarts,
+                        "excluded": worker.excluded,
+                        "cameras": [str(camera_id) for camera_id in worker.cameras],
+                        "load": round(worker.load, 2),
+                        "jobs_done": worker.jobs_done,
+                        "free_slots": len(worker.free_slots),
+                        "latency_ms_mean": round(float(np.mean(worker.latencies_ms)), 2) if worker.latencies_ms else 0.0
+                    }
+                    for worker in self._workers
+                ],
+                "pending": len(self._jobs)
+            }
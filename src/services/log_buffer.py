@@ -0,0 +1,157 @@
+import re
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from loguru import logger
+
+# 기존 로그 메시지의 "camera 3" / "Camera 3" 형식에서 카메라 ID 추출
+CAMERA_PATTERN = re.compile(r"\bcamera (\d+)", re.IGNORECASE)
+# 인덱스 키로 쓰는 loguru 기본 레벨 (POST /log 등에서 들어온 그 외 이름은 INFO로 저장)
+LEVELS = ("TRACE", "DEBUG", "INFO", "SUCCESS", "WARNING", "ERROR", "CRITICAL")
+LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+
+class LogRingBuffer:
+    """고정 크기 구조화 로그 링 버퍼 (loguru sink)
+
+    항목마다 1부터 증가하는 seq를 붙이고 seq % capacity 슬롯을 덮어쓰므로 추가는 O(1)이다.
+    레벨별/카메라별 seq 인덱스를 따로 두어, 필터 조회도 커서 이후의 새 항목만 훑는다.
+    링에서 밀려난 항목은 인덱스에서도 빼고 비게 된 키는 지우므로 인덱스 크기도 capacity를 넘지 않는다.
+    클라이언트는 응답의 cursor를 다음 요청의 after로 넘겨 새 로그만 받는다.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.capacity = capacity
+        self._slots: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._seq = 0
+        self._by_level: Dict[str, Deque[int]] = {}
+        self._by_camera: Dict[int, Deque[int]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def cursor(self) -> int:
+        """마지막 항목의 seq"""
+        return self._seq
+
+    def write(self, message):
+        """loguru sink: logger.add(log_buffer.write)"""
+        record = message.record
+        camera_id = record["extra"].get("camera_id")
+        if camera_id is None:
+            match = CAMERA_PATTERN.search(record["message"])
+            camera_id = int(match.group(1)) if match else None
+        self.append(record["level"].name, record["message"], record["time"].replace(tzinfo=None),
+                    camera_id, f"{record['name']}:{record['function']}")
+
+    def append(self, level: str, message: str, timestamp: Optional[datetime] = None,
+               camera_id: Optional[int] = None, source: Optional[str] = None) -> Dict[str, Any]:
+        level = normalize_level(level)
+        with self._lock:
+            self._seq += 1
+            evicted = self._slots[self._seq % self.capacity]
+            if evicted is not None:
+                self._unindex(self._by_level, evicted["level"], evicted["seq"])
+                if evicted["camera_id"] is not None:
+                    self._unindex(self._by_camera, evicted["camera_id"], evicted["seq"])
+            entry = {
+                "seq": self._seq,
+                "timestamp": (timestamp or datetime.now()).isoformat(),
+                "level": level,
+                "message": message,
+                "camera_id": camera_id,
+                "source": source
+            }
+            self._slots[self._seq % self.capacity] = entry
+            self._index(self._by_level, level, self._seq)
+            if camera_id is not None:
+                self._index(self._by_camera, camera_id, self._seq)
+        return entry
+
+    def _index(self, index: Dict[Any, Deque[int]], key, seq: int):
+        seqs = index.get(key)
+        if seqs is None:
+            seqs = index[key] = deque(maxlen=self.capacity)
+        seqs.append(seq)
+
+    def _unindex(self, index: Dict[Any, Deque[int]], key, seq: int):
+        # 인덱스는 seq 오름차순이므로 밀려난 항목은 항상 앞쪽에 있음
+        seqs = index.get(key)
+        if seqs is None:
+            return
+        while seqs and seqs[0] <= seq:
+            seqs.popleft()
+        if not seqs:
+            del index[key]
+
+    def since(self, after: Optional[int] = None, level: Optional[str] = None, camera_id: Optional[int] = None,
+              limit: int = 200) -> Tuple[List[Dict[str, Any]], int, bool]:
+        """after 이후의 항목 (오래된 순)
+
+        after를 생략하면 최신 limit개, 주면 그 이후부터 limit개씩 앞으로 페이지를 넘긴다.
+        level은 최소 레벨 (예: WARNING이면 WARNING/ERROR/CRITICAL).
+        반환: (항목 목록, 다음 커서, 링에서 밀려나 놓친 항목이 있는지)
+        """
+        with self._lock:
+            oldest = max(1, self._seq - self.capacity + 1)
+            missed = after is not None and after + 1 < oldest and self._seq > 0
+            floor = max(after or 0, oldest - 1)
+            if level is None and camera_id is None:
+                seqs = range(floor + 1, self._seq + 1)
+            else:
+                seqs = self._filtered(floor, level, camera_id)
+            entries = []
+            minimum = _level_no(level) if level is not None else 0
+            for seq in seqs:
+                entry = self._slots[seq % self.capacity]
+                # 인덱스에 남은 seq의 슬롯이 이미 덮어써졌으면 건너뜀
+                if entry is None or entry["seq"] != seq:
+                    continue
+                if minimum and _level_no(entry["level"]) < minimum:
+                    continue
+                entries.append(entry)
+
+            if after is None:
+                return entries[-limit:], self._seq, missed
+            if len(entries) > limit:
+                # 잘린 페이지는 마지막으로 돌려준 항목까지만 커서를 진행
+                entries = entries[:limit]
+                return entries, entries[-1]["seq"], missed
+            return entries, self._seq, missed
+
+    def _filtered(self, floor: int, level: Optional[str], camera_id: Optional[int]) -> List[int]:
+        # 인덱스를 최신 쪽부터 floor까지만 훑음 (커서로 tail하면 새 항목 수에 비례)
+        if camera_id is not None:
+            indexes = [self._by_camera.get(camera_id, ())]
+        else:
+            minimum = _level_no(level)
+            indexes = [seqs for name, seqs in self._by_level.items() if _level_no(name) >= minimum]
+        seqs = []
+        for index in indexes:
+            for seq in reversed(index):
+                if seq <= floor:
+                    break
+                seqs.append(seq)
+        seqs.sort()
+        return seqs
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "capacity": self.capacity,
+                "cursor": self._seq,
+                "levels": {name: len(seqs) for name, seqs in self._by_level.items()},
+                "cameras": {str(camera_id): len(seqs) for camera_id, seqs in self._by_camera.items()}
+            }
+
+def normalize_level(name: str) -> str:
+    """레벨 이름을 loguru 기본 레벨 중 하나로 (알 수 없는 이름은 INFO)"""
+    name = str(name).upper()
+    name = LEVEL_ALIASES.get(name, name)
+    return name if name in LEVELS else "INFO"
+
+def _level_no(name: str) -> int:
+    """loguru 레벨 이름 -> 심각도 번호 (알 수 없는 이름은 0)"""
+    try:
+        return logger.level(name.upper()).no
+    except ValueError:
+        return 0
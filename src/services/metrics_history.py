@@ -0,0 +1,170 @@
+import time
+import threading
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+import numpy as np
+from loguru import logger
+
+# (버킷 크기 초, 버킷 수): 1초 x 1시간, 1분 x 24시간, 1시간 x 30일
+ROLLUPS: Tuple[Tuple[int, int], ...] = ((1, 3600), (60, 1440), (3600, 720))
+
+class RollupRing:
+    """고정 크기 버킷 링 (버킷별 합계/개수/최소/최대)
+
+    버킷 번호 = timestamp // resolution, 슬롯 = 버킷 번호 % capacity.
+    슬롯에 다른(오래된) 버킷이 남아 있으면 덮어쓰므로 기록은 O(1)이고 메모리는 고정이다.
+    """
+
+    def __init__(self, resolution: int, capacity: int):
+        self.resolution = resolution
+        self.capacity = capacity
+        self.buckets = np.full(capacity, -1, dtype=np.int64)
+        self.sum = np.zeros(capacity)
+        self.count = np.zeros(capacity)
+        self.min = np.full(capacity, np.inf)
+        self.max = np.full(capacity, -np.inf)
+
+    @property
+    def retention(self) -> float:
+        return float(self.resolution * self.capacity)
+
+    def add(self, value: float, timestamp: float):
+        bucket = int(timestamp // self.resolution)
+        slot = bucket % self.capacity
+        if self.buckets[slot] != bucket:
+            self.buckets[slot] = bucket
+            self.sum[slot] = 0.0
+            self.count[slot] = 0.0
+            self.min[slot] = np.inf
+            self.max[slot] = -np.inf
+        self.sum[slot] += value
+        self.count[slot] += 1
+        if value < self.min[slot]:
+            self.min[slot] = value
+        if value > self.max[slot]:
+            self.max[slot] = value
+
+    def query(self, start: float, end: float, step: int) -> Tuple[np.ndarray, ...]:
+        """[start, end] 구간을 step초 단위로 다시 묶은 (시각, 평균, 최소, 최대)"""
+        first, last = int(start // self.resolution), int(end // self.resolution)
+        index = np.flatnonzero((self.buckets >= first) & (self.buckets <= last))
+        if not index.size:
+            empty = np.empty(0)
+            return empty, empty, empty, empty
+        index = index[np.argsort(self.buckets[index], kind='stable')]
+
+        # 정렬된 버킷을 step 그룹으로 나누고 그룹 경계마다 reduceat으로 집계
+        groups = self.buckets[index] * self.resolution // step
+        starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+        sums = np.add.reduceat(self.sum[index], starts)
+        counts = np.add.reduceat(self.count[index], starts)
+        return (
+            (groups[starts] * step).astype(np.float64),
+            sums / counts,
+            np.minimum.reduceat(self.min[index], starts),
+            np.maximum.reduceat(self.max[index], starts)
+        )
+
+class MetricSeries:
+    """지표 하나의 다중 해상도 롤업 (모든 기록이 각 해상도 링에 동시에 들어감)"""
+
+    def __init__(self, rollups: Iterable[Tuple[int, int]] = ROLLUPS):
+        self.rings = [RollupRing(resolution, capacity) for resolution, capacity in rollups]
+        self.last_value: Optional[float] = None
+        self.last_timestamp: Optional[float] = None
+
+    def add(self, value: float, timestamp: float):
+        for ring in self.rings:
+            ring.add(value, timestamp)
+        self.last_value = value
+        self.last_timestamp = timestamp
+
+    def select(self, start: float, step: float, now: float) -> RollupRing:
+        """start까지 보관 중인 링 가운데 step 이하 해상도 중 가장 거친 링 (없으면 가장 고운 링)"""
+        covering = [ring for ring in self.rings if now - ring.retention <= start] or self.rings[-1:]
+        fitting = [ring for ring in covering if ring.resolution <= step]
+        return fitting[-1] if fitting else covering[0]
+
+class MetricsHistory:
+    """프로세스 내 시계열 저장소
+
+    지표 이름별 MetricSeries를 두고, 지표 수를 max_series로 제한해
+    프로세스가 얼마나 오래 돌든 메모리 사용량이 고정된다.
+    """
+
+    def __init__(self, max_series: int = 64, rollups: Iterable[Tuple[int, int]] = ROLLUPS):
+        self.max_series = max_series
+        self.rollups = tuple(rollups)
+        self._series: Dict[str, MetricSeries] = {}
+        self._lock = threading.Lock()
+        self._rejected = set()
+
+    def record(self, name: str, value: float, timestamp: Optional[float] = None):
+        self.record_many({name: value}, timestamp)
+
+    def record_many(self, values: Dict[str, float], timestamp: Optional[float] = None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self._lock:
+            for name, value in values.items():
+                if value is None:
+                    continue
+                series = self._series.get(name)
+                if series is None:
+                    if len(self._series) >= self.max_series:
+                        if name not in self._rejected:
+                            self._rejected.add(name)
+                            logger.warning(f"Metrics history is full ({self.max_series} series), dropping '{name}'")
+                        continue
+                    series = self._series[name] = MetricSeries(self.rollups)
+                series.add(float(value), timestamp)
+
+    def metrics(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"metric": name, "last_value": series.last_value, "last_timestamp": series.last_timestamp}
+                for name, series in sorted(self._series.items())
+            ]
+
+    def query(self, name: str, start: float, end: float, step: Optional[float] = None,
+              max_points: int = 300) -> Optional[Dict[str, Any]]:
+        """[start, end] 구간을 step초 간격으로 다운샘플링 (step 생략 시 max_points개 이하가 되도록)"""
+        now = time.time()
+        with self._lock:
+            series = self._series.get(name)
+            if series is None:
+                return None
+            wanted = step or max(1.0, (end - start) / max_points)
+            ring = series.select(start, wanted, now)
+            # step은 선택한 링 해상도의 배수로 맞춤
+            step = max(1, int(round(wanted / ring.resolution))) * ring.resolution
+            timestamps, avg, low, high = ring.query(start, end, step)
+        return {
+            "metric": name,
+            "from": start,
+            "to": end,
+            "step": step,
+            "resolution": ring.resolution,
+            "t": timestamps.tolist(),
+            "avg": np.round(avg, 3).tolist(),
+            "min": np.round(low, 3).tolist(),
+            "max": np.round(high, 3).tolist()
+        }
+
+class RateMeter:
+    """단조 증가 카운터(프레임 시퀀스 등)의 호출 간 초당 증가율"""
+
+    def __init__(self):
+        self._last: Dict[Hashable, Tuple[float, float]] = {}
+
+    def rate(self, key: Hashable, value: float, now: Optional[float] = None) -> float:
+        now = time.monotonic() if now is None else now
+        previous = self._last.get(key)
+        self._last[key] = (value, now)
+        if previous is None or now <= previous[1]:
+            return 0.0
+        return max(0.0, value - previous[0]) / (now - previous[1])
+
+    def retain(self, keys: Iterable[Hashable]):
+        """사라진 키 정리"""
+        keys = set(keys)
+        for key in self._last.keys() - keys:
+            del self._last[key]
@@ -0,0 +1,133 @@
+import math
+import time
+import asyncio
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+import cv2
+import numpy as np
+from loguru import logger
+from .encoder_cache import EncodedFrameCache, StreamVariant
+from .frame_buffer import LatestFrameBuffer, FramePacket
+
+LABEL_COLOR = (255, 255, 255)
+NO_SIGNAL_COLOR = (90, 90, 90)
+
+class MosaicComposer:
+    """여러 카메라의 축소 타일을 한 프레임으로 합성하는 서버 측 모자이크
+
+    대시보드 그리드 전체가 연결 1개, 합성 프레임당 인코딩 1회로 끝난다.
+    FrameBroadcaster와 같은 시청자 인터페이스(subscribe/wait_for_frame_async/encode)를 제공한다.
+    """
+
+    def __init__(self, get_broadcasters: Callable[[], Dict[int, object]], camera_ids: Optional[Tuple[int, ...]] = None,
+                 cols: Optional[int] = None, tile_width: int = 480, fps: float = 10.0, idle_seconds: float = 10.0):
+        self.get_broadcasters = get_broadcasters
+        self.camera_ids = camera_ids  # None이면 등록된 모든 카메라
+        self.cols = cols
+        self.tile_width = tile_width
+        self.tile_height = tile_width * 9 // 16
+        self.fps = fps
+        self.output = LatestFrameBuffer()
+        self.encoder = EncodedFrameCache(idle_seconds)
+        self.is_running = False
+        self._lock = threading.Lock()
+        self._subscribers = 0
+        self._thread: Optional[threading.Thread] = None
+        self._tiles: Dict[int, Tuple[int, np.ndarray]] = {}  # 카메라 -> (시퀀스, 축소 타일)
+
+    @property
+    def closed(self) -> bool:
+        return self.output.closed
+
+    @property
+    def subscriber_count(self) -> int:
+        return self._subscribers
+
+    def subscribe(self):
+        with self._lock:
+            self._subscribers += 1
+            if self._thread is None and not self.closed:
+                self.is_running = True
+                self._thread = threading.Thread(target=self._compose_loop, daemon=True)
+                self._thread.start()
+                logger.info(f"Mosaic {self.camera_ids or 'all'} started")
+
+    def unsubscribe(self):
+        with self._lock:
+            self._subscribers = max(0, self._subscribers - 1)
+
+    def close(self):
+        self.output.close()
+
+    async def wait_for_frame_async(self, after_seq: int, timeout: float = 1.0) -> Optional[FramePacket]:
+        return await self.output.wait_for_frame_async(after_seq, timeout)
+
+    async def encode(self, packet: FramePacket, variant: StreamVariant) -> bytes:
+        # 공유 Future이므로 이 시청자가 끊겨도 다른 시청자의 인코딩이 취소되지 않게 shield
+        return await asyncio.shield(asyncio.wrap_future(self.encoder.get_future(packet, variant)))
+
+    def _layout(self, count: int) -> Tuple[int, int]:
+        cols = self.cols or max(1, math.ceil(math.sqrt(count)))
+        return cols, max(1, math.ceil(count / cols))
+
+    def _tile(self, camera_id: int, broadcaster) -> np.ndarray:
+        """카메라의 최신 처리 프레임을 타일 크기로 축소 (같은 프레임은 재사용)"""
+        packet = broadcaster.output.get_latest() if broadcaster is not None else None
+        if packet is None:
+            tile = np.zeros((self.tile_height, self.tile_width, 3), dtype=np.uint8)
+            cv2.putText(tile, "NO SIGNAL", (self.tile_width // 2 - 60, self.tile_height // 2),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, NO_SIGNAL_COLOR, 2, cv2.LINE_AA)
+        else:
+            cached = self._tiles.get(camera_id)
+            if cached is not None and cached[0] == packet.seq:
+                return cached[1]
+            tile = cv2.resize(packet.frame, (self.tile_width, self.tile_height), interpolation=cv2.INTER_AREA)
+            self._tiles[camera_id] = (packet.seq, tile)
+        return tile
+
+    def _compose(self, broadcasters: Dict[int, object], camera_ids: List[int]) -> np.ndarray:
+        cols, rows = self._layout(len(camera_ids))
+        canvas = np.zeros((rows * self.tile_height, cols * self.tile_width, 3), dtype=np.uint8)
+        for index, camera_id in enumerate(camera_ids):
+            row, col = divmod(index, cols)
+            y, x = row * self.tile_height, col * self.tile_width
+            canvas[y:y + self.tile_height, x:x + self.tile_width] = self._tile(camera_id, broadcasters.get(camera_id))
+            cv2.putText(canvas, f"CAM {camera_id}", (x + 8, y + 22), cv2.FONT_HERSHEY_SIMPLEX,
+                        0.6, LABEL_COLOR, 1, cv2.LINE_AA)
+        return canvas
+
+    def _compose_loop(self):
+        """fps 주기로 타일을 합성해 출력 버퍼에 게시"""
+        interval = 1.0 / self.fps
+        subscribed: Dict[int, object] = {}
+        try:
+            while True:
+                with self._lock:
+                    if self.closed or self._subscribers == 0:
+                        self.is_running = False
+                        self._thread = None
+                        break
+                started = time.monotonic()
+                try:
+                    broadcasters = self.get_broadcasters()
+                    camera_ids = sorted(broadcasters) if self.camera_ids is None else list(self.camera_ids)
+
+                    # 모자이크에 포함된 카메라의 프로듀서가 계속 돌도록 구독 유지
+                    for camera_id in camera_ids:
+                        broadcaster = broadcasters.get(camera_id)
+                        if broadcaster is not None and subscribed.get(camera_id) is not broadcaster:
+                            broadcaster.subscribe()
+                            subscribed[camera_id] = broadcaster
+                    for camera_id in [c for c in subscribed if c not in camera_ids or broadcasters.get(c) is not subscribed[c]]:
+                        subscribed.pop(camera_id).unsubscribe()
+                        self._tiles.pop(camera_id, None)
+
+                    if camera_ids:
+                        self.output.put(self._compose(broadcasters, camera_ids))
+                except Exception as e:
+                    logger.error(f"Error composing mosaic: {str(e)}")
+                time.sleep(max(0.0, interval - (time.monotonic() - started)))
+        finally:
+            for broadcaster in subscribed.values():
+                broadcaster.unsubscribe()
+            logger.info(f"Mosaic {self.camera_ids or 'all'} stopped")
@@ -0,0 +1,100 @@
+import time
+import threading
+from typing import Any, Dict, Optional
+import cv2
+import numpy as np
+
+class MotionGate:
+    """저해상도 프레임 차분으로 움직임이 있을 때만 추론을 허용하는 필터
+
+    sensitivity (0~1): 클수록 작은 움직임에도 반응 (변화 픽셀 비율 기준을 낮춤)
+    heartbeat_seconds: 움직임이 없어도 이 간격마다 한 번은 추론
+    """
+
+    PIXEL_THRESHOLD = 25
+    BACKGROUND_ALPHA = 0.05
+
+    def __init__(self, sensitivity: float = 0.5, heartbeat_seconds: float = 10.0,
+                 downscale_width: int = 160, enabled: bool = True):
+        self.enabled = enabled
+        self.sensitivity = min(1.0, max(0.0, sensitivity))
+        self.heartbeat_seconds = heartbeat_seconds
+        self.downscale_width = downscale_width
+        self._background: Optional[np.ndarray] = None
+        self._last_inference = 0.0
+        self._lock = threading.Lock()
+
+        self.frames_checked = 0
+        self.frames_gated = 0
+        self.frames_inferred = 0
+        self.motion_triggers = 0
+        self.heartbeat_triggers = 0
+        self.last_motion_ratio = 0.0
+
+    @property
+    def min_area_ratio(self) -> float:
+        """움직임으로 판단할 변화 픽셀 비율 (sensitivity 0 -> 5%, 1 -> 0.05%)"""
+        return 0.05 * (1.0 - self.sensitivity) + 0.0005
+
+    def update(self, sensitivity: Optional[float] = None, heartbeat_seconds: Optional[float] = None,
+               enabled: Optional[bool] = None):
+        if sensitivity is not None:
+            self.sensitivity = min(1.0, max(0.0, sensitivity))
+        if heartbeat_seconds is not None:
+            self.heartbeat_seconds = max(0.0, heartbeat_seconds)
+        if enabled is not None:
+            self.enabled = enabled
+
+    def _motion_ratio(self, frame) -> float:
+        height, width = frame.shape[:2]
+        scale = self.downscale_width / width
+        small = cv2.resize(frame, (self.downscale_width, max(1, int(height * scale))),
+                           interpolation=cv2.INTER_AREA)
+        gray = cv2.GaussianBlur(cv2.cvtColor(small, cv2.COLOR_BGR2GRAY), (5, 5), 0).astype(np.float32)
+
+        if self._background is None or self._background.shape != gray.shape:
+            self._background = gray
+            return 1.0  # 첫 프레임은 움직임으로 간주해 추론
+
+        diff = cv2.absdiff(gray, self._background)
+        cv2.accumulateWeighted(gray, self._background, self.BACKGROUND_ALPHA)
+        return float(np.count_nonzero(diff > self.PIXEL_THRESHOLD)) / diff.size
+
+    def should_infer(self, frame, now: Optional[float] = None) -> bool:
+        """움직임이 있거나 heartbeat 주기가 지났으면 True"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self.frames_checked += 1
+            if not self.enabled:
+                self.frames_inferred += 1
+                self._last_inference = now
+                return True
+
+            self.last_motion_ratio = self._motion_ratio(frame)
+            if self.last_motion_ratio >= self.min_area_ratio:
+                self.motion_triggers += 1
+            elif now - self._last_inference >= self.heartbeat_seconds:
+                self.heartbeat_triggers += 1
+            else:
+                self.frames_gated += 1
+                return False
+
+            self.frames_inferred += 1
+            self._last_inference = now
+            return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            checked = self.frames_checked
+            return {
+                "enabled": self.enabled,
+                "sensitivity": self.sensitivity,
+                "heartbeat_seconds": self.heartbeat_seconds,
+                "frames_checked": checked,
+                "frames_gated": self.frames_gated,
+                "frames_inferred": self.frames_inferred,
+                "motion_triggers": self.motion_triggers,
+                "heartbeat_triggers": self.heartbeat_triggers,
+                "gated_ratio": round(self.frames_gated / checked, 4) if checked else 0.0,
+                "last_motion_ratio": round(self.last_motion_ratio, 5)
+            }
@@ -0,0 +1,167 @@
+import json
+import time
+import asyncio
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+from loguru import logger
+from .metrics_history import RateMeter
+
+_MISSING = object()
+
+def _diff(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """new에서 바뀐 값만 추린 중첩 dict (사라진 키는 None)"""
+    delta = {}
+    for key, value in new.items():
+        previous = old.get(key, _MISSING)
+        if isinstance(value, dict) and isinstance(previous, dict):
+            changed = _diff(previous, value)
+            if changed:
+                delta[key] = changed
+        elif value != previous:
+            delta[key] = value
+    for key in old.keys() - new.keys():
+        delta[key] = None
+    return delta
+
+class PushClient:
+    """WebSocket 연결 하나의 송신 큐
+
+    느린 클라이언트는 큐가 차면 밀린 메시지를 버리고 다음 주기에 전체 스냅샷을 받는다.
+    """
+    __slots__ = ('queue', 'resync')
+
+    def __init__(self, queue_size: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.resync = True
+
+class PushHub:
+    """대시보드 푸시 허브
+
+    시스템 지표, 카메라별 감지 수/스트림 fps, 새 이벤트를 주기마다 한 번만 계산하고
+    직렬화한 메시지를 연결된 모든 탭에 나눠 보낸다. 새 연결은 전체 스냅샷을,
+    이후에는 바뀐 값(delta)만 받는다. 연결이 없으면 수집도 멈춘다.
+    """
+
+    def __init__(self, camera_manager, collect_system: Callable[[], Dict[str, Any]], log_buffer=None,
+                 interval: float = 2.0, queue_size: int = 16):
+        self.camera_manager = camera_manager
+        self.collect_system = collect_system
+        self.log_buffer = log_buffer
+        self._log_cursor: Optional[int] = None
+        self.interval = interval
+        self.queue_size = queue_size
+        self._clients: Set[PushClient] = set()
+        self._state: Dict[str, Any] = {}
+        self._frame_rates = RateMeter()  # 카메라별 출력 시퀀스 증가율 = 스트림 fps
+        # 저장된 이벤트 (이벤트 writer/API 스레드가 넣고 허브 주기마다 비움, 연결이 없을 때도 상한 유지)
+        self._events: Deque[Dict[str, Any]] = deque(maxlen=1000)
+        self._task: Optional[asyncio.Task] = None
+        self.messages_sent = 0
+        self.messages_dropped = 0
+
+    def connect(self) -> PushClient:
+        client = PushClient(self.queue_size)
+        self._clients.add(client)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return client
+
+    def disconnect(self, client: PushClient):
+        self._clients.discard(client)
+
+    def publish_events(self, events: Iterable[Dict[str, Any]]):
+        """새로 저장된 이벤트 전달 (어느 스레드에서나 호출 가능, 다음 주기에 전송)"""
+        if self._clients:
+            self._events.extend(events)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "clients": len(self._clients),
+            "messages_sent": self.messages_sent,
+            "messages_dropped": self.messages_dropped
+        }
+
+    async def _run(self):
+        logger.info("Push hub started")
+        try:
+            while self._clients:
+                started = time.monotonic()
+                try:
+                    await self._tick()
+                except Exception as e:
+                    logger.error(f"Error collecting push update: {str(e)}")
+                await asyncio.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+        finally:
+            self._state = {}
+            self._frame_rates = RateMeter()
+            self._log_cursor = None
+            self._events.clear()
+            logger.info("Push hub stopped")
+
+    async def _tick(self):
+        system = self.collect_system()  # 샘플러 스냅샷 읽기 (블로킹 없음)
+        events = self._drain_events()
+        logs = self._new_logs()
+        state = {"system": system, "cameras": self._camera_state()}
+        delta = _diff(self._state, state)
+        self._state = state
+
+        snapshot_message = delta_message = None
+        for client in list(self._clients):
+            if client.resync:
+                if snapshot_message is None:
+                    # 스냅샷에는 새 로그 대신 최근 로그 목록을 담음
+                    recent = self.log_buffer.since(limit=50)[0] if self.log_buffer is not None else []
+                    snapshot_message = json.dumps({"type": "snapshot", "data": state, "events": events,
+                                                   "logs": recent})
+                message = snapshot_message
+            elif delta or events or logs:
+                if delta_message is None:
+                    delta_message = json.dumps({"type": "delta", "data": delta, "events": events, "logs": logs})
+                message = delta_message
+            else:
+                continue
+            self._send(client, message)
+
+    def _send(self, client: PushClient, message: str):
+        try:
+            client.queue.put_nowait(message)
+            client.resync = False
+            self.messages_sent += 1
+        except asyncio.QueueFull:
+            # 밀린 delta는 의미가 없으므로 비우고 다음 주기에 스냅샷으로 재동기화
+            while not client.queue.empty():
+                client.queue.get_nowait()
+                self.messages_dropped += 1
+            client.resync = True
+
+    def _camera_state(self) -> Dict[str, Any]:
+        """카메라별 스트림 fps(출력 시퀀스 증가량)와 현재 감지/트랙 수"""
+        broadcasters = dict(self.camera_manager.broadcasters)
+        cameras = {
+            str(camera_id): {
+                "running": broadcaster.is_running,
+                "fps": round(self._frame_rates.rate(camera_id, broadcaster.output.seq), 1),
+                "detections": broadcaster.detection_count(),
+                "tracks": broadcaster.confirmed_track_count()
+            }
+            for camera_id, broadcaster in broadcasters.items()
+        }
+        self._frame_rates.retain(broadcasters)
+        return cameras
+
+    def _new_logs(self) -> List[Dict[str, Any]]:
+        """마지막 주기 이후의 로그 (로그 버퍼 커서로 새 항목만 읽음)"""
+        if self.log_buffer is None:
+            return []
+        if self._log_cursor is None:
+            self._log_cursor = self.log_buffer.cursor
+            return []
+        logs, self._log_cursor, _ = self.log_buffer.since(self._log_cursor)
+        return logs
+
+    def _drain_events(self, limit: int = 200) -> List[Dict[str, Any]]:
+        events = []
+        while self._events and len(events) < limit:
+            events.append(self._events.popleft())
+        return events
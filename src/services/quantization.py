@@ -0,0 +1,125 @@
+import time
+import numpy as np
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from loguru import logger
+from .inference_backends import InferenceBackend, letterbox
+from .detection import box_iou
+
+class FrameCalibrationReader:
+    """샘플 프레임으로 정적 양자화 calibration 입력을 공급
+
+    onnxruntime.quantization.CalibrationDataReader 인터페이스 (get_next/rewind)를 따른다.
+    """
+
+    def __init__(self, input_name: str, frames: List[np.ndarray], input_size: int = 640):
+        self.input_name = input_name
+        self.frames = frames
+        self.input_size = input_size
+        self._index = 0
+
+    def get_next(self) -> Optional[Dict[str, np.ndarray]]:
+        if self._index >= len(self.frames):
+            return None
+        padded, _, _ = letterbox(self.frames[self._index], self.input_size)
+        self._index += 1
+        blob = padded.transpose(2, 0, 1)[None].astype(np.float32) / 255.0
+        return {self.input_name: np.ascontiguousarray(blob)}
+
+    def rewind(self):
+        self._index = 0
+
+def quantize_model(fp32_path: str, int8_path: str, calibration_frames: Optional[List[np.ndarray]] = None,
+                   input_size: int = 640, method: str = "static") -> Path:
+    """FP32 ONNX 모델을 INT8로 양자화
+
+    method="static": 샘플 RGB 프레임으로 activation 범위를 보정 (QDQ, 채널별 가중치)
+    method="dynamic": 가중치만 INT8로 변환, activation은 실행 시 양자화
+    """
+    import onnxruntime as ort
+    from onnxruntime.quantization import QuantFormat, QuantType, quantize_dynamic, quantize_static
+
+    if method == "dynamic":
+        quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    elif method == "static":
+        if not calibration_frames:
+            raise ValueError("Static quantization needs calibration frames")
+        input_name = ort.InferenceSession(fp32_path, providers=['CPUExecutionProvider']).get_inputs()[0].name
+        reader = FrameCalibrationReader(input_name, calibration_frames, input_size)
+        quantize_static(
+            fp32_path, int8_path, reader,
+            quant_format=QuantFormat.QDQ,
+            per_channel=True,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8
+        )
+    else:
+        raise ValueError(f"Unknown quantization method '{method}' (choose static or dynamic)")
+
+    logger.info(f"Quantized {fp32_path} -> {int8_path} ({method}, "
+                f"{len(calibration_frames or [])} calibration frames)")
+    return Path(int8_path)
+
+def _latency_summary(latencies_ms: List[float]) -> Dict[str, float]:
+    values = np.array(latencies_ms, dtype=np.float64)
+    return {
+        "mean": round(float(values.mean()), 2),
+        "p50": round(float(np.percentile(values, 50)), 2),
+        "p95": round(float(np.percentile(values, 95)), 2)
+    }
+
+def _timed_infer(backend: InferenceBackend, frames: List[np.ndarray]):
+    outputs, latencies = [], []
+    backend.infer(frames[:1])  # 워밍업
+    for frame in frames:
+        started = time.perf_counter()
+        outputs.append(backend.infer([frame])[0])
+        latencies.append((time.perf_counter() - started) * 1000)
+    return outputs, latencies
+
+def agreement_report(reference: InferenceBackend, candidate: InferenceBackend, frames: List[np.ndarray],
+                     score_threshold: float = 0.5, iou_threshold: float = 0.5) -> Dict[str, Any]:
+    """FP32 기준 모델 대비 후보 모델의 감지 일치도와 프레임당 지연 비교
+
+    기준 모델의 박스를 정답으로 보고 IoU >= iou_threshold인 후보 박스를 1:1로
+    매칭해 recall/precision/평균 IoU를 계산한다.
+    """
+    ref_outputs, ref_latencies = _timed_infer(reference, frames)
+    cand_outputs, cand_latencies = _timed_infer(candidate, frames)
+
+    matched, ref_total, cand_total, ious = 0, 0, 0, []
+    for ref, cand in zip(ref_outputs, cand_outputs):
+        ref = ref[ref[:, 4] >= score_threshold]
+        cand = cand[cand[:, 4] >= score_threshold]
+        ref_total += len(ref)
+        cand_total += len(cand)
+        if not len(ref) or not len(cand):
+            continue
+
+        # IoU가 높은 쌍부터 탐욕적으로 1:1 매칭
+        iou = box_iou(ref[:, :4], cand[:, :4])
+        while True:
+            i, j = np.unravel_index(iou.argmax(), iou.shape)
+            if iou[i, j] < iou_threshold:
+                break
+            matched += 1
+            ious.append(float(iou[i, j]))
+            iou[i, :] = -1
+            iou[:, j] = -1
+
+    ref_latency = _latency_summary(ref_latencies)
+    cand_latency = _latency_summary(cand_latencies)
+    return {
+        "frames": len(frames),
+        "reference": f"{reference.name}/{reference.precision}",
+        "candidate": f"{candidate.name}/{candidate.precision}",
+        "reference_boxes": ref_total,
+        "candidate_boxes": cand_total,
+        "matched_boxes": matched,
+        "recall": round(matched / ref_total, 4) if ref_total else 1.0,
+        "precision": round(matched / cand_total, 4) if cand_total else 1.0,
+        "mean_iou": round(float(np.mean(ious)), 4) if ious else 0.0,
+        "reference_latency_ms": ref_latency,
+        "candidate_latency_ms": cand_latency,
+        "speedup": round(ref_latency["mean"] / cand_latency["mean"], 2) if cand_latency["mean"] else 0.0
+    }
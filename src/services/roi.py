@@ -0,0 +1,99 @@
+import cv2
+import numpy as np
+from typing import List, Sequence, Tuple
+from .detection import Detections
+from .inference_backends import IOU_THRESHOLD
+
+class RegionOfInterest:
+    """카메라 프레임의 관심 영역 (사각형 또는 다각형, 픽셀 좌표)
+
+    추론은 다각형을 감싸는 사각형을 잘라 수행하고, 다각형인 경우 박스 하단 중앙
+    (사람의 발 위치)이 다각형 안에 있는 감지만 남긴다.
+    """
+
+    def __init__(self, points: Sequence[Sequence[int]]):
+        self.points = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+        if len(self.points) < 3:
+            raise ValueError("ROI polygon needs at least 3 points")
+        x1, y1 = self.points.min(axis=0)
+        x2, y2 = self.points.max(axis=0)
+        if x2 <= x1 or y2 <= y1:
+            raise ValueError("ROI must have a positive area")
+        self.rect = (int(x1), int(y1), int(x2), int(y2))
+        self.is_rect = len(self.points) == 4 and cv2.contourArea(self.points) == (x2 - x1) * (y2 - y1)
+
+        # 다각형 판정용 마스크 (사각형 영역 기준 좌표)
+        self._mask = None
+        if not self.is_rect:
+            self._mask = np.zeros((y2 - y1, x2 - x1), dtype=np.uint8)
+            cv2.fillPoly(self._mask, [self.points - np.array([x1, y1], dtype=np.int32)], 1)
+
+    @classmethod
+    def from_rect(cls, x1: int, y1: int, x2: int, y2: int) -> "RegionOfInterest":
+        return cls([(x1, y1), (x2, y1), (x2, y2), (x1, y2)])
+
+    def crop_bounds(self, frame_shape) -> Tuple[int, int, int, int]:
+        """프레임 크기로 잘라낸 사각형 영역"""
+        height, width = frame_shape[:2]
+        x1, y1, x2, y2 = self.rect
+        return max(0, x1), max(0, y1), min(width, x2), min(height, y2)
+
+    def contains(self, boxes: np.ndarray) -> np.ndarray:
+        """(N, 4) 전체 프레임 좌표 박스의 하단 중앙이 영역 안에 있는지 여부"""
+        if self._mask is None or not len(boxes):
+            return np.ones(len(boxes), dtype=bool)
+        x1, y1 = self.rect[:2]
+        height, width = self._mask.shape
+        xs = ((boxes[:, 0] + boxes[:, 2]) // 2 - x1).clip(0, width - 1)
+        ys = (boxes[:, 3] - 1 - y1).clip(0, height - 1)
+        return self._mask[ys, xs].astype(bool)
+
+    def to_dict(self):
+        if self.is_rect:
+            return {"rect": list(self.rect)}
+        return {"polygon": self.points.tolist()}
+
+class RoiSet:
+    """카메라 1대의 관심 영역 목록"""
+
+    def __init__(self, regions: List[RegionOfInterest]):
+        if not regions:
+            raise ValueError("RoiSet needs at least one region")
+        self.regions = regions
+
+    def crops(self, frame) -> List[Tuple[np.ndarray, Tuple[int, int]]]:
+        """영역별 잘라낸 이미지와 (x, y) 오프셋"""
+        result = []
+        for region in self.regions:
+            x1, y1, x2, y2 = region.crop_bounds(frame.shape)
+            if x2 > x1 and y2 > y1:
+                result.append((frame[y1:y2, x1:x2], (x1, y1)))
+            else:
+                result.append((None, (x1, y1)))
+        return result
+
+    def merge(self, per_region: List[Detections], offsets: List[Tuple[int, int]]) -> Detections:
+        """영역별 감지를 전체 프레임 좌표로 되돌리고 영역 밖/중복 감지 제거"""
+        boxes, scores, classes = [], [], []
+        for region, detections, (dx, dy) in zip(self.regions, per_region, offsets):
+            if detections is None or not len(detections):
+                continue
+            shifted = detections.boxes + np.array([dx, dy, dx, dy], dtype=np.int32)
+            inside = region.contains(shifted)
+            boxes.append(shifted[inside])
+            scores.append(detections.scores[inside])
+            classes.append(detections.classes[inside])
+        if not boxes:
+            return Detections.empty()
+
+        merged = Detections(np.concatenate(boxes), np.concatenate(scores), np.concatenate(classes))
+        if len(self.regions) > 1 and len(merged) > 1:
+            # 겹치는 영역에서 같은 사람이 두 번 감지된 경우 제거
+            xywh = np.concatenate([merged.boxes[:, :2], merged.boxes[:, 2:] - merged.boxes[:, :2]], axis=1)
+            keep = np.array(cv2.dnn.NMSBoxes(xywh.tolist(), merged.scores.tolist(), 0.0, IOU_THRESHOLD),
+                            dtype=np.int64).reshape(-1)
+            merged = Detections(merged.boxes[keep], merged.scores[keep], merged.classes[keep])
+        return merged
+
+    def to_list(self):
+        return [region.to_dict() for region in self.regions]
@@ -0,0 +1,183 @@
+import os
+import time
+import threading
+from typing import Any, Callable, Dict, List, Optional
+import psutil
+from loguru import logger
+
+try:
+    import GPUtil
+except ImportError:  # GPU 모니터링은 선택 사항
+    GPUtil = None
+
+EMPTY_GPU = {
+    "usage": 0,
+    "memory_total": 0,
+    "memory_used": 0,
+    "temperature": 0
+}
+
+class SystemMetricsSampler:
+    """시스템 지표 백그라운드 샘플러
+
+    interval마다 CPU/메모리/디스크/프로세스/스레드 지표를 수집해 스냅샷을 통째로 교체한다.
+    CPU 사용률은 cpu_percent(interval=None)로 직전 샘플 이후의 평균을 구하므로 대기하지 않고,
+    nvidia-smi를 실행하는 GPU 조회는 gpu_interval마다만 갱신한다.
+    요청 처리 쪽은 get_snapshot()으로 마지막 스냅샷을 읽기만 한다.
+    """
+
+    def __init__(self, interval: float = 2.0, gpu_interval: float = 10.0, disk_path: str = "/",
+                 max_threads: int = 20):
+        self.interval = interval
+        self.gpu_interval = gpu_interval
+        self.disk_path = disk_path
+        self.max_threads = max_threads
+        self.is_running = False
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._process = psutil.Process(os.getpid())
+        self._children: Dict[int, psutil.Process] = {}
+        self._thread_times: Dict[int, float] = {}
+        self._last_sample: Optional[float] = None
+        self._gpu = dict(EMPTY_GPU)
+        self._gpu_sampled_at = 0.0
+        self.sample_ms = 0.0
+        self._listeners: List[Callable[[Dict[str, Any]], None]] = []
+
+    def add_listener(self, callback: Callable[[Dict[str, Any]], None]):
+        """새 스냅샷마다 샘플러 스레드에서 호출할 콜백 등록 (지표 이력 기록 등)"""
+        self._listeners.append(callback)
+
+    def start(self):
+        if self.is_running:
+            return
+        # cpu_percent(None)은 직전 호출 기준이므로 기준점을 잡고 첫 스냅샷을 바로 만든다
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+        self._sample()
+        self.is_running = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        logger.info(f"System metrics sampler started (every {self.interval}s)")
+
+    def stop(self):
+        self.is_running = False
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1.0)
+            self._thread = None
+
+    def get_snapshot(self) -> Optional[Dict[str, Any]]:
+        """마지막 스냅샷 (교체만 되고 수정되지 않으므로 잠금 없이 읽음)"""
+        return self._snapshot
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self._sample()
+            except Exception as e:
+                logger.error(f"Error sampling system metrics: {str(e)}")
+
+    def _sample(self):
+        started = time.perf_counter()
+        now = time.monotonic()
+        elapsed = now - self._last_sample if self._last_sample is not None else 0.0
+        self._last_sample = now
+        if now - self._gpu_sampled_at >= self.gpu_interval:
+            self._gpu = self._gpu_info()
+            self._gpu_sampled_at = now
+
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        self._snapshot = {
+            "timestamp": time.time(),
+            "cpu": {
+                "usage": psutil.cpu_percent(interval=None),
+                "cores": psutil.cpu_count(),
+                "processes": len(psutil.pids())
+            },
+            "memory": {
+                "total": memory.total,
+                "used": memory.used,
+                "free": memory.available
+            },
+            "disk": {
+                "total": disk.total,
+                "used": disk.used,
+                "free": disk.free
+            },
+            "gpu": self._gpu,
+            "process": self._process_info(),
+            "threads": self._thread_info(elapsed)
+        }
+        self.sample_ms = (time.perf_counter() - started) * 1000
+        for callback in self._listeners:
+            try:
+                callback(self._snapshot)
+            except Exception as e:
+                logger.error(f"Error in system metrics listener: {str(e)}")
+
+    def _gpu_info(self) -> Dict[str, Any]:
+        if GPUtil is None:
+            return dict(EMPTY_GPU)
+        try:
+            gpus = GPUtil.getGPUs()
+            if gpus:
+                gpu = gpus[0]  # 첫 번째 GPU 정보
+                return {
+                    "usage": gpu.load * 100,
+                    "memory_total": gpu.memoryTotal,
+                    "memory_used": gpu.memoryUsed,
+                    "temperature": gpu.temperature
+                }
+        except Exception as e:
+            logger.warning(f"GPU 정보 조회 실패: {e}")
+        return dict(EMPTY_GPU)
+
+    def _process_info(self) -> Dict[str, Any]:
+        """API 프로세스와 자식 프로세스 (추론 워커 등)의 CPU/메모리"""
+        with self._process.oneshot():
+            info = {
+                "pid": self._process.pid,
+                "cpu_percent": self._process.cpu_percent(interval=None),
+                "memory_rss": self._process.memory_info().rss,
+                "threads": self._process.num_threads()
+            }
+
+        children = []
+        alive = set()
+        for child in self._process.children(recursive=True):
+            alive.add(child.pid)
+            # cpu_percent는 같은 Process 객체의 직전 호출 기준이므로 객체를 재사용
+            tracked = self._children.setdefault(child.pid, child)
+            try:
+                with tracked.oneshot():
+                    children.append({
+                        "pid": tracked.pid,
+                        "name": tracked.name(),
+                        "cpu_percent": tracked.cpu_percent(interval=None),
+                        "memory_rss": tracked.memory_info().rss
+                    })
+            except psutil.Error:
+                continue
+        for pid in self._children.keys() - alive:
+            del self._children[pid]
+        info["children"] = children
+        return info
+
+    def _thread_info(self, elapsed: float) -> List[Dict[str, Any]]:
+        """스레드별 CPU 사용률 상위 max_threads개 (캡처/프로듀서/인코딩 스레드 확인용)"""
+        names = {thread.native_id: thread.name for thread in threading.enumerate()}
+        times = {}
+        threads = []
+        for thread in self._process.threads():
+            total = thread.user_time + thread.system_time
+            times[thread.id] = total
+            previous = self._thread_times.get(thread.id)
+            cpu = (total - previous) / elapsed * 100 if previous is not None and elapsed > 0 else 0.0
+            threads.append({"id": thread.id, "name": names.get(thread.id, ""), "cpu_percent": round(cpu, 1)})
+        self._thread_times = times
+        threads.sort(key=lambda thread: thread["cpu_percent"], reverse=True)
+        return threads[:self.max_threads]
@@ -0,0 +1,194 @@
+import cv2
+import numpy as np
+from typing import Optional
+from .detection import Detections, box_iou
+
+# 상태 벡터: [cx, cy, s(면적), r(종횡비), vx, vy, vs] (속도는 초당 변화량)
+STATE_DIM = 7
+MEASURE_DIM = 4
+
+_H = np.eye(MEASURE_DIM, STATE_DIM, dtype=np.float64)
+_R = np.diag([1.0, 1.0, 10.0, 10.0])
+_P0 = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+# 프로세스 노이즈 (30fps 한 스텝 기준, 실제 dt에 비례해 스케일)
+_Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 0.0001])
+_REFERENCE_DT = 1.0 / 30
+
+TRACK_COLOR = (0, 255, 0)
+TENTATIVE_COLOR = (0, 200, 255)
+
+def _boxes_to_z(boxes: np.ndarray) -> np.ndarray:
+    """(N, 4) xyxy -> (N, 4) [cx, cy, s, r]"""
+    boxes = boxes.astype(np.float64)
+    w = boxes[:, 2] - boxes[:, 0]
+    h = np.maximum(boxes[:, 3] - boxes[:, 1], 1e-6)
+    return np.stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w * h, w / h], axis=1)
+
+def _x_to_boxes(x: np.ndarray) -> np.ndarray:
+    """(N, 7) 상태 -> (N, 4) xyxy"""
+    s = np.maximum(x[:, 2], 0.0)
+    w = np.sqrt(s * np.maximum(x[:, 3], 1e-6))
+    h = s / np.maximum(w, 1e-6)
+    return np.stack([x[:, 0] - w / 2, x[:, 1] - h / 2, x[:, 0] + w / 2, x[:, 1] + h / 2], axis=1)
+
+class Tracks:
+    """배열 기반 트래킹 결과
+
+    ids: (K,) 트랙 ID
+    boxes: (K, 4) int32 보정된 xyxy 박스
+    ages: (K,) 마지막 감지 매칭 이후 경과 시간 (초)
+    confirmed: (K,) min_hits 이상 매칭된 트랙 여부
+    """
+    __slots__ = ('ids', 'boxes', 'ages', 'confirmed')
+
+    def __init__(self, ids: np.ndarray, boxes: np.ndarray, ages: np.ndarray, confirmed: np.ndarray):
+        self.ids = ids
+        self.boxes = boxes
+        self.ages = ages
+        self.confirmed = confirmed
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+class SortTracker:
+    """IoU + 칼만 필터 기반 다중 객체 트래커 (SORT 방식)
+
+    모든 트랙의 상태를 하나의 배열로 보관해 예측/갱신/매칭을 벡터 연산으로 처리한다.
+    시간 기반 등속 모델이라 추론을 건너뛴 프레임에서도 predict()로 위치를 예측할 수 있다.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_age: float = 1.0, min_hits: int = 3):
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self._x = np.empty((0, STATE_DIM))
+        self._P = np.empty((0, STATE_DIM, STATE_DIM))
+        self._ids = np.empty(0, dtype=np.int64)
+        self._hits = np.empty(0, dtype=np.int64)
+        self._last_update = np.empty(0)
+        self._time: Optional[float] = None
+        self._next_id = 1
+
+    @property
+    def track_count(self) -> int:
+        return len(self._ids)
+
+    def _advance(self, timestamp: float):
+        """모든 트랙을 timestamp 시점으로 예측"""
+        if self._time is None:
+            self._time = timestamp
+            return
+        dt = timestamp - self._time
+        if dt <= 0:
+            return
+        self._time = timestamp
+        if not len(self._ids):
+            return
+
+        F = np.eye(STATE_DIM)
+        F[0, 4] = F[1, 5] = F[2, 6] = dt
+        # 면적이 음수가 되지 않도록 면적 속도 제거
+        shrinking = self._x[:, 2] + self._x[:, 6] * dt <= 0
+        self._x[shrinking, 6] = 0.0
+        self._x = self._x @ F.T
+        self._P = F @ self._P @ F.T + _Q * (dt / _REFERENCE_DT)
+
+        # 오래 매칭되지 않은 트랙 제거
+        alive = timestamp - self._last_update <= self.max_age
+        if not alive.all():
+            self._keep(alive)
+
+    def _keep(self, mask: np.ndarray):
+        self._x, self._P = self._x[mask], self._P[mask]
+        self._ids, self._hits, self._last_update = self._ids[mask], self._hits[mask], self._last_update[mask]
+
+    def _associate(self, det_boxes: np.ndarray):
+        """IoU 행렬 1회 계산 후 높은 IoU 쌍부터 탐욕적 1:1 매칭"""
+        if not len(self._ids) or not len(det_boxes):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        iou = box_iou(_x_to_boxes(self._x), det_boxes)
+        track_idx, det_idx = np.nonzero(iou >= self.iou_threshold)
+        order = np.argsort(-iou[track_idx, det_idx], kind='stable')
+        track_idx, det_idx = track_idx[order], det_idx[order]
+
+        used_tracks = np.zeros(len(self._ids), dtype=bool)
+        used_dets = np.zeros(len(det_boxes), dtype=bool)
+        matched_tracks, matched_dets = [], []
+        for t, d in zip(track_idx.tolist(), det_idx.tolist()):
+            if used_tracks[t] or used_dets[d]:
+                continue
+            used_tracks[t] = used_dets[d] = True
+            matched_tracks.append(t)
+            matched_dets.append(d)
+        return np.array(matched_tracks, dtype=np.int64), np.array(matched_dets, dtype=np.int64)
+
+    def _kalman_update(self, track_idx: np.ndarray, z: np.ndarray):
+        """매칭된 트랙들을 한 번에 칼만 갱신"""
+        x, P = self._x[track_idx], self._P[track_idx]
+        S = _H @ P @ _H.T + _R
+        K = P @ _H.T @ np.linalg.inv(S)
+        y = z - x @ _H.T
+        self._x[track_idx] = x + np.einsum('nij,nj->ni', K, y)
+        self._P[track_idx] = (np.eye(STATE_DIM) - K @ _H) @ P
+
+    def update(self, detections: Detections) -> Tracks:
+        """새 감지 결과로 트랙 갱신 (매칭 안 된 감지는 새 트랙 생성)"""
+        timestamp = detections.timestamp
+        self._advance(timestamp)
+        det_boxes = detections.boxes.astype(np.float64)
+
+        track_idx, det_idx = self._associate(det_boxes)
+        if len(track_idx):
+            self._kalman_update(track_idx, _boxes_to_z(det_boxes[det_idx]))
+            self._hits[track_idx] += 1
+            self._last_update[track_idx] = timestamp
+
+        new = np.ones(len(det_boxes), dtype=bool)
+        new[det_idx] = False
+        count = int(new.sum())
+        if count:
+            x = np.zeros((count, STATE_DIM))
+            x[:, :MEASURE_DIM] = _boxes_to_z(det_boxes[new])
+            self._x = np.concatenate([self._x, x])
+            self._P = np.concatenate([self._P, np.repeat(_P0[None], count, axis=0)])
+            self._ids = np.concatenate([self._ids, np.arange(self._next_id, self._next_id + count)])
+            self._hits = np.concatenate([self._hits, np.ones(count, dtype=np.int64)])
+            self._last_update = np.concatenate([self._last_update, np.full(count, timestamp)])
+            self._next_id += count
+
+        return self._tracks()
+
+    def predict(self, timestamp: float) -> Tracks:
+        """감지를 건너뛴 프레임에서 현재 위치 예측"""
+        self._advance(timestamp)
+        return self._tracks()
+
+    def hold(self, timestamp: float) -> Tracks:
+        """움직임이 없어 추론을 생략한 프레임: 트랙을 유지하되 매칭 횟수는 늘리지 않음
+
+        직전 결과를 다시 update()하면 새 추론 없이 hits가 올라 오탐이 확정될 수 있으므로 사용하지 않는다.
+        """
+        self._advance(timestamp)
+        self._last_update[:] = self._time
+        return self._tracks()
+
+    def _tracks(self) -> Tracks:
+        return Tracks(
+            ids=self._ids.copy(),
+            boxes=np.round(_x_to_boxes(self._x)).astype(np.int32),
+            ages=(self._time or 0.0) - self._last_update,
+            confirmed=self._hits >= self.min_hits
+        )
+
+def draw_tracks(frame, tracks: Tracks, stale_after: float = 0.5):
+    """트랙 박스와 ID 그리기 (미확정 트랙/오래된 예측은 얇게)"""
+    for track_id, box, age, confirmed in zip(tracks.ids.tolist(), tracks.boxes.tolist(),
+                                             tracks.ages.tolist(), tracks.confirmed.tolist()):
+        xmin, ymin, xmax, ymax = box
+        fresh = confirmed and age <= stale_after
+        color = TRACK_COLOR if fresh else TENTATIVE_COLOR
+        cv2.rectangle(frame, (xmin, ymin), (xmax, ymax), color, 2 if fresh else 1)
+        if confirmed:
+            cv2.putText(frame, f"#{track_id}", (xmin, max(ymin - 5, 10)),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+    return frame